@@ -0,0 +1,90 @@
+"""
+CV/JD pairs per second of the local ATS keyword scorer.
+
+Scores distinct pairs (the sample CV and JD with a per-pair line, so every
+JD's keywords are extracted anew), then many CVs against one JD with
+ATSScorer.score_many(), as when ranking a batch of candidates for a job,
+then before/after comparisons through the shared per-JD scorer the
+orchestrator uses. Reports the best of --repeat runs.
+
+Usage:
+    python -m benchmarks.bench_ats_score [--pairs N] [--repeat N] [-o FILE]
+"""
+import argparse
+import json
+import platform
+import time
+from pathlib import Path
+
+# Imported first: sets a placeholder GOOGLE_API_KEY before config loads
+from benchmarks.stubs import SAMPLE_CV_TEXT
+from benchmarks.fake_model import DEFAULT_RESPONSES
+from cv_formatter.ats_score import ATSScorer, compare_cvs
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def best_rate(run, pairs: int, repeat: int) -> float:
+    """Pairs per second of the fastest of `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return pairs / best
+
+
+def run_benchmark(args) -> dict:
+    jd_text = (ROOT / "sample_JD.txt").read_text(encoding="utf-8")
+    cvs = [f"{SAMPLE_CV_TEXT}\nREFERENCE {i}" for i in range(args.pairs)]
+    jds = [f"{jd_text}\nREQ-{i}" for i in range(args.pairs)]
+    rewritten = DEFAULT_RESPONSES["Rewrite_Agent"]
+    scorer = ATSScorer(jd_text)
+    results = {
+        "distinct_pairs_per_s": best_rate(
+            lambda: [ATSScorer(jd).score(cv) for cv, jd in zip(cvs, jds)],
+            args.pairs, args.repeat,
+        ),
+        "shared_jd_per_s": best_rate(lambda: scorer.score_many(cvs), args.pairs, args.repeat),
+        "before_after_per_s": best_rate(
+            lambda: [compare_cvs(cv, rewritten, jd_text) for cv in cvs], args.pairs, args.repeat
+        ),
+        "jd_keywords": len(scorer.keywords),
+    }
+    return {
+        "benchmark": "ats_score",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {"pairs": args.pairs, "repeat": args.repeat},
+        "results": results,
+    }
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pairs", type=int, default=5000,
+                        help="CV/JD pairs per run (default: 5000)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Runs per measurement; the best is kept (default: 5)")
+    parser.add_argument("-o", "--output", type=Path, default=Path("bench_ats_score.json"),
+                        help="Results file (default: bench_ats_score.json)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    results = run_benchmark(args)
+    args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    rows = results["results"]
+    print(f"{args.pairs} pairs, {rows['jd_keywords']} JD keywords, "
+          f"pairs/s (best of {args.repeat})\n")
+    print(f"{'distinct JDs':<28}{rows['distinct_pairs_per_s']:>10.0f}")
+    print(f"{'one JD, score_many()':<28}{rows['shared_jd_per_s']:>10.0f}")
+    print(f"{'before/after, shared scorer':<28}{rows['before_after_per_s']:>10.0f}")
+    print(f"\nResults: {args.output.absolute()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Batch throughput benchmark across process pool sizes.
+
+Runs a batch of distinct CVs through BatchRunner with zero-latency fake
+models, the in-process pdfminer engine and HTML output, so PDF extraction,
+normalization and formatting dominate. For each CPU_WORKERS value it reports
+wall time, pairs per minute and the worst event loop lag seen by a ticker
+task, which shows how long CPU work held the loop. Caches are disabled, and
+each CV is a copy of some_CV.pdf with a distinct trailer so no extraction is
+shared.
+
+Worker processes are spawned and re-import __main__, so run it as a module:
+
+Usage:
+    python -m benchmarks.bench_cpu_pool [--pairs N] [--workers 0 1 2 4]
+        [--concurrency N] [-o FILE]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import tempfile
+import time
+from pathlib import Path
+
+# Imported first: sets a placeholder GOOGLE_API_KEY before config loads
+from benchmarks.stubs import SAMPLE_CV_TEXT
+from benchmarks.fake_model import fake_model_factory
+from cv_formatter.config import config
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def make_corpus(directory: Path, pairs: int) -> list:
+    """Write `pairs` distinct CV PDFs and one JD, and return the batch jobs."""
+    from cv_formatter.batch import BatchJob
+
+    pdf = (ROOT / "some_CV.pdf").read_bytes()
+    jd_path = directory / "jd.txt"
+    jd_path.write_text(SAMPLE_CV_TEXT, encoding="utf-8")
+    jobs = []
+    for index in range(pairs):
+        cv_path = directory / f"cv_{index:03d}.pdf"
+        # PDF readers ignore comments after %%EOF; the content hash does not
+        cv_path.write_bytes(pdf + f"\n% copy {index}\n".encode())
+        jobs.append(BatchJob(cv_path, jd_path, directory / "out" / f"{index:03d}.html"))
+    return jobs
+
+
+async def _watch_loop(lags: list[float], interval: float = 0.005) -> None:
+    """Record how late each tick of the event loop wakes up."""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def run_level(jobs: list, workers: int, concurrency: int) -> dict:
+    """Run the batch once with `workers` pool processes."""
+    from cv_formatter.batch import BatchRunner
+    from cv_formatter.orchestrator import CVFormatterOrchestrator
+    from cv_formatter.process_pool import run_cpu_bound, shutdown_process_pool
+
+    config.cpu_workers = workers
+    orchestrator = CVFormatterOrchestrator(model_factory=fake_model_factory(latency=0.0))
+    runner = BatchRunner(orchestrator, concurrency, "html", jobs[0].cv_path.parent)
+    # Start the pool before timing so spawn cost isn't counted per level
+    await run_cpu_bound(os.getpid)
+
+    lags: list[float] = []
+    watcher = asyncio.create_task(_watch_loop(lags))
+    try:
+        report = await runner.run(jobs)
+    finally:
+        watcher.cancel()
+        orchestrator.close()
+        shutdown_process_pool()
+    assert report.failed == 0, [r.error for r in report.results if not r.ok]
+
+    return {
+        "cpu_workers": workers,
+        "wall_s": report.wall_seconds,
+        "pairs_per_minute": report.throughput,
+        "max_loop_lag_ms": max(lags, default=0.0) * 1000,
+    }
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    cpus = os.cpu_count() or 1
+    default_workers = sorted({0, 1, 2, 4, cpus} - {n for n in (2, 4) if n > cpus})
+    parser.add_argument("--pairs", type=int, default=32,
+                        help="Distinct CVs in the batch (default: 32)")
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers,
+                        help=f"CPU_WORKERS values to compare (default: {default_workers})")
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="Pairs in flight (default: 16)")
+    parser.add_argument("-o", "--output", type=Path, default=Path("bench_cpu_pool.json"),
+                        help="Results file (default: bench_cpu_pool.json)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    config.pdf_engine = "pdfminer"
+    config.text_cache_enabled = False
+    config.analysis_memo_enabled = False
+    config.company_cache_enabled = False
+    config.incremental_rerun = False
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = make_corpus(Path(tmp), args.pairs)
+        levels = [
+            asyncio.run(run_level(jobs, workers, args.concurrency)) for workers in args.workers
+        ]
+
+    results = {
+        "benchmark": "cpu_pool",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "params": {"pairs": args.pairs, "concurrency": args.concurrency},
+        "levels": levels,
+    }
+    args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    print(f"{args.pairs} pairs, {args.concurrency} in flight, {os.cpu_count()} CPU(s)\n")
+    print(f"{'workers':>8}{'wall (s)':>10}{'pairs/min':>11}{'max lag (ms)':>14}")
+    for level in levels:
+        print(f"{level['cpu_workers']:>8}{level['wall_s']:>10.2f}"
+              f"{level['pairs_per_minute']:>11.1f}{level['max_loop_lag_ms']:>14.1f}")
+    print(f"\nResults: {args.output.absolute()}")
+
+
+if __name__ == "__main__":
+    main()
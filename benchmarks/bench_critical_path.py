@@ -0,0 +1,189 @@
+"""
+Critical path of one workflow run, with company research after or alongside the analyses.
+
+Runs the workflow with fake models whose latency differs per agent, as the
+real agents' do (Company_Agent waits on google_search, CV_Agent reads the
+whole CV), once with the earlier layout, where Company_Agent starts only
+after CV_Agent and JD_Agent have both finished, and once with the current
+one, where it runs alongside them. Reports, per layout, the mean wall time
+of a run and when Company_Agent and Rewrite_Agent started, relative to the
+start of the run. Caches are disabled so every run exercises every agent.
+
+Usage:
+    python -m benchmarks.bench_critical_path [--runs N] [--cv-latency S]
+        [--jd-latency S] [--company-latency S] [--rewrite-latency S]
+        [--llm-parsers] [-o FILE]
+"""
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import time
+from pathlib import Path
+
+# Imported first: sets a placeholder GOOGLE_API_KEY before config loads
+from benchmarks.stubs import stub_tika
+from benchmarks.fake_model import FakeGemini, fake_model_factory
+from cv_formatter.config import config
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def make_factory(args):
+    """Fake models with each agent's latency."""
+    latencies = {
+        "CV_Agent": args.cv_latency,
+        "JD_Agent": args.jd_latency,
+        "Company_Agent": args.company_latency,
+        "Rewrite_Agent": args.rewrite_latency,
+    }
+    default = fake_model_factory(latency=args.parser_latency)
+
+    def factory(agent_name: str) -> FakeGemini:
+        model = default(agent_name)
+        model.latency = latencies.get(agent_name, args.parser_latency)
+        return model
+
+    return factory
+
+
+def use_sequential_company(orchestrator) -> None:
+    """Rebuild the workflow as it was: company research after both analyses."""
+    from google.adk.agents import ParallelAgent, SequentialAgent
+    from google.adk.runners import Runner
+    from cv_formatter.tracing import TracingPlugin
+
+    agents = [orchestrator.cv_agent, orchestrator.jd_agent,
+              orchestrator.company_agent, orchestrator.rewrite_agent]
+    if orchestrator.use_llm_parsers:
+        agents += [orchestrator.pdf_parser, orchestrator.txt_parser]
+    # Free the agents from the current graph so they can be reparented
+    for agent in agents:
+        agent.get_agent().parent_agent = None
+
+    if orchestrator.use_llm_parsers:
+        branches = [
+            SequentialAgent(name="CV_Sequential_Agent", sub_agents=[
+                orchestrator.pdf_parser.get_agent(), orchestrator.cv_agent.get_agent(),
+            ]),
+            SequentialAgent(name="JD_Sequential_Agent", sub_agents=[
+                orchestrator.txt_parser.get_agent(), orchestrator.jd_agent.get_agent(),
+            ]),
+        ]
+    else:
+        branches = [orchestrator.cv_agent.get_agent(), orchestrator.jd_agent.get_agent()]
+    root = SequentialAgent(
+        name="Complete_CV_Formatter_Workflow",
+        sub_agents=[
+            ParallelAgent(name="Parallel_Processing_Agent", sub_agents=branches),
+            orchestrator.company_agent.get_agent(),
+            orchestrator.rewrite_agent.get_agent(),
+        ],
+    )
+    orchestrator.runner = Runner(
+        agent=root,
+        app_name=config.app_name,
+        session_service=orchestrator.session_service,
+        memory_service=orchestrator.memory_service,
+        plugins=[TracingPlugin()],
+    )
+
+
+async def run_layout(args, sequential: bool) -> dict:
+    """Run the workflow `args.runs` times, one at a time, in one layout."""
+    from cv_formatter.orchestrator import CVFormatterOrchestrator
+
+    orchestrator = CVFormatterOrchestrator(
+        use_llm_parsers=args.llm_parsers, model_factory=make_factory(args)
+    )
+    if sequential:
+        use_sequential_company(orchestrator)
+
+    walls, company_starts, rewrite_starts = [], [], []
+    # The first run warms up imports and the Tika connection
+    for index in range(args.runs + 1):
+        result = await orchestrator.format_cv_detailed(ROOT / "some_CV.pdf", ROOT / "sample_JD.txt")
+        trace = result.trace
+        if index:
+            walls.append(trace.duration)
+            company_starts.append(trace.find("Company_Agent").start - trace.start)
+            rewrite_starts.append(trace.find("Rewrite_Agent").start - trace.start)
+    orchestrator.close()
+
+    return {
+        "layout": "company_after_analyses" if sequential else "company_alongside_analyses",
+        "wall_ms": statistics.mean(walls) * 1000,
+        "company_start_ms": statistics.mean(company_starts) * 1000,
+        "rewrite_start_ms": statistics.mean(rewrite_starts) * 1000,
+    }
+
+
+async def run_benchmark(args) -> dict:
+    server = stub_tika()
+    try:
+        layouts = [await run_layout(args, True), await run_layout(args, False)]
+    finally:
+        server.stop()
+    return {
+        "benchmark": "critical_path",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {
+            "runs": args.runs,
+            "llm_parsers": args.llm_parsers,
+            "latency_s": {
+                "CV_Agent": args.cv_latency,
+                "JD_Agent": args.jd_latency,
+                "Company_Agent": args.company_latency,
+                "Rewrite_Agent": args.rewrite_latency,
+                "parsers": args.parser_latency,
+            },
+        },
+        "layouts": layouts,
+        "reduction": 1 - layouts[1]["wall_ms"] / layouts[0]["wall_ms"],
+    }
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5,
+                        help="Workflow runs per layout (default: 5)")
+    parser.add_argument("--cv-latency", type=float, default=0.4,
+                        help="CV_Agent model latency in seconds (default: 0.4)")
+    parser.add_argument("--jd-latency", type=float, default=0.2,
+                        help="JD_Agent model latency in seconds (default: 0.2)")
+    parser.add_argument("--company-latency", type=float, default=0.4,
+                        help="Company_Agent model latency in seconds (default: 0.4)")
+    parser.add_argument("--rewrite-latency", type=float, default=0.6,
+                        help="Rewrite_Agent model latency in seconds (default: 0.6)")
+    parser.add_argument("--parser-latency", type=float, default=0.1,
+                        help="Parser agents' model latency in seconds (default: 0.1)")
+    parser.add_argument("--llm-parsers", action="store_true",
+                        help="Extract CV/JD text through the parser agents")
+    parser.add_argument("-o", "--output", type=Path, default=Path("bench_critical_path.json"),
+                        help="Results file (default: bench_critical_path.json)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    config.text_cache_enabled = False
+    config.analysis_memo_enabled = False
+    config.company_cache_enabled = False
+    config.incremental_rerun = False
+
+    results = asyncio.run(run_benchmark(args))
+    args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    print(f"{'layout':<28}{'wall':>10}{'company start':>15}{'rewrite start':>15}")
+    for layout in results["layouts"]:
+        print(f"{layout['layout']:<28}{layout['wall_ms']:>8.0f}ms"
+              f"{layout['company_start_ms']:>13.0f}ms{layout['rewrite_start_ms']:>13.0f}ms")
+    print(f"\nCritical path reduced by {results['reduction']:.0%}")
+    print(f"Results: {args.output.absolute()}")
+
+
+if __name__ == "__main__":
+    main()
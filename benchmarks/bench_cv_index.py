@@ -0,0 +1,180 @@
+"""
+Ingestion and query throughput of the CV index at 10k and 100k CVs.
+
+Generates synthetic CVs with a realistic skew of terms (a few skills in
+most CVs, most in few) from a fixed seed, ingests them into a fresh index
+in batches, then queries it with the sample JD and synthetic JDs. Reports,
+per corpus size, CVs ingested per second, the index size, query latency
+(median and 95th percentile), against a search reading every posting of
+the JD's terms, and how many of the top K candidates the two agree on.
+
+Usage:
+    python -m benchmarks.bench_cv_index [--sizes 10000 100000] [--queries N]
+        [--top K] [--batch N] [-o FILE]
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+# Imported first: sets a placeholder GOOGLE_API_KEY before config loads
+import benchmarks.stubs  # noqa: F401
+from cv_formatter.cv_index import CVIndex
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SKILLS = """
+python c++ java javascript typescript go rust scala kotlin sql r matlab julia
+bash linux docker kubernetes terraform aws gcp azure spark hadoop kafka airflow
+pandas numpy scipy pytorch tensorflow keras sklearn xgboost statistics
+regression forecasting optimization probability stochastic calculus bayesian
+econometrics trading derivatives options futures equities fixed-income risk
+portfolio alpha backtesting execution market-making arbitrage volatility
+machine-learning deep-learning nlp computer-vision reinforcement time-series
+data-mining visualization tableau excel react node django flask fastapi
+postgres mongodb redis graphql microservices ci git agile scrum leadership
+mentoring research publications teaching phd masters physics mathematics
+engineering computer-science finance economics biology chemistry
+""".split()
+SECTIONS = ["SUMMARY", "SKILLS", "EXPERIENCE", "EDUCATION", "PUBLICATIONS", "PROJECTS"]
+
+
+def make_vocabulary(size: int, rng: random.Random) -> list[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(4, 10))) for _ in range(size)]
+
+
+def synthetic_cv(index: int, vocabulary: list[str], rng: random.Random) -> str:
+    """A CV of about 300 words: Zipf-distributed skills and filler words."""
+    skills = rng.choices(SKILLS, weights=[1 / (rank + 1) for rank in range(len(SKILLS))], k=25)
+    words = rng.choices(vocabulary, cum_weights=_CUM_WEIGHTS[len(vocabulary)], k=250)
+    lines = [f"CANDIDATE {index}", f"candidate{index}@example.com"]
+    for number, section in enumerate(SECTIONS):
+        lines += ["", section]
+        chunk = words[number * 40:(number + 1) * 40] + skills[number * 4:(number + 1) * 4]
+        lines += ["- " + " ".join(chunk[start:start + 11]) for start in range(0, len(chunk), 11)]
+    return "\n".join(lines)
+
+
+_CUM_WEIGHTS: dict[int, list[float]] = {}
+
+
+def synthetic_jd(rng: random.Random) -> str:
+    skills = rng.sample(SKILLS, 15)
+    return "Requirements\n" + "\n".join(
+        f"- Strong {first} and {second} skills" for first, second in zip(skills[::2], skills[1::2])
+    )
+
+
+def run_size(size: int, args) -> dict:
+    rng = random.Random(size)
+    vocabulary = make_vocabulary(20000, rng)
+    if len(vocabulary) not in _CUM_WEIGHTS:
+        total, cumulative = 0.0, []
+        for rank in range(len(vocabulary)):
+            total += 1 / (rank + 1)
+            cumulative.append(total)
+        _CUM_WEIGHTS[len(vocabulary)] = cumulative
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = CVIndex(Path(tmp) / "index.db")
+        generate = ingest = 0.0
+        for first in range(0, size, args.batch):
+            start = time.perf_counter()
+            batch = [
+                (f"/corpus/cv{i:06d}.pdf", synthetic_cv(i, vocabulary, rng))
+                for i in range(first, min(size, first + args.batch))
+            ]
+            generate += time.perf_counter() - start
+            start = time.perf_counter()
+            index.add_many(batch)
+            ingest += time.perf_counter() - start
+
+        # Re-adding unchanged CVs only compares digests
+        start = time.perf_counter()
+        index.add_many(batch)
+        unchanged_per_s = len(batch) / (time.perf_counter() - start)
+
+        jds = [(ROOT / "sample_JD.txt").read_text(encoding="utf-8")]
+        jds += [synthetic_jd(rng) for _ in range(args.queries - 1)]
+        index.search(jds[0], args.top)  # Warms up the page cache
+        latencies, overlaps = [], []
+        for jd in jds:
+            start = time.perf_counter()
+            found = index.search(jd, args.top)
+            latencies.append(time.perf_counter() - start)
+            exact = index.search(jd, args.top, exhaustive=True)
+            overlaps.append(
+                len({c.path for c in found} & {c.path for c in exact}) / max(1, len(exact))
+            )
+        start = time.perf_counter()
+        for jd in jds:
+            index.search(jd, args.top, exhaustive=True)
+        exhaustive_ms = (time.perf_counter() - start) / len(jds) * 1000
+
+        latencies.sort()
+        result = {
+            "documents": size,
+            "vocabulary": index.vocabulary,
+            "segments": index.segments,
+            "ingest_per_s": size / ingest,
+            "unchanged_per_s": unchanged_per_s,
+            "query_p50_ms": statistics.median(latencies) * 1000,
+            "query_p95_ms": latencies[int(0.95 * (len(latencies) - 1))] * 1000,
+            "queries_per_s": len(latencies) / sum(latencies),
+            "exhaustive_ms": exhaustive_ms,
+            "top_k_overlap": statistics.mean(overlaps),
+        }
+        # Closing checkpoints the write-ahead log into the index file
+        index.close()
+        result["index_mb"] = (Path(tmp) / "index.db").stat().st_size / 1024 / 1024
+    return result
+
+
+def run_benchmark(args) -> dict:
+    return {
+        "benchmark": "cv_index",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {"queries": args.queries, "top": args.top, "batch": args.batch},
+        "results": [run_size(size, args) for size in args.sizes],
+    }
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000],
+                        help="Corpus sizes (default: 10000 100000)")
+    parser.add_argument("--queries", type=int, default=50,
+                        help="JDs queried per corpus (default: 50)")
+    parser.add_argument("--top", type=int, default=10,
+                        help="Candidates per query (default: 10)")
+    parser.add_argument("--batch", type=int, default=1000,
+                        help="CVs ingested per transaction (default: 1000)")
+    parser.add_argument("-o", "--output", type=Path, default=Path("bench_cv_index.json"),
+                        help="Results file (default: bench_cv_index.json)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    results = run_benchmark(args)
+    args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    print(f"{'CVs':>8}{'ingest/s':>10}{'index':>9}{'p50':>9}{'p95':>9}"
+          f"{'queries/s':>11}{'exhaustive':>12}{'top-K overlap':>15}")
+    for row in results["results"]:
+        print(f"{row['documents']:>8}{row['ingest_per_s']:>10.0f}{row['index_mb']:>7.0f}MB"
+              f"{row['query_p50_ms']:>7.1f}ms{row['query_p95_ms']:>7.1f}ms"
+              f"{row['queries_per_s']:>11.0f}{row['exhaustive_ms']:>10.1f}ms"
+              f"{row['top_k_overlap']:>15.0%}")
+    print(f"\nResults: {args.output.absolute()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compare direct ingestion with the LLM parser agents.
+
+Runs the full workflow against a stubbed model and a stubbed Tika server in
+both ingestion modes and reports model calls and wall time per run.
+
+Usage:
+    python -m benchmarks.bench_ingestion [--runs N] [--latency SECONDS]
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+# Imported first: sets a placeholder GOOGLE_API_KEY before config loads
+from benchmarks.stubs import stub_tika
+from benchmarks.fake_model import fake_model_factory
+from cv_formatter import CVFormatterOrchestrator
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+async def run_mode(use_llm_parsers: bool, runs: int, latency: float, jd_path: Path) -> dict:
+    """Run the workflow `runs` times in one ingestion mode."""
+    factory = fake_model_factory(latency=latency)
+    orchestrator = CVFormatterOrchestrator(
+        use_llm_parsers=use_llm_parsers, model_factory=factory
+    )
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await orchestrator.format_cv(ROOT / "some_CV.pdf", jd_path)
+        timings.append(time.perf_counter() - start)
+
+    return {
+        "mode": "llm-parsers" if use_llm_parsers else "direct",
+        "model_calls_per_run": factory.stats.total / runs,
+        "mean_s": statistics.mean(timings),
+        "p50_s": statistics.median(timings),
+        "max_s": max(timings),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="Simulated latency per model call in seconds")
+    args = parser.parse_args()
+
+    stub_tika()
+    with tempfile.TemporaryDirectory() as tmp:
+        jd_path = Path(tmp) / "jd.txt"
+        jd_path.write_text((ROOT / "sample_JD.txt").read_text(encoding="utf-8"), encoding="utf-8")
+
+        results = [
+            await run_mode(True, args.runs, args.latency, jd_path),
+            await run_mode(False, args.runs, args.latency, jd_path),
+        ]
+
+    print(f"{'mode':<14}{'calls/run':>10}{'mean (s)':>12}{'p50 (s)':>12}{'max (s)':>12}")
+    for r in results:
+        print(f"{r['mode']:<14}{r['model_calls_per_run']:>10.1f}{r['mean_s']:>12.4f}"
+              f"{r['p50_s']:>12.4f}{r['max_s']:>12.4f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""
+Per-engine latency and memory benchmark for PDF text extraction.
+
+Extracts every PDF in a corpus with each engine through PDFParser and
+reports per-document latency and peak Python memory. Without --tika-endpoint
+the tika engine talks to a local stand-in server, so its numbers cover the
+client side and HTTP hop only.
+
+Usage:
+    python -m benchmarks.bench_pdf_engines [CORPUS_DIR] [--runs N]
+        [--tika-endpoint URL]
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.stubs import StandInTikaServer
+
+from cv_formatter.parsers import PDFParser, TikaServerPool
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def bench_engine(parser: PDFParser, corpus: list[Path], runs: int) -> dict:
+    """Extract the corpus `runs` times and collect latency and peak memory."""
+    for pdf in corpus:
+        parser.extract_text(pdf)  # warm up imports, servers and connections
+
+    latencies = []
+    for _ in range(runs):
+        for pdf in corpus:
+            start = time.perf_counter()
+            text = parser.extract_text(pdf)
+            latencies.append(time.perf_counter() - start)
+            assert text == text.lstrip() and all(
+                line == line.rstrip() for line in text.splitlines()
+            ), f"{parser.engine.name} returned unnormalized text for {pdf}"
+
+    # Memory is measured in a separate pass since tracing skews latency
+    tracemalloc.start()
+    for pdf in corpus:
+        parser.extract_text(pdf)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "max_ms": max(latencies) * 1000,
+        "peak_kib": peak / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("corpus", nargs="?", type=Path, default=ROOT,
+                        help="Directory of CV PDFs (default: repository root)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--tika-endpoint", default=None,
+                        help="Real Tika server to benchmark instead of the stand-in")
+    args = parser.parse_args()
+
+    corpus = sorted(args.corpus.glob("*.pdf"))
+    if not corpus:
+        parser.error(f"No PDFs found in {args.corpus}")
+
+    stand_in = None
+    endpoint = args.tika_endpoint
+    if endpoint is None:
+        stand_in = StandInTikaServer().start()
+        endpoint = stand_in.endpoint
+
+    with TikaServerPool(endpoints=[endpoint]) as pool:
+        results = {
+            engine: bench_engine(PDFParser(pool=pool, engine=engine), corpus, args.runs)
+            for engine in ("tika", "pdfminer")
+        }
+
+    if stand_in is not None:
+        stand_in.stop()
+
+    print(f"Corpus: {len(corpus)} PDF(s) x {args.runs} run(s)\n")
+    print(f"{'engine':<10}{'mean (ms)':>11}{'p50 (ms)':>11}{'max (ms)':>11}{'peak KiB':>11}")
+    for engine, r in results.items():
+        print(f"{engine:<10}{r['mean_ms']:>11.2f}{r['p50_ms']:>11.2f}"
+              f"{r['max_ms']:>11.2f}{r['peak_kib']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
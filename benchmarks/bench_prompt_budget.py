@@ -0,0 +1,186 @@
+"""
+Rewrite_Agent prompt size and latency with and without the prompt budget.
+
+Runs the workflow over a corpus of CVs (the sample CV plus synthetic
+academic CVs with a growing number of publications), once with the full
+interpolated prompt and conversation history, as before the budget, and
+once with deduplication and the token budget. The stand-in Tika server
+returns each CV's text, CV_Agent's fake analysis repeats the whole CV as a
+thorough model would, and the fake models charge --prompt-latency seconds
+per 1,000 prompt tokens to mimic prefill cost.
+Reports, per CV, Rewrite_Agent's prompt tokens and latency, the time spent
+assembling the prompt, and whether every section heading survived.
+
+Usage:
+    python -m benchmarks.bench_prompt_budget [--budget TOKENS]
+        [--publications 50 200 800] [--prompt-latency SECONDS] [-o FILE]
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import time
+from pathlib import Path
+
+# Imported first: sets a placeholder GOOGLE_API_KEY before config loads
+from benchmarks.stubs import SAMPLE_CV_TEXT, stub_tika
+from benchmarks.fake_model import fake_model_factory
+from cv_formatter.config import config
+from cv_formatter.prompt_budget import is_section_heading
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_TOPICS = [
+    "stochastic volatility", "regime switching", "optimal stopping", "credit risk",
+    "portfolio optimization", "jump diffusion", "mean field games", "option pricing",
+    "risk-sensitive control", "Markov modulated markets", "rough paths", "hedging",
+]
+_VENUES = [
+    "SIAM J. Control Optim.", "Finance and Stochastics", "Math. Finance",
+    "Stochastic Analysis and Applications", "Quantitative Finance", "Ann. Appl. Probab.",
+]
+
+
+def academic_cv(publications: int, seed: int = 0) -> str:
+    """Build a synthetic academic CV with `publications` papers."""
+    rng = random.Random(seed)
+
+    def paper(i: int) -> str:
+        a, b = rng.sample(_TOPICS, 2)
+        return (f"- [{i}] A. Das, R. Sen. {a.capitalize()} under {b}: "
+                f"theory and numerics. {rng.choice(_VENUES)} {2005 + i % 19}, "
+                f"{rng.randint(10, 90)}({rng.randint(1, 6)}), {rng.randint(1, 900)}-{rng.randint(901, 999)}.")
+
+    talks = [f"- Invited talk on {rng.choice(_TOPICS)}, Workshop {i}, {2008 + i % 16}"
+             for i in range(publications // 4)]
+    return "\n\n".join([
+        "ANITA DAS, PH.D.\nQuantitative Researcher\nanita.das@example.com | +91 00000 00000",
+        "PROFESSIONAL SUMMARY\nResearcher in mathematical finance with "
+        f"{publications} peer-reviewed papers on stochastic control and derivative pricing.",
+        "SKILLS\n- Python, C++, R, MATLAB\n- Stochastic calculus, PDE methods, Monte Carlo",
+        "EXPERIENCE\nAssociate Professor | Institute of Science | 2016-Present\n"
+        "- Lead a group of six researchers on stochastic control in finance\n"
+        "Postdoctoral Fellow | Research Centre | 2013-2016\n"
+        "- Developed numerical schemes for regime-switching option pricing",
+        "EDUCATION\nPh.D. Mathematics | Institute of Science | 2013\n"
+        "M.Sc. Applied Mathematics | University | 2010",
+        "PUBLICATIONS\n" + "\n".join(paper(i) for i in range(1, publications + 1)),
+        "CONFERENCES\n" + "\n".join(talks),
+        "TEACHING\n- Probability Theory\n- Stochastic Processes\n- Numerical Analysis",
+        "AWARDS\n- Best Thesis Award, 2013\n- National Research Fellowship, 2009",
+    ])
+
+
+def corpus(publication_counts: list[int]) -> dict[str, str]:
+    """Name to CV text: the sample CV and the synthetic academic CVs."""
+    cvs = {"sample": SAMPLE_CV_TEXT}
+    for count in publication_counts:
+        cvs[f"academic_{count}"] = academic_cv(count)
+    return cvs
+
+
+async def run_cv(cv_text: str, baseline: bool, budget: int, prompt_latency: float) -> dict:
+    """
+    Run the workflow on one CV and measure Rewrite_Agent's prompt.
+
+    The baseline is the prompt as it was before the budget: every slot in
+    full and the conversation history repeating the earlier agents' output.
+    """
+    from cv_formatter.orchestrator import CVFormatterOrchestrator
+
+    config.rewrite_prompt_budget = None if baseline else budget
+    config.rewrite_prompt_dedupe = not baseline
+    analysis = "Candidate analysis, covering every section of the CV:\n" + cv_text
+    factory = fake_model_factory(
+        responses={"CV_Agent": analysis}, prompt_latency=prompt_latency
+    )
+    orchestrator = CVFormatterOrchestrator(model_factory=factory)
+    if baseline:
+        orchestrator.rewrite_agent.get_agent().include_contents = "default"
+
+    result = await orchestrator.format_cv_detailed(ROOT / "some_CV.pdf", ROOT / "sample_JD.txt")
+    span = result.trace.find("Rewrite_Agent")
+
+    # Assemble the prompt again, outside the workflow, to time it and check it
+    rewrite = orchestrator.rewrite_agent
+    state = {
+        "CV_text": cv_text,
+        "CV_context": analysis,
+        "JD_context": factory("JD_Agent").response,
+        "Company_context": factory("Company_Agent").response,
+    }
+    start = time.perf_counter()
+    assembly = rewrite.assemble(state)
+    assembly_ms = (time.perf_counter() - start) * 1000
+    headings = [line for line in cv_text.splitlines() if is_section_heading(line)]
+    orchestrator.close()
+
+    return {
+        "prompt_tokens": span.input_tokens,
+        "rewrite_ms": span.duration * 1000,
+        "assembly_ms": assembly_ms,
+        "deduped_lines": sum(report.deduped_lines for report in assembly.reports),
+        "trimmed": [report.name for report in assembly.reports if report.trimmed],
+        "sections_kept": all(h in assembly.slots["CV_text"] for h in headings),
+    }
+
+
+async def run_benchmark(args) -> dict:
+    results = []
+    for name, cv_text in corpus(args.publications).items():
+        server = stub_tika(text=cv_text)
+        try:
+            before = await run_cv(cv_text, True, args.budget, args.prompt_latency)
+            after = await run_cv(cv_text, False, args.budget, args.prompt_latency)
+        finally:
+            server.stop()
+        results.append({"cv": name, "before": before, "after": after})
+    return {
+        "benchmark": "prompt_budget",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {"budget": args.budget, "prompt_latency_s": args.prompt_latency},
+        "results": results,
+    }
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget", type=int, default=12000,
+                        help="Rewrite prompt budget in tokens (default: 12000)")
+    parser.add_argument("--publications", type=int, nargs="+", default=[50, 200, 800],
+                        help="Papers in each synthetic academic CV (default: 50 200 800)")
+    parser.add_argument("--prompt-latency", type=float, default=0.05,
+                        help="Simulated seconds per 1,000 prompt tokens (default: 0.05)")
+    parser.add_argument("-o", "--output", type=Path, default=Path("bench_prompt_budget.json"),
+                        help="Results file (default: bench_prompt_budget.json)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    config.text_cache_enabled = False
+    config.analysis_memo_enabled = False
+    config.company_cache_enabled = False
+    config.incremental_rerun = False
+
+    results = asyncio.run(run_benchmark(args))
+    args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    print(f"Budget: {args.budget} tokens; {args.prompt_latency}s per 1k prompt tokens\n")
+    print(f"{'cv':<14}{'tokens before':>14}{'after':>8}{'latency before':>16}{'after':>9}"
+          f"{'assembly':>10}{'deduped':>9}  sections  trimmed")
+    for row in results["results"]:
+        before, after = row["before"], row["after"]
+        print(f"{row['cv']:<14}{before['prompt_tokens']:>14}{after['prompt_tokens']:>8}"
+              f"{before['rewrite_ms']:>14.0f}ms{after['rewrite_ms']:>7.0f}ms"
+              f"{after['assembly_ms']:>8.2f}ms{after['deduped_lines']:>9}"
+              f"  {'all kept' if after['sections_kept'] else 'LOST':<8}  "
+              f"{', '.join(after['trimmed']) or '-'}")
+    print(f"\nResults: {args.output.absolute()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Documents per second of format_output() against the bulk Renderer API.
+
+Renders a batch of distinct CVs (the sample CV with a per-document line)
+as Markdown and HTML, first one format_output() call per document, then one
+Renderer.render_many() call for the batch with a shared timestamp. Then it
+writes them to files, with one write_text(format_output()) per document
+against one Renderer.write_many() call. Reports the best of --repeat runs.
+
+Usage:
+    python -m benchmarks.bench_render [--documents N] [--repeat N] [-o FILE]
+"""
+import argparse
+import json
+import platform
+import tempfile
+import time
+from pathlib import Path
+
+# Imported first: sets a placeholder GOOGLE_API_KEY before config loads
+from benchmarks.stubs import SAMPLE_CV_TEXT
+from cv_formatter.formatter import Renderer, format_output
+
+
+def best_rate(run, documents: int, repeat: int) -> float:
+    """Documents per second of the fastest of `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return documents / best
+
+
+def run_benchmark(args) -> dict:
+    contents = [f"{SAMPLE_CV_TEXT}\nREFERENCE {i}" for i in range(args.documents)]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [Path(tmp) / f"{i:05d}" for i in range(args.documents)]
+        for format_type in ("markdown", "html"):
+            renderer = Renderer(format_type)
+
+            def write_each():
+                for path, content in zip(paths, contents):
+                    path.write_text(format_output(content, format_type), encoding="utf-8")
+
+            results.append({
+                "format": format_type,
+                "format_output_per_s": best_rate(
+                    lambda: [format_output(content, format_type) for content in contents],
+                    args.documents, args.repeat,
+                ),
+                "render_many_per_s": best_rate(
+                    lambda: renderer.render_many(contents), args.documents, args.repeat
+                ),
+                "write_text_per_s": best_rate(write_each, args.documents, args.repeat),
+                "write_many_per_s": best_rate(
+                    lambda: renderer.write_many(zip(paths, contents)), args.documents, args.repeat
+                ),
+            })
+    return {
+        "benchmark": "render",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {"documents": args.documents, "repeat": args.repeat},
+        "results": results,
+    }
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--documents", type=int, default=5000,
+                        help="Documents per batch (default: 5000)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Runs per measurement; the best is kept (default: 5)")
+    parser.add_argument("-o", "--output", type=Path, default=Path("bench_render.json"),
+                        help="Results file (default: bench_render.json)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    results = run_benchmark(args)
+    args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    print(f"{args.documents} documents, documents/s (best of {args.repeat})\n")
+    print(f"{'format':<10}{'format_output':>15}{'render_many':>13}"
+          f"{'write_text':>12}{'write_many':>12}")
+    for row in results["results"]:
+        print(f"{row['format']:<10}{row['format_output_per_s']:>15.0f}"
+              f"{row['render_many_per_s']:>13.0f}{row['write_text_per_s']:>12.0f}"
+              f"{row['write_many_per_s']:>12.0f}")
+    print(f"\nResults: {args.output.absolute()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Session store memory benchmark.
+
+Simulates many workflow runs against a session service, each appending the
+events a real run produces (seeded CV/JD text, the three analyses and the
+rewritten CV), and reports Python heap usage as the runs accumulate. Runs
+keep their sessions, as named sessions do, which is the worst case for an
+unbounded store.
+
+Backends:
+- unbounded: ADK's InMemorySessionService, which keeps every session
+- bounded: BoundedSessionService with the SESSION_* limits
+- sqlite: SqliteSessionService writing to a temporary file
+
+Usage:
+    python -m benchmarks.bench_sessions [--runs N] [--backends ...]
+        [--max-sessions N] [--max-bytes N] [-o FILE]
+"""
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from cv_formatter.config import config
+from cv_formatter.sessions import BoundedSessionService, SqliteSessionService
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def run_events(i: int, jd_text: str) -> list[Event]:
+    """Events of one simulated run, sized like a real CV and JD."""
+    cv_text = f"Candidate {i}\n" + "Led projects delivering measurable results. " * 140
+    outputs = {
+        "CV_Agent": ("CV_context", "Strength: distributed systems. " * 70),
+        "JD_Agent": ("JD_context", "Requirement: Python, SQL, cloud. " * 60),
+        "Company_Agent": ("Company_context", "Company culture and products. " * 50),
+        "Rewrite_Agent": ("Reformatted_CV", "PROFESSIONAL SUMMARY\n" + cv_text),
+    }
+    events = [
+        Event(
+            author="user",
+            invocation_id=Event.new_id(),
+            actions=EventActions(state_delta={"CV_text": cv_text, "JD_text": jd_text}),
+        ),
+        Event(
+            author="user",
+            invocation_id=Event.new_id(),
+            content=types.Content(role="user", parts=[types.Part(text=f"CV {i} ; JD {i}")]),
+        ),
+    ]
+    for author, (key, text) in outputs.items():
+        events.append(Event(
+            author=author,
+            invocation_id=Event.new_id(),
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+            actions=EventActions(state_delta={key: text}),
+        ))
+    return events
+
+
+def make_service(backend: str, args, tmp: Path):
+    if backend == "unbounded":
+        return InMemorySessionService()
+    if backend == "bounded":
+        return BoundedSessionService(
+            max_sessions=args.max_sessions, ttl=config.session_ttl, max_bytes=args.max_bytes
+        )
+    return SqliteSessionService(
+        tmp / "sessions.db", max_sessions=args.max_sessions,
+        ttl=config.session_ttl, max_bytes=args.max_bytes,
+    )
+
+
+async def run_backend(backend: str, args, tmp: Path) -> dict:
+    """Run the simulated workflows against one backend."""
+    jd_text = (ROOT / "sample_JD.txt").read_text(encoding="utf-8")
+    service = make_service(backend, args, tmp)
+    checkpoints = []
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    for i in range(1, args.runs + 1):
+        session = await service.create_session(
+            app_name=config.app_name, user_id=config.user_id, session_id=f"run-{i}"
+        )
+        for event in run_events(i, jd_text):
+            await service.append_event(session, event)
+        if i % args.every == 0 or i == args.runs:
+            current, peak = tracemalloc.get_traced_memory()
+            checkpoints.append({
+                "runs": i,
+                "heap_mib": (current - baseline) / 2**20,
+                "peak_mib": (peak - baseline) / 2**20,
+            })
+    wall = time.perf_counter() - start
+    tracemalloc.stop()
+
+    listed = await service.list_sessions(app_name=config.app_name, user_id=config.user_id)
+    result = {
+        "backend": backend,
+        "sessions_kept": len(listed.sessions),
+        "ms_per_run": wall / args.runs * 1000,
+        "checkpoints": checkpoints,
+    }
+    if backend == "sqlite":
+        result["db_mib"] = service.path.stat().st_size / 2**20
+        service.close()
+    return result
+
+
+async def run_benchmark(args) -> list[dict]:
+    with tempfile.TemporaryDirectory() as tmp:
+        return [await run_backend(backend, args, Path(tmp)) for backend in args.backends]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10_000,
+                        help="Simulated runs per backend (default: 10000)")
+    parser.add_argument("--every", type=int, default=2_000,
+                        help="Runs between memory checkpoints (default: 2000)")
+    parser.add_argument("--backends", nargs="+", default=["unbounded", "bounded", "sqlite"],
+                        choices=["unbounded", "bounded", "sqlite"])
+    parser.add_argument("--max-sessions", type=int, default=config.session_max_count,
+                        help="Session count limit of the bounded backends")
+    parser.add_argument("--max-bytes", type=int, default=config.session_max_bytes,
+                        help="Byte budget of the bounded backends")
+    parser.add_argument("-o", "--output", type=Path, default=Path("bench_sessions.json"),
+                        help="Results file (default: bench_sessions.json)")
+    args = parser.parse_args()
+
+    results = {
+        "benchmark": "sessions",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "params": {"runs": args.runs, "max_sessions": args.max_sessions,
+                   "max_bytes": args.max_bytes},
+        "backends": asyncio.run(run_benchmark(args)),
+    }
+    args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    print(f"{'backend':<11}{'runs':>8}{'heap (MiB)':>12}{'peak (MiB)':>12}")
+    for result in results["backends"]:
+        for point in result["checkpoints"]:
+            print(f"{result['backend']:<11}{point['runs']:>8}"
+                  f"{point['heap_mib']:>12.1f}{point['peak_mib']:>12.1f}")
+    print()
+    for result in results["backends"]:
+        extra = f", database {result['db_mib']:.1f} MiB" if "db_mib" in result else ""
+        print(f"{result['backend']}: {result['sessions_kept']} sessions kept, "
+              f"{result['ms_per_run']:.2f} ms/run{extra}")
+    print(f"\nResults: {args.output.absolute()}")
+
+
+if __name__ == "__main__":
+    main()
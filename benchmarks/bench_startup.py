@@ -0,0 +1,172 @@
+"""
+CLI startup and import-time benchmark.
+
+Measures, in fresh interpreter processes:
+
+- help: `python -m cv_formatter.main --help`
+- import: `import cv_formatter`
+- run: one complete offline workflow run (fake models, stand-in Tika),
+  from interpreter start to the reformatted CV
+
+Each scenario reports wall time and the cumulative import time of the
+modules it loads (from `python -X importtime`), plus the slowest
+dependencies imported directly by the help scenario.
+
+Usage:
+    python -m benchmarks.bench_startup [--runs N] [-o FILE] [--compare FILE]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCENARIOS = {
+    "help": ["-m", "cv_formatter.main", "--help"],
+    "import": ["-c", "import cv_formatter"],
+    "run": ["-m", "benchmarks.bench_startup", "--child-run"],
+}
+
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def _environment() -> dict:
+    env = dict(os.environ)
+    env.setdefault("GOOGLE_API_KEY", "benchmark-placeholder")
+    env.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="cv_formatter_bench_"))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+    return env
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, Optional[str]]]:
+    """Return (module, cumulative us, importing module) for each import."""
+    entries = [
+        (match.group(4), int(match.group(2)), len(match.group(3)) // 2)
+        for match in _IMPORTTIME_RE.finditer(stderr)
+    ]
+    # Output is in post-order: a module is listed after everything it imports
+    imports = []
+    stack: list[str] = []
+    for name, cumulative, depth in reversed(entries):
+        del stack[depth:]
+        imports.append((name, cumulative, stack[-1] if stack else None))
+        stack.append(name)
+    return imports
+
+
+def _is_ours(module: Optional[str]) -> bool:
+    return module is not None and module.split(".")[0] in ("cv_formatter", "benchmarks")
+
+
+def run_scenario(args: list[str], runs: int) -> dict:
+    """Time a scenario in fresh processes and profile its imports once."""
+    env = _environment()
+    wall = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        wall.append(time.perf_counter() - start)
+
+    profile = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=ROOT, env=env,
+                             check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                             text=True)
+    imports = parse_importtime(profile.stderr)
+    # Dependencies pulled in directly by our modules or by the interpreter
+    boundary = sorted(
+        (i for i in imports if not _is_ours(i[0]) and (i[2] is None or _is_ours(i[2]))),
+        key=lambda i: -i[1],
+    )
+    modules = {name for name, _, _ in imports}
+    return {
+        "wall_ms_mean": statistics.mean(wall) * 1000,
+        "wall_ms_min": min(wall) * 1000,
+        "import_ms": sum(cumulative for _, cumulative, parent in imports if parent is None) / 1000,
+        "modules": len(modules),
+        "loads_google_adk": "google.adk" in modules,
+        "loads_tika": "tika" in modules,
+        "slowest_imports": [
+            {"module": name, "ms": cumulative / 1000, "imported_by": parent}
+            for name, cumulative, parent in boundary[:8]
+        ],
+    }
+
+
+def child_run() -> None:
+    """Run one offline workflow; executed in a fresh process by the parent."""
+    from benchmarks.stubs import stub_tika
+    from benchmarks.fake_model import fake_model_factory
+    from cv_formatter import CVFormatterOrchestrator
+
+    async def run():
+        orchestrator = CVFormatterOrchestrator(model_factory=fake_model_factory())
+        try:
+            await orchestrator.format_cv(ROOT / "some_CV.pdf", ROOT / "sample_JD.txt")
+        finally:
+            orchestrator.close()
+
+    server = stub_tika()
+    try:
+        asyncio.run(run())
+    finally:
+        server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5,
+                        help="Processes started per scenario (default: 5)")
+    parser.add_argument("-o", "--output", type=Path, default=Path("bench_startup.json"),
+                        help="Results file (default: bench_startup.json)")
+    parser.add_argument("--compare", type=Path, default=None,
+                        help="Earlier results file to compare against")
+    parser.add_argument("--child-run", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child_run:
+        child_run()
+        return
+
+    results = {
+        "benchmark": "startup",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": args.runs,
+        "scenarios": {name: run_scenario(argv, args.runs) for name, argv in SCENARIOS.items()},
+    }
+    args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    baseline = json.loads(args.compare.read_text(encoding="utf-8")) if args.compare else {}
+    print(f"{'scenario':<10}{'wall (ms)':>18}{'imports (ms)':>18}{'modules':>9}  adk  tika")
+    for name, result in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        cells = []
+        for key in ("wall_ms_mean", "import_ms"):
+            cell = f"{result[key]:.0f}"
+            if base and base.get(key):
+                cell += f" ({(result[key] - base[key]) / base[key] * 100:+.0f}%)"
+            cells.append(f"{cell:>18}")
+        print(f"{name:<10}{''.join(cells)}{result['modules']:>9}"
+              f"  {'yes' if result['loads_google_adk'] else 'no ':<4} "
+              f"{'yes' if result['loads_tika'] else 'no'}")
+
+    print("\nSlowest dependency imports for --help:")
+    for entry in results["scenarios"]["help"]["slowest_imports"]:
+        print(f"  {entry['ms']:>8.1f} ms  {entry['module']} "
+              f"(from {entry['imported_by'] or 'interpreter'})")
+    print(f"\nResults: {args.output.absolute()}")
+
+
+if __name__ == "__main__":
+    main()
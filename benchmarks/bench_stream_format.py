@@ -0,0 +1,145 @@
+"""
+Time and peak memory of formatting a large CV to a file, whole or streamed.
+
+Generates CV text of each size from repeated synthetic academic CVs,
+delivered in chunks as the model streams it, and writes it as Markdown and
+HTML two ways: joining the chunks and writing format_output()'s document,
+as `--stream` did for these formats, and feeding the chunks through
+write_formatted(). Batch mode, which has the whole text, is measured the
+same way: writing format_output()'s document, as it did, against
+write_output(). Reports, per size and format, the time of each and the
+peak Python memory they allocate beyond the input text, measured in a
+separate pass since tracemalloc slows allocation.
+
+Usage:
+    python -m benchmarks.bench_stream_format [--sizes 1 8 32] [--chunk-size BYTES]
+        [--repeat N] [-o FILE]
+"""
+import argparse
+import json
+import platform
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Iterator
+
+# Imported first: sets a placeholder GOOGLE_API_KEY before config loads
+import benchmarks.stubs  # noqa: F401
+from benchmarks.bench_prompt_budget import academic_cv
+from cv_formatter.formatter import format_output, write_formatted, write_output
+
+TIMESTAMP = "2024-01-01 00:00:00"
+
+
+def cv_chunks(size_mb: float, chunk_size: int) -> Iterator[str]:
+    """Yield about `size_mb` MB of CV text in chunks of `chunk_size` characters."""
+    block = academic_cv(200) + "\n\n"
+    blocks = max(1, int(size_mb * 1024 * 1024 / len(block)))
+    for _ in range(blocks):
+        for start in range(0, len(block), chunk_size):
+            yield block[start:start + chunk_size]
+
+
+def write_whole(path: Path, chunks: Iterator[str], format_type: str) -> None:
+    text = "".join(chunks)
+    path.write_text(format_output(text, format_type), encoding="utf-8")
+
+
+def write_streamed(path: Path, chunks: Iterator[str], format_type: str) -> None:
+    with path.open("w", encoding="utf-8") as out:
+        write_formatted(chunks, out, format_type)
+
+
+def write_whole_text(path: Path, text: str, format_type: str) -> None:
+    path.write_text(format_output(text, format_type), encoding="utf-8")
+
+
+def measure(writer, path: Path, source, format_type: str, repeat: int) -> dict:
+    """Best time of `repeat` runs, then peak memory of one traced run."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        writer(path, source(), format_type)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    writer(path, source(), format_type)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": min(times), "peak_kib": peak / 1024, "bytes": path.stat().st_size}
+
+
+def _same_document(first: Path, second: Path) -> bool:
+    """Compare two documents, ignoring their generation time."""
+    def body(path: Path) -> str:
+        return path.read_text(encoding="utf-8").split("Generated on: ")[1][len(TIMESTAMP):]
+    return body(first) == body(second)
+
+
+def run_benchmark(args) -> dict:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        whole_path, streamed_path = Path(tmp) / "whole", Path(tmp) / "streamed"
+        for size_mb in args.sizes:
+            def chunks():
+                return cv_chunks(size_mb, args.chunk_size)
+
+            text = "".join(chunks())
+            for format_type in ("markdown", "html"):
+                row = {"size_mb": size_mb, "format": format_type}
+                for mode, whole_writer, whole_source, streamed_writer, streamed_source in (
+                    ("stream", write_whole, chunks, write_streamed, chunks),
+                    ("batch", write_whole_text, lambda: text, write_output, lambda: text),
+                ):
+                    row[mode] = {
+                        "whole": measure(whole_writer, whole_path, whole_source,
+                                         format_type, args.repeat),
+                        "streamed": measure(streamed_writer, streamed_path, streamed_source,
+                                            format_type, args.repeat),
+                        "identical": _same_document(whole_path, streamed_path),
+                    }
+                results.append(row)
+            del text
+    return {
+        "benchmark": "stream_format",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {"chunk_size": args.chunk_size, "repeat": args.repeat},
+        "results": results,
+    }
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 8, 32],
+                        help="CV sizes in MB (default: 1 8 32)")
+    parser.add_argument("--chunk-size", type=int, default=64,
+                        help="Characters per streamed chunk (default: 64)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Timed runs per measurement; the best is kept (default: 3)")
+    parser.add_argument("-o", "--output", type=Path, default=Path("bench_stream_format.json"),
+                        help="Results file (default: bench_stream_format.json)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    results = run_benchmark(args)
+    args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    print(f"{'size':>7}  {'format':<9}{'mode':<7}{'whole':>9}{'streamed':>10}"
+          f"{'peak whole':>13}{'streamed':>11}  output")
+    for row in results["results"]:
+        for mode in ("stream", "batch"):
+            whole, streamed = row[mode]["whole"], row[mode]["streamed"]
+            print(f"{row['size_mb']:>5.0f}MB  {row['format']:<9}{mode:<7}"
+                  f"{whole['seconds'] * 1000:>7.0f}ms{streamed['seconds'] * 1000:>8.0f}ms"
+                  f"{whole['peak_kib'] / 1024:>11.1f}MB{streamed['peak_kib'] / 1024:>9.2f}MB"
+                  f"  {'identical' if row[mode]['identical'] else 'DIFFERS'}")
+    print(f"\nResults: {args.output.absolute()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark the managed Tika server pool against per-call tika.parser.
+
+Both paths talk to local stand-in Tika servers, so the numbers isolate
+client-side overhead, connection reuse and load spreading.
+
+Usage:
+    python -m benchmarks.bench_tika_pool [--servers N] [--requests N]
+        [--concurrency N] [--latency SECONDS] [--startup-delay SECONDS]
+"""
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from benchmarks.stubs import StandInTikaServer
+
+from cv_formatter.parsers import TikaServerPool
+
+ROOT = Path(__file__).resolve().parent.parent
+PDF_PATH = ROOT / "some_CV.pdf"
+
+
+def measure(extract, requests: int, concurrency: int) -> dict:
+    """Report warm sequential latency and concurrent throughput of `extract`."""
+    extract(PDF_PATH)  # warm up
+
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        extract(PDF_PATH)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(lambda _: extract(PDF_PATH), range(requests)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": statistics.quantiles(latencies, n=20)[-1] * 1000,
+        "throughput": requests / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--servers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.01,
+                        help="Simulated extraction time per document")
+    parser.add_argument("--startup-delay", type=float, default=0.5,
+                        help="Simulated server warm-up before it reports healthy")
+    args = parser.parse_args()
+
+    from tika import parser as tika_parser
+
+    single = StandInTikaServer(latency=args.latency).start()
+    baseline = measure(
+        lambda path: tika_parser.from_file(str(path), serverEndpoint=single.endpoint),
+        args.requests,
+        args.concurrency,
+    )
+    single.stop()
+
+    servers = [
+        StandInTikaServer(latency=args.latency, startup_delay=args.startup_delay).start()
+        for _ in range(args.servers)
+    ]
+    pool = TikaServerPool(endpoints=[s.endpoint for s in servers])
+    start = time.perf_counter()
+    pool.start()
+    startup = time.perf_counter() - start
+    pooled = measure(pool.extract_text, args.requests, args.concurrency)
+    pool.close()
+    spread = [s.requests for s in servers]
+    for server in servers:
+        server.stop()
+
+    print(f"Pool startup ({args.servers} servers): {startup:.3f}s")
+    print(f"Requests per server: {spread}\n")
+    print(f"{'backend':<22}{'p50 (ms)':>10}{'p95 (ms)':>10}{'docs/s':>10}")
+    for name, r in (("tika.parser per call", baseline), (f"pool x{args.servers}", pooled)):
+        print(f"{name:<22}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['throughput']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
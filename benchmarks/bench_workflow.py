@@ -0,0 +1,263 @@
+"""
+End-to-end workflow benchmark with fake models and a stub Tika server.
+
+Runs format_cv with every agent's model replaced by FakeGemini and PDF
+extraction pointed at a local stand-in Tika server, so no API key or JVM is
+needed. Reports, per concurrency level, latency percentiles, throughput,
+model tokens and peak Python memory, plus the orchestration overhead of a
+single run with zero model and Tika latency. Caches are disabled unless
+--caches is given, so every run exercises every agent.
+
+Results are written as JSON for comparison across commits:
+
+    python -m benchmarks.bench_workflow -o before.json
+    git checkout my-branch
+    python -m benchmarks.bench_workflow -o after.json --compare before.json
+
+Usage:
+    python -m benchmarks.bench_workflow [--runs N] [--concurrency 1 4 16]
+        [--latency SECONDS] [--tika-latency SECONDS] [--llm-parsers]
+        [--responses FILE] [--caches] [-o FILE] [--compare FILE]
+"""
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from pathlib import Path
+
+# Imported first: sets a placeholder GOOGLE_API_KEY before config loads
+from benchmarks.stubs import stub_tika
+from benchmarks.fake_model import fake_model_factory
+from cv_formatter.config import config
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Higher is better for these metrics; lower is better for the rest
+_HIGHER_IS_BETTER = {"throughput_rps"}
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def make_orchestrator(args, latency: float):
+    """Build an orchestrator whose agents all use fake models."""
+    from cv_formatter.orchestrator import CVFormatterOrchestrator
+    from cv_formatter.scheduler import ModelScheduler
+
+    responses = json.loads(args.responses.read_text(encoding="utf-8")) if args.responses else None
+    factory = fake_model_factory(
+        responses=responses,
+        latency=latency,
+        prompt_tokens=args.prompt_tokens,
+        output_tokens=args.output_tokens,
+    )
+    orchestrator = CVFormatterOrchestrator(
+        use_llm_parsers=args.llm_parsers,
+        model_factory=factory,
+        scheduler=ModelScheduler(max_concurrency=args.model_concurrency),
+    )
+    return orchestrator, factory
+
+
+async def run_level(args, concurrency: int, runs: int, measure_memory: bool = False) -> dict:
+    """Run `runs` workflows, `concurrency` at a time, on one orchestrator."""
+    orchestrator, factory = make_orchestrator(args, args.latency)
+    cv_path = ROOT / "some_CV.pdf"
+    jd_path = ROOT / "sample_JD.txt"
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    tokens = {"input": 0, "output": 0}
+
+    async def one() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            result = await orchestrator.format_cv_detailed(cv_path, jd_path)
+            latencies.append(time.perf_counter() - start)
+            tokens["input"] += result.trace.input_tokens
+            tokens["output"] += result.trace.output_tokens
+
+    # Warm up imports, the Tika connection and agent construction costs
+    await one()
+    latencies.clear()
+    tokens.update(input=0, output=0)
+    factory.stats.reset()
+
+    if measure_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(runs)))
+    wall = time.perf_counter() - start
+    peak = None
+    if measure_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    orchestrator.close()
+
+    return {
+        "wall_s": wall,
+        "latencies": latencies,
+        "model_calls": factory.stats.total,
+        "tokens": tokens,
+        "peak_bytes": peak,
+    }
+
+
+async def measure_overhead(args, runs: int) -> dict:
+    """Latency of sequential runs with instant models and Tika."""
+    server = stub_tika(latency=0.0)
+    saved_latency, args.latency = args.latency, 0.0
+    try:
+        result = await run_level(args, 1, runs)
+    finally:
+        args.latency = saved_latency
+        server.stop()
+    latencies = result["latencies"]
+    return {
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p50_ms": statistics.median(latencies) * 1000,
+    }
+
+
+async def run_benchmark(args) -> dict:
+    overhead = await measure_overhead(args, min(args.runs, 20))
+
+    server = stub_tika(latency=args.tika_latency)
+    levels = []
+    try:
+        for concurrency in args.concurrency:
+            timed = await run_level(args, concurrency, args.runs)
+            # Memory is measured in a separate pass since tracing skews latency
+            memory = await run_level(args, concurrency, args.runs, measure_memory=True)
+            latencies = timed["latencies"]
+            levels.append({
+                "concurrency": concurrency,
+                "runs": args.runs,
+                "mean_ms": statistics.mean(latencies) * 1000,
+                "p50_ms": statistics.median(latencies) * 1000,
+                "p95_ms": _percentile(latencies, 0.95) * 1000,
+                "max_ms": max(latencies) * 1000,
+                "throughput_rps": args.runs / timed["wall_s"],
+                "model_calls_per_run": timed["model_calls"] / args.runs,
+                "input_tokens_per_run": timed["tokens"]["input"] / args.runs,
+                "output_tokens_per_run": timed["tokens"]["output"] / args.runs,
+                "peak_kib": memory["peak_bytes"] / 1024,
+            })
+    finally:
+        server.stop()
+
+    return {
+        "benchmark": "workflow",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {
+            "runs": args.runs,
+            "latency_s": args.latency,
+            "tika_latency_s": args.tika_latency,
+            "llm_parsers": args.llm_parsers,
+            "caches": args.caches,
+            "model_concurrency": args.model_concurrency,
+            "prompt_tokens": args.prompt_tokens,
+            "output_tokens": args.output_tokens,
+        },
+        "overhead": overhead,
+        "levels": levels,
+    }
+
+
+def print_results(results: dict, baseline: dict | None = None) -> None:
+    """Print the results, with the change against a baseline if given."""
+    overhead = results["overhead"]
+    print(f"Orchestration overhead (zero-latency model/Tika): "
+          f"mean {overhead['mean_ms']:.2f} ms, p50 {overhead['p50_ms']:.2f} ms")
+
+    columns = ["mean_ms", "p50_ms", "p95_ms", "throughput_rps", "peak_kib"]
+    print(f"\n{'conc':>5}" + "".join(f"{name:>16}" for name in columns)
+          + f"{'calls/run':>11}{'tok in/out':>14}")
+    base_levels = {
+        level["concurrency"]: level for level in (baseline or {}).get("levels", [])
+    }
+    for level in results["levels"]:
+        row = f"{level['concurrency']:>5}"
+        base = base_levels.get(level["concurrency"])
+        for name in columns:
+            cell = f"{level[name]:.2f}"
+            if base and base.get(name):
+                change = (level[name] - base[name]) / base[name] * 100
+                cell += f" ({change:+.0f}%)"
+            row += f"{cell:>16}"
+        row += (f"{level['model_calls_per_run']:>11.1f}"
+                f"{level['input_tokens_per_run']:>8.0f}/{level['output_tokens_per_run']:<5.0f}")
+        print(row)
+
+    if baseline:
+        print(f"\nBaseline: {baseline.get('commit')} ({baseline.get('timestamp')}); "
+              f"{', '.join(sorted(_HIGHER_IS_BETTER))} higher is better, others lower")
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=40,
+                        help="Workflow runs per concurrency level (default: 40)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16],
+                        help="Concurrency levels (default: 1 4 16)")
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="Simulated latency per model call in seconds")
+    parser.add_argument("--tika-latency", type=float, default=0.01,
+                        help="Simulated Tika extraction latency in seconds")
+    parser.add_argument("--prompt-tokens", type=int, default=None,
+                        help="Input tokens reported per model call (default: estimated)")
+    parser.add_argument("--output-tokens", type=int, default=None,
+                        help="Output tokens reported per model call (default: estimated)")
+    parser.add_argument("--responses", type=Path, default=None,
+                        help="JSON file mapping agent names to canned responses")
+    parser.add_argument("--llm-parsers", action="store_true",
+                        help="Extract CV/JD text through the parser agents")
+    parser.add_argument("--caches", action="store_true",
+                        help="Keep the text, analysis and company caches enabled")
+    parser.add_argument("--model-concurrency", type=int, default=64,
+                        help="Scheduler cap on in-flight model calls (default: 64)")
+    parser.add_argument("-o", "--output", type=Path, default=Path("bench_workflow.json"),
+                        help="Results file (default: bench_workflow.json)")
+    parser.add_argument("--compare", type=Path, default=None,
+                        help="Earlier results file to compare against")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    if not args.caches:
+        config.text_cache_enabled = False
+        config.analysis_memo_enabled = False
+        config.company_cache_enabled = False
+        config.incremental_rerun = False
+
+    results = asyncio.run(run_benchmark(args))
+    args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+    print_results(results, baseline)
+    print(f"\nResults: {args.output.absolute()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""Scripted stand-in for the Gemini models used by the agents."""
+import asyncio
+import random
+import re
+from collections import Counter
+from typing import AsyncGenerator, Callable, Optional
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import errors, types
+from pydantic import Field
+
+
+# Canned responses for each agent in the workflow
+DEFAULT_RESPONSES = {
+    "PDF_Parser_Agent": "CV text extracted.",
+    "TxtFile_Parser_Agent": "JD text extracted.",
+    "CV_Agent": "Candidate profile: Python, statistics, machine learning.",
+    "JD_Agent": "Requirements: C++, Python, forecasting, data mining.",
+    "Company_Agent": "Research-driven trading firm with an innovative culture.",
+    "Rewrite_Agent": "PROFESSIONAL SUMMARY\n\nQuantitative researcher.\n\nSKILLS\n- Python\n- C++",
+}
+
+
+class ModelCallStats:
+    """Counts model calls per agent across all fake models."""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.throttled = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def record(self, agent_name: str) -> None:
+        self.calls[agent_name] += 1
+
+    @property
+    def total(self) -> int:
+        return sum(self.calls.values())
+
+    def reset(self) -> None:
+        self.calls.clear()
+        self.throttled = 0
+        self.max_in_flight = 0
+
+
+def throttling_error(code: int = 429) -> errors.APIError:
+    """Build the error the Gemini API raises when a request is throttled."""
+    status = "RESOURCE_EXHAUSTED" if code == 429 else "UNAVAILABLE"
+    response = {"error": {"code": code, "message": "Injected by FakeGemini", "status": status}}
+    if code < 500:
+        return errors.ClientError(code, response)
+    return errors.ServerError(code, response)
+
+
+def _query_text(llm_request: LlmRequest) -> str:
+    """Return the first user text in the request."""
+    for content in llm_request.contents:
+        if content.role != "user":
+            continue
+        for part in content.parts or []:
+            if part.text:
+                return part.text
+    return ""
+
+
+def _usage(
+    llm_request: LlmRequest,
+    response: str,
+    prompt_tokens: Optional[int] = None,
+    output_tokens: Optional[int] = None,
+) -> types.GenerateContentResponseUsageMetadata:
+    """Report the given token counts, or approximate them at four characters per token."""
+    if prompt_tokens is None:
+        prompt = len(str(llm_request.config.system_instruction or "")) if llm_request.config else 0
+        for content in llm_request.contents:
+            prompt += sum(len(part.text or "") for part in content.parts or [])
+        prompt_tokens = prompt // 4
+    if output_tokens is None:
+        output_tokens = len(response) // 4
+    return types.GenerateContentResponseUsageMetadata(
+        prompt_token_count=prompt_tokens,
+        candidates_token_count=output_tokens,
+        total_token_count=prompt_tokens + output_tokens,
+    )
+
+
+def parser_tool_args(llm_request: LlmRequest) -> dict:
+    """Pull the file path a parser agent would extract from the query."""
+    match = re.search(r"CV at (.+?) ; JD at (.+)$", _query_text(llm_request))
+    if not match:
+        return {}
+    if "_extract_using_tika" in llm_request.tools_dict:
+        return {"pdf_path": match.group(1).strip()}
+    return {"file_path": match.group(2).strip()}
+
+
+class FakeGemini(BaseLlm):
+    """Fake model that answers with canned text after a fixed latency."""
+
+    model: str = "gemini-2.5-flash"
+    agent_name: str = ""
+    response: str = "OK"
+    latency: float = 0.0
+    # Prefill cost: extra seconds per 1,000 prompt tokens
+    prompt_latency: float = 0.0
+    tool_args: Optional[Callable[[LlmRequest], dict]] = None
+    # Builds the answer from the request instead of the canned response
+    respond: Optional[Callable[[LlmRequest], str]] = None
+    stats: ModelCallStats = Field(default_factory=ModelCallStats)
+    # Throttling injection: fail the first `fail_first` calls, then a random
+    # `error_rate` fraction of calls, with `error_code`
+    fail_first: int = 0
+    error_rate: float = 0.0
+    error_code: int = 429
+    # Reported usage (default: estimated from the prompt and response)
+    prompt_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    # Streaming: characters per partial chunk and the delay between chunks
+    chunk_size: int = 16
+    chunk_latency: float = 0.0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.stats.record(self.agent_name)
+        self.stats.in_flight += 1
+        self.stats.max_in_flight = max(self.stats.max_in_flight, self.stats.in_flight)
+        delay = self.latency
+        if self.prompt_latency:
+            delay += self.prompt_latency * _usage(llm_request, "").prompt_token_count / 1000
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self.stats.in_flight -= 1
+
+        if self.fail_first > 0 or random.random() < self.error_rate:
+            self.fail_first = max(0, self.fail_first - 1)
+            self.stats.throttled += 1
+            raise throttling_error(self.error_code)
+
+        # Call the agent's function tool once, then answer with text
+        last = llm_request.contents[-1] if llm_request.contents else None
+        answered = last is not None and any(
+            part.function_response for part in last.parts or []
+        )
+        tools = [name for name in llm_request.tools_dict if name != "google_search"]
+        if tools and self.tool_args and not answered:
+            call = types.FunctionCall(name=tools[0], args=self.tool_args(llm_request))
+            yield LlmResponse(
+                content=types.Content(role="model", parts=[types.Part(function_call=call)])
+            )
+            return
+
+        text = self.respond(llm_request) if self.respond else self.response
+        if stream:
+            # Mirror Gemini's SSE mode: partial chunks, then the aggregate
+            for start in range(0, len(text), self.chunk_size):
+                if start:
+                    await asyncio.sleep(self.chunk_latency)
+                chunk = text[start:start + self.chunk_size]
+                yield LlmResponse(
+                    content=types.Content(role="model", parts=[types.Part(text=chunk)]),
+                    partial=True,
+                )
+
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+            usage_metadata=_usage(llm_request, text, self.prompt_tokens, self.output_tokens),
+        )
+
+
+def fake_model_factory(
+    responses: Optional[dict] = None,
+    latency: float = 0.0,
+    stats: Optional[ModelCallStats] = None,
+    fail_first: int = 0,
+    error_rate: float = 0.0,
+    error_code: int = 429,
+    chunk_latency: float = 0.0,
+    prompt_tokens: Optional[int] = None,
+    output_tokens: Optional[int] = None,
+    prompt_latency: float = 0.0,
+) -> Callable[[str], FakeGemini]:
+    """
+    Build a model factory for CVFormatterOrchestrator backed by FakeGemini.
+
+    Args:
+        responses: Canned response per agent name (default: DEFAULT_RESPONSES)
+        latency: Seconds each model call sleeps before answering
+        stats: Shared call counter (default: a new one)
+        fail_first: Calls per agent that fail before any succeeds
+        error_rate: Fraction of later calls that fail
+        error_code: HTTP status of the injected errors (429 or 5xx)
+        chunk_latency: Seconds between streamed chunks
+        prompt_tokens: Input tokens reported per call (default: estimated)
+        output_tokens: Output tokens reported per call (default: estimated)
+        prompt_latency: Extra seconds per 1,000 prompt tokens
+
+    Returns:
+        Callable mapping an agent name to its fake model
+    """
+    responses = {**DEFAULT_RESPONSES, **(responses or {})}
+    stats = stats if stats is not None else ModelCallStats()
+
+    def factory(agent_name: str) -> FakeGemini:
+        return FakeGemini(
+            agent_name=agent_name,
+            response=responses.get(agent_name, "OK"),
+            latency=latency,
+            prompt_latency=prompt_latency,
+            tool_args=parser_tool_args,
+            stats=stats,
+            fail_first=fail_first,
+            error_rate=error_rate,
+            error_code=error_code,
+            chunk_latency=chunk_latency,
+            prompt_tokens=prompt_tokens,
+            output_tokens=output_tokens,
+        )
+
+    factory.stats = stats
+    return factory
@@ -0,0 +1,141 @@
+"""Stand-ins for external services used by the benchmarks."""
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+# The benchmarks never reach Gemini, but Config requires a key to exist
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-placeholder")
+# Keep benchmark cache entries out of the user's cache directory
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="cv_formatter_bench_"))
+
+SAMPLE_CV_TEXT = """JOHN DOE
+Quantitative Researcher
+
+PROFESSIONAL SUMMARY
+Researcher with 6 years of experience in statistical modelling and forecasting.
+
+SKILLS
+- Python, C++, R
+- Regression, neural networks, support vector machines
+
+EXPERIENCE
+Quant Researcher | Alpha Capital | 2020-Present
+- Built predictive trading models on global futures data
+- Deployed machine learning models in live trading
+
+EDUCATION
+PhD Statistics | State University | 2019
+"""
+
+
+class StandInTikaServer:
+    """Local HTTP server speaking the subset of the Tika REST API we use."""
+
+    def __init__(
+        self,
+        text: str = SAMPLE_CV_TEXT,
+        latency: float = 0.0,
+        startup_delay: float = 0.0,
+        keep_alive: Optional[float] = None,
+    ):
+        """
+        Initialize the stand-in server.
+
+        Args:
+            text: Content returned for every document
+            latency: Seconds each extraction takes
+            startup_delay: Seconds before the status endpoint reports healthy
+            keep_alive: Seconds an idle connection is kept open (None: forever)
+        """
+        self.text = text
+        self.latency = latency
+        self.startup_delay = startup_delay
+        self.keep_alive = keep_alive
+        self.requests = 0
+        self._ready_at = 0.0
+        self._httpd: ThreadingHTTPServer | None = None
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Idle connections are closed after this, as Jetty does
+            timeout = server.keep_alive
+
+            def setup(self):
+                super().setup()
+                # Avoid Nagle/delayed-ACK stalls between headers and body
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str = "text/plain") -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if time.monotonic() < server._ready_at:
+                    self._send(503, b"starting")
+                else:
+                    self._send(200, b"This is Tika Server (stand-in).")
+
+            def do_PUT(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                server.requests += 1
+                time.sleep(server.latency)
+                content = "\n\n" + server.text
+                if self.path.startswith("/rmeta"):
+                    body = json.dumps([{"X-TIKA:content": content}]).encode()
+                    self._send(200, body, "application/json")
+                else:
+                    self._send(200, content.encode())
+
+        return Handler
+
+    def start(self) -> "StandInTikaServer":
+        self._ready_at = time.monotonic() + self.startup_delay
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+
+def stub_tika(text: str = SAMPLE_CV_TEXT, latency: float = 0.0) -> StandInTikaServer:
+    """
+    Point PDF extraction at a local stand-in Tika server.
+
+    Args:
+        text: Content returned for every document
+        latency: Seconds each extraction sleeps to mimic the Tika server
+
+    Returns:
+        The running stand-in server
+    """
+    from cv_formatter.config import config
+    from cv_formatter.parsers import shutdown_tika_pool
+
+    server = StandInTikaServer(text, latency).start()
+    shutdown_tika_pool()
+    config.tika_server_endpoints = [server.endpoint]
+    return server
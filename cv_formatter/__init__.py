@@ -1,6 +1,14 @@
 """CV Formatter - Multi-agent CV reformatting system."""
 from .config import config
-from .orchestrator import CVFormatterOrchestrator
 
 __version__ = "0.1.0"
 __all__ = ["config", "CVFormatterOrchestrator"]
+
+
+def __getattr__(name):
+    # The orchestrator pulls in google.adk; import it only when it is used
+    if name == "CVFormatterOrchestrator":
+        from .orchestrator import CVFormatterOrchestrator
+
+        return CVFormatterOrchestrator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
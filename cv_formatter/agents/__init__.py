@@ -5,6 +5,9 @@ from .cv_agent import CVAgent
 from .jd_agent import JDAgent
 from .company_agent import CompanyAgent
 from .rewrite_agent import RewriteAgent
+from .memo import AnalysisMemo, get_analysis_memo
+from .company_cache import CompanyCache, get_company_cache
+from .reuse import StageReuse
 
 __all__ = [
     "PDFParserAgent",
@@ -13,4 +16,9 @@ __all__ = [
     "JDAgent",
     "CompanyAgent",
     "RewriteAgent",
+    "AnalysisMemo",
+    "get_analysis_memo",
+    "CompanyCache",
+    "get_company_cache",
+    "StageReuse",
 ]
@@ -1,31 +1,53 @@
 """Company Research Agent for gathering company information."""
+from typing import Optional
+
 from google.adk.agents import LlmAgent
+from google.adk.models.base_llm import BaseLlm
 from google.adk.models.google_llm import Gemini
 from google.adk.tools import google_search
 
 from cv_formatter.config import config
+from .company_cache import CompanyCache
 
 
 class CompanyAgent:
     """Agent for researching company information."""
 
-    def __init__(self):
-        """Initialize Company Agent."""
+    def __init__(
+        self,
+        model: Optional[BaseLlm] = None,
+        cache: Optional[CompanyCache] = None,
+    ):
+        """
+        Initialize Company Agent.
+
+        Args:
+            model: Model to use instead of the default Gemini model
+            cache: Cache of earlier research on the same company
+        """
+        self.model = model
         self.agent = self._create_agent()
+        if cache is not None:
+            cache.attach(self.agent)
 
     def _create_agent(self) -> LlmAgent:
         """Create and configure the LLM agent."""
         return LlmAgent(
             name="Company_Agent",
-            model=Gemini(model=config.model_name),
+            model=self.model or Gemini(model=config.model_name),
+            # Runs alongside CV_Agent and JD_Agent, so it reads the JD text
+            # rather than the JD analysis
             instruction="""You are a Company Research Agent.
 
-            When provided with a company name:
-            1. Use the google_search tool to find information about the company
-            2. Identify the company's vision, mission, and core values
-            3. Understand their core business and industry focus
-            4. Research their work culture and organizational goals
-            5. Summarize what makes this company unique
+            The Job Description (JD) text is provided in {JD_text}.
+            The hiring company named in the JD, if it was identified: {Company_name?}
+
+            1. Identify the hiring company from the JD (use the name above if one is given)
+            2. Use the google_search tool to find information about the company
+            3. Identify the company's vision, mission, and core values
+            4. Understand their core business and industry focus
+            5. Research their work culture and organizational goals
+            6. Summarize what makes this company unique
 
             Provide a comprehensive understanding of the company to help tailor the CV.
             """,
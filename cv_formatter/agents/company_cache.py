@@ -0,0 +1,129 @@
+"""Persistent cache of company research keyed by company name."""
+import threading
+from typing import Optional
+
+from google.adk.agents import LlmAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+
+from cv_formatter.cache import (
+    DiskCache,
+    LRUCache,
+    SingleFlight,
+    TieredCache,
+    content_key,
+)
+from cv_formatter.company import extract_company_name, normalize_company_name
+from cv_formatter.config import config
+from cv_formatter.tracing import record_cache_hit
+
+
+class CompanyCache:
+    """
+    Caches Company_context per normalized company name.
+
+    The company name is extracted deterministically from the JD analysis or
+    text. Entries older than the freshness window are researched again.
+    Concurrent runs for the same company share one research call.
+    """
+
+    def __init__(self, cache: TieredCache, wait_timeout: float = 600.0):
+        """
+        Initialize the company cache.
+
+        Args:
+            cache: Cache holding company research, with the freshness window
+                as its TTL
+            wait_timeout: Seconds to wait for concurrent research on the same
+                company before researching it independently
+        """
+        self.cache = cache
+        self.inflight = SingleFlight(wait_timeout)
+
+    @staticmethod
+    def key(company_name: str) -> str:
+        """Build the cache key for a company name."""
+        return content_key("company", normalize_company_name(company_name))
+
+    def get(self, company_name: str) -> Optional[str]:
+        return self.cache.get(self.key(company_name))
+
+    def set(self, company_name: str, research: str) -> None:
+        self.cache.set(self.key(company_name), research)
+
+    def release(self, invocation_id: str) -> None:
+        """Release companies claimed by an invocation that never stored them."""
+        self.inflight.release(invocation_id)
+
+    def attach(self, agent: LlmAgent) -> None:
+        """
+        Add cache lookup and store callbacks to the company research agent.
+
+        On a hit the agent, its google_search call and its model round trip
+        are skipped, and Company_context is seeded from the cache.
+
+        Args:
+            agent: Company research agent with an output_key
+        """
+        output_key = agent.output_key
+
+        def company_name(callback_context: CallbackContext) -> Optional[str]:
+            jd_text = callback_context.state.get("JD_text")
+            if not jd_text:
+                return None
+            # JD_Agent runs alongside this agent and may not have finished,
+            # so only the JD text is used and the name is the same every run
+            return extract_company_name(jd_text)
+
+        async def lookup(callback_context: CallbackContext) -> Optional[types.Content]:
+            name = company_name(callback_context)
+            # Always overwrite so a name from an earlier run is never reused
+            callback_context.state["Company_name"] = name or ""
+            if not name or not normalize_company_name(name):
+                return None
+            key = self.key(name)
+            cached = self.cache.get(key)
+            if cached is None:
+                cached = await self.inflight.wait(key)
+            if cached is None:
+                self.inflight.claim(key, callback_context.invocation_id)
+                return None
+            callback_context.state[output_key] = cached
+            record_cache_hit(callback_context.agent_name)
+            return types.Content(role="model", parts=[types.Part(text=cached)])
+
+        def store(callback_context: CallbackContext) -> None:
+            name = callback_context.state.get("Company_name")
+            output = callback_context.state.get(output_key)
+            if name and normalize_company_name(name) and isinstance(output, str) and output.strip():
+                self.set(name, output)
+                self.inflight.resolve(self.key(name), output, callback_context.invocation_id)
+            return None
+
+        agent.before_agent_callback = lookup
+        agent.after_agent_callback = store
+
+
+_company_cache: Optional[CompanyCache] = None
+_company_cache_lock = threading.Lock()
+
+
+def get_company_cache() -> Optional[CompanyCache]:
+    """Return the process-wide company cache, or None if disabled."""
+    global _company_cache
+    if not config.company_cache_enabled:
+        return None
+    with _company_cache_lock:
+        if _company_cache is None:
+            ttl = config.company_cache_ttl
+            _company_cache = CompanyCache(
+                TieredCache(
+                    LRUCache(max_entries=config.company_cache_max_entries, ttl=ttl),
+                    DiskCache(
+                        config.cache_dir / "company",
+                        max_bytes=config.company_cache_max_bytes,
+                        ttl=ttl,
+                    ),
+                )
+            )
+        return _company_cache
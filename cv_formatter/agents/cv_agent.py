@@ -1,22 +1,39 @@
 """CV Analysis Agent for understanding candidate profiles."""
+from typing import Optional
+
 from google.adk.agents import LlmAgent
+from google.adk.models.base_llm import BaseLlm
 from google.adk.models.google_llm import Gemini
 
 from cv_formatter.config import config
+from .memo import AnalysisMemo
 
 
 class CVAgent:
     """Agent for analyzing CV content."""
 
-    def __init__(self):
-        """Initialize CV Agent."""
+    def __init__(
+        self,
+        model: Optional[BaseLlm] = None,
+        memo: Optional[AnalysisMemo] = None,
+    ):
+        """
+        Initialize CV Agent.
+
+        Args:
+            model: Model to use instead of the default Gemini model
+            memo: Memo that reuses earlier analyses of the same CV text
+        """
+        self.model = model
         self.agent = self._create_agent()
+        if memo is not None:
+            memo.attach(self.agent, input_key="CV_text")
 
     def _create_agent(self) -> LlmAgent:
         """Create and configure the LLM agent."""
         return LlmAgent(
             name="CV_Agent",
-            model=Gemini(model=config.model_name),
+            model=self.model or Gemini(model=config.model_name),
             instruction="""You are a CV Comprehension Agent.
 
             Using the COMPLETE Curriculum Vitae (CV) text provided in {CV_text}:
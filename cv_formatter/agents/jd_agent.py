@@ -1,22 +1,39 @@
 """JD Analysis Agent for understanding job requirements."""
+from typing import Optional
+
 from google.adk.agents import LlmAgent
+from google.adk.models.base_llm import BaseLlm
 from google.adk.models.google_llm import Gemini
 
 from cv_formatter.config import config
+from .memo import AnalysisMemo
 
 
 class JDAgent:
     """Agent for analyzing Job Description content."""
 
-    def __init__(self):
-        """Initialize JD Agent."""
+    def __init__(
+        self,
+        model: Optional[BaseLlm] = None,
+        memo: Optional[AnalysisMemo] = None,
+    ):
+        """
+        Initialize JD Agent.
+
+        Args:
+            model: Model to use instead of the default Gemini model
+            memo: Memo that reuses earlier analyses of the same JD text
+        """
+        self.model = model
         self.agent = self._create_agent()
+        if memo is not None:
+            memo.attach(self.agent, input_key="JD_text")
 
     def _create_agent(self) -> LlmAgent:
         """Create and configure the LLM agent."""
         return LlmAgent(
             name="JD_Agent",
-            model=Gemini(model=config.model_name),
+            model=self.model or Gemini(model=config.model_name),
             instruction="""You are a Job Description Comprehension Agent.
 
             Using the Job Description (JD) text provided in {JD_text}:
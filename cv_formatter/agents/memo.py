@@ -0,0 +1,129 @@
+"""Memoization of analysis agent outputs across runs."""
+import threading
+from typing import Optional
+
+from google.adk.agents import LlmAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+
+from cv_formatter.cache import (
+    DiskCache,
+    LRUCache,
+    SingleFlight,
+    TieredCache,
+    content_key,
+)
+from cv_formatter.config import config
+from cv_formatter.tracing import record_cache_hit
+
+
+def normalize_analysis_input(text: str) -> str:
+    """Collapse whitespace so formatting-only differences share a memo entry."""
+    return " ".join(text.split())
+
+
+class AnalysisMemo:
+    """
+    Memoizes agents whose output depends only on one state input.
+
+    The memo key is a hash of the normalized input text, the agent's
+    instruction and its model name. On a hit the agent is skipped and its
+    output key is seeded into session state from the memo.
+
+    Concurrent runs with the same input are deduplicated: the first run
+    claims the key and the others wait for its result instead of calling
+    the model again.
+    """
+
+    def __init__(self, cache: TieredCache, wait_timeout: float = 600.0):
+        """
+        Initialize the memo.
+
+        Args:
+            cache: Cache holding memoized outputs
+            wait_timeout: Seconds to wait for a concurrent run of the same
+                analysis before running it independently
+        """
+        self.cache = cache
+        self.inflight = SingleFlight(wait_timeout)
+
+    def release(self, invocation_id: str) -> None:
+        """
+        Release keys claimed by an invocation that ended without storing them.
+
+        Args:
+            invocation_id: Invocation that claimed the keys
+        """
+        self.inflight.release(invocation_id)
+
+    @staticmethod
+    def key(text: str, instruction: str, model_name: str) -> str:
+        """Build the memo key for an agent input."""
+        return content_key(
+            "analysis", normalize_analysis_input(text), instruction, model_name
+        )
+
+    def attach(self, agent: LlmAgent, input_key: str) -> None:
+        """
+        Add memo lookup and store callbacks to an agent.
+
+        Args:
+            agent: Agent with a string instruction and an output_key
+            input_key: State key holding the text the agent analyzes
+        """
+        output_key = agent.output_key
+        instruction = agent.instruction
+        model_name = getattr(agent.model, "model", agent.model) or config.model_name
+
+        async def lookup(callback_context: CallbackContext) -> Optional[types.Content]:
+            text = callback_context.state.get(input_key)
+            if not text:
+                return None
+            key = self.key(text, instruction, model_name)
+            cached = self.cache.get(key)
+            if cached is None:
+                cached = await self.inflight.wait(key)
+            if cached is None:
+                self.inflight.claim(key, callback_context.invocation_id)
+                return None
+            # Seed the output as if the agent had produced it, then skip it
+            callback_context.state[output_key] = cached
+            record_cache_hit(callback_context.agent_name)
+            return types.Content(role="model", parts=[types.Part(text=cached)])
+
+        def store(callback_context: CallbackContext) -> None:
+            text = callback_context.state.get(input_key)
+            output = callback_context.state.get(output_key)
+            if text and isinstance(output, str) and output.strip():
+                key = self.key(text, instruction, model_name)
+                self.cache.set(key, output)
+                self.inflight.resolve(key, output, callback_context.invocation_id)
+            return None
+
+        agent.before_agent_callback = lookup
+        agent.after_agent_callback = store
+
+
+_analysis_memo: Optional[AnalysisMemo] = None
+_analysis_memo_lock = threading.Lock()
+
+
+def get_analysis_memo() -> Optional[AnalysisMemo]:
+    """Return the process-wide analysis memo, or None if disabled."""
+    global _analysis_memo
+    if not config.analysis_memo_enabled:
+        return None
+    with _analysis_memo_lock:
+        if _analysis_memo is None:
+            ttl = config.analysis_memo_ttl
+            _analysis_memo = AnalysisMemo(
+                TieredCache(
+                    LRUCache(max_entries=config.analysis_memo_max_entries, ttl=ttl),
+                    DiskCache(
+                        config.cache_dir / "analysis",
+                        max_bytes=config.analysis_memo_max_bytes,
+                        ttl=ttl,
+                    ),
+                )
+            )
+        return _analysis_memo
@@ -1,5 +1,8 @@
 """PDF Parser Agent for extracting CV text."""
+from typing import Optional
+
 from google.adk.agents import LlmAgent
+from google.adk.models.base_llm import BaseLlm
 from google.adk.models.google_llm import Gemini
 from google.adk.tools import FunctionTool, ToolContext
 
@@ -10,8 +13,14 @@ from cv_formatter.parsers import PDFParser
 class PDFParserAgent:
     """Agent for parsing PDF files (CVs)."""
 
-    def __init__(self):
-        """Initialize PDF Parser Agent."""
+    def __init__(self, model: Optional[BaseLlm] = None):
+        """
+        Initialize PDF Parser Agent.
+
+        Args:
+            model: Model to use instead of the default Gemini model
+        """
+        self.model = model
         self.parser = PDFParser()
         self.agent = self._create_agent()
 
@@ -36,7 +45,7 @@ class PDFParserAgent:
         pdf_extract = FunctionTool(self._extract_using_tika)
 
         return LlmAgent(
-            model=Gemini(model=config.model_name),
+            model=self.model or Gemini(model=config.model_name),
             name="PDF_Parser_Agent",
             instruction="""Your job is to extract text from a PDF file (CV).
             From the input, extract the CV path (e.g., /path/to/cv.pdf).
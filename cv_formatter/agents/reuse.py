@@ -0,0 +1,210 @@
+"""Reuse of the previous run's stage outputs when their inputs are unchanged."""
+import inspect
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+
+from cv_formatter.cache import content_key
+from cv_formatter.company import extract_company_name, normalize_company_name
+from cv_formatter.config import config
+from cv_formatter.tracing import record_stage_skipped
+
+
+def _agent_key(agent: BaseAgent) -> tuple[str, str]:
+    """An agent's instruction (if fixed) and model name, part of its stage key."""
+    instruction = getattr(agent, "instruction", None)
+    model = getattr(agent, "model", None)
+    model_name = getattr(model, "model", model) or config.model_name
+    return instruction if isinstance(instruction, str) else "", str(model_name)
+
+
+def _callback_list(existing) -> list[Callable]:
+    """Return an agent's callback field as a list."""
+    if existing is None:
+        return []
+    return list(existing) if isinstance(existing, list) else [existing]
+
+
+class StageReuse:
+    """
+    Keeps the last output of each stage with a hash of the stage's inputs.
+
+    On a rerun, a stage whose inputs hash the same as in the previous run is
+    skipped and its output seeded into session state, so changing only the
+    JD reruns just JD_Agent and Rewrite_Agent, and Company_Agent only if the
+    company changed. Unlike the caches, only the latest output per stage is
+    kept, whatever the cache settings, optionally in a file so reruns from
+    the command line benefit too.
+    """
+
+    def __init__(self, path: Optional[str | Path] = None):
+        """
+        Initialize the store, loading the previous run's outputs from `path`.
+
+        Args:
+            path: JSON file the outputs are saved to by save() (default:
+                memory only)
+        """
+        self.path = Path(path) if path is not None else None
+        self._outputs: dict[str, tuple[str, str]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if self.path is not None:
+            try:
+                entries = json.loads(self.path.read_text(encoding="utf-8"))
+                self._outputs = {stage: (key, output) for stage, (key, output) in entries.items()}
+            except (OSError, ValueError, TypeError, AttributeError):
+                pass
+
+    @classmethod
+    def from_config(cls) -> Optional["StageReuse"]:
+        """Build the store from the configuration, or None if disabled."""
+        if not config.incremental_rerun:
+            return None
+        return cls(config.cache_dir / "last_run.json")
+
+    def get(self, stage: str, key: str) -> Optional[str]:
+        """Return the stage's last output if it was computed from `key`."""
+        with self._lock:
+            entry = self._outputs.get(stage)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        return None
+
+    def set(self, stage: str, key: str, output: str) -> None:
+        """Record the stage's latest output and its input key."""
+        with self._lock:
+            if self._outputs.get(stage) != (key, output):
+                self._outputs[stage] = (key, output)
+                self._dirty = True
+
+    def clear(self) -> None:
+        """Forget every stage's output, so the next run computes them all."""
+        with self._lock:
+            self._outputs.clear()
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the outputs to the store's file, if any changed."""
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._outputs)
+            self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, self.path)
+        except OSError:
+            Path(tmp).unlink(missing_ok=True)
+
+    def _attach(
+        self,
+        agent: LlmAgent,
+        input_key: Callable[[CallbackContext], Optional[str]],
+        before: Optional[Callable[[CallbackContext], None]] = None,
+    ) -> None:
+        """Add reuse lookup and record callbacks around an agent's own."""
+        stage = agent.name
+        output_key = agent.output_key
+
+        lookups = _callback_list(agent.before_agent_callback)
+
+        def record(callback_context: CallbackContext) -> None:
+            key = input_key(callback_context)
+            output = callback_context.state.get(output_key)
+            if key and isinstance(output, str) and output.strip():
+                self.set(stage, key, output)
+            return None
+
+        async def reuse(callback_context: CallbackContext) -> Optional[types.Content]:
+            if before is not None:
+                before(callback_context)
+            key = input_key(callback_context)
+            output = self.get(stage, key) if key else None
+            if output is not None:
+                callback_context.state[output_key] = output
+                record_stage_skipped(stage)
+                return types.Content(role="model", parts=[types.Part(text=output)])
+
+            # Then the agent's own memo/cache lookups; a hit skips the agent's
+            # after callbacks, so record the output here
+            for lookup in lookups:
+                content = lookup(callback_context=callback_context)
+                if inspect.isawaitable(content):
+                    content = await content
+                if content:
+                    record(callback_context)
+                    return content
+            return None
+
+        # Checked ahead of the memo and caches so an unchanged stage is
+        # reported as skipped rather than as a cache hit
+        agent.before_agent_callback = reuse
+        agent.after_agent_callback = [*_callback_list(agent.after_agent_callback), record]
+
+    def attach(self, agent: LlmAgent, *input_keys: str, settings: str = "") -> None:
+        """
+        Skip an agent when the state inputs it reads are unchanged.
+
+        The key also covers the agent's instruction and model, so a changed
+        prompt or model reruns the stage.
+
+        Args:
+            agent: Agent with an output_key
+            input_keys: State keys holding the agent's inputs
+            settings: Anything else that shapes the output, such as an
+                instruction built at run time and its budget
+        """
+        fixed = _agent_key(agent)
+
+        def key(callback_context: CallbackContext) -> Optional[str]:
+            values = [callback_context.state.get(name) for name in input_keys]
+            if not all(isinstance(value, str) and value for value in values):
+                return None
+            return content_key(agent.name, *fixed, settings, *values)
+
+        self._attach(agent, key)
+
+    def attach_company(self, agent: LlmAgent) -> None:
+        """
+        Skip the company research agent when the company is unchanged.
+
+        The company name is extracted from the JD as the company cache does,
+        so an edited JD for the same employer keeps the earlier research.
+        A JD that names no company is only reused when its text is unchanged.
+
+        Args:
+            agent: Company research agent with an output_key
+        """
+
+        def set_name(callback_context: CallbackContext) -> None:
+            jd_text = callback_context.state.get("JD_text")
+            name = None
+            if jd_text:
+                name = extract_company_name(jd_text)
+            callback_context.state["Company_name"] = name or ""
+
+        fixed = _agent_key(agent)
+
+        def key(callback_context: CallbackContext) -> Optional[str]:
+            name = normalize_company_name(callback_context.state.get("Company_name") or "")
+            if name:
+                return content_key(agent.name, *fixed, name)
+            jd_text = callback_context.state.get("JD_text")
+            if isinstance(jd_text, str) and jd_text:
+                return content_key(agent.name, *fixed, "", jd_text)
+            return None
+
+        self._attach(agent, key, before=set_name)
@@ -1,24 +1,28 @@
 """CV Rewrite Agent for optimizing CV for ATS."""
-from google.adk.agents import LlmAgent
+import json
+import logging
+from typing import Optional
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.models.base_llm import BaseLlm
 from google.adk.models.google_llm import Gemini
 from google.adk.tools import google_search
 
 from cv_formatter.config import config
+from cv_formatter.prompt_budget import (
+    PromptAssembly,
+    assemble_slots,
+    count_tokens,
+    fill_template,
+)
 
+from .section_rewrite import SECTION_INSTRUCTION, SectionRewriteAgent
 
-class RewriteAgent:
-    """Agent for rewriting CVs to match job descriptions."""
+# State keys interpolated into the instruction
+PROMPT_SLOTS = ("CV_context", "JD_context", "Company_context", "CV_text")
 
-    def __init__(self):
-        """Initialize Rewrite Agent."""
-        self.agent = self._create_agent()
-
-    def _create_agent(self) -> LlmAgent:
-        """Create and configure the LLM agent."""
-        return LlmAgent(
-            name="Rewrite_Agent",
-            model=Gemini(model=config.model_name),
-            instruction="""You are an intelligent CV Rewriting Agent.
+INSTRUCTION = """You are an intelligent CV Rewriting Agent.
 
             Your goal is to create a COMPLETE, FULL-LENGTH reformatted CV that maximizes the Applicant Tracking System (ATS) score.
 
@@ -58,11 +62,111 @@ class RewriteAgent:
 
             Output the COMPLETE reformatted CV text. Include everything from the original CV, optimized for the job.
             DO NOT summarize or truncate - this should be a full, detailed CV.
-            """,
+            """
+
+
+class RewriteAgent:
+    """Agent for rewriting CVs to match job descriptions."""
+
+    def __init__(
+        self,
+        model: Optional[BaseLlm] = None,
+        prompt_budget: Optional[int] = None,
+        dedupe: Optional[bool] = None,
+        sections: Optional[bool] = None,
+    ):
+        """
+        Initialize Rewrite Agent.
+
+        Args:
+            model: Model to use instead of the default Gemini model
+            prompt_budget: Token budget of the instruction, 0 for unlimited
+                (default: config value)
+            dedupe: Drop CV_context lines repeated in CV_text (default:
+                config value)
+            sections: Rewrite long CVs section by section in parallel
+                (default: config value)
+        """
+        self.model = model
+        self.prompt_budget = (
+            config.rewrite_prompt_budget if prompt_budget is None else prompt_budget or None
+        )
+        self.dedupe = config.rewrite_prompt_dedupe if dedupe is None else dedupe
+        self.sections = config.rewrite_sections if sections is None else sections
+        self._fixed_tokens = count_tokens(INSTRUCTION)
+        self.agent = self._create_agent()
+
+    def assemble(self, state) -> PromptAssembly:
+        """
+        Fit the context slots read from session state into the prompt budget.
+
+        Args:
+            state: Session state holding the slots
+
+        Returns:
+            The fitted slots and a report of what was deduped or trimmed
+
+        Raises:
+            KeyError: If a slot is missing from state
+        """
+        slots = {}
+        for name in PROMPT_SLOTS:
+            if name not in state:
+                raise KeyError(f"Context variable not found: `{name}`.")
+            slots[name] = str(state[name])
+        return assemble_slots(slots, self.prompt_budget, self._fixed_tokens, self.dedupe)
+
+    def build_instruction(self, context: ReadonlyContext) -> str:
+        """Build the instruction from the budgeted context slots."""
+        assembly = self.assemble(context.state)
+        logging.getLogger(__name__).debug(
+            "Rewrite prompt: %d -> %d tokens", assembly.tokens_before, assembly.tokens_after
+        )
+        return fill_template(INSTRUCTION, assembly.slots)
+
+    def _create_agent(self) -> BaseAgent:
+        """Create and configure the agent."""
+        model = self.model or Gemini(model=config.model_name)
+        if not self.sections:
+            return self._create_single_shot("Rewrite_Agent", model)
+        single_shot = self._create_single_shot("Rewrite_Single_Shot_Agent", model)
+        return SectionRewriteAgent(
+            name="Rewrite_Agent",
+            model=model,
+            single_shot=single_shot,
+            sub_agents=[single_shot],
+            min_tokens=config.rewrite_section_min_tokens,
+            min_sections=config.rewrite_section_min_sections,
+            prompt_budget=self.prompt_budget,
+        )
+
+    def _create_single_shot(self, name: str, model: BaseLlm) -> LlmAgent:
+        """Create the LLM agent that rewrites the whole CV in one call."""
+        return LlmAgent(
+            name=name,
+            model=model,
+            instruction=self.build_instruction,
+            # Earlier agents' outputs reach the prompt through the budgeted
+            # slots, so the conversation history would only repeat them
+            include_contents="none",
             tools=[google_search],
             output_key="Reformatted_CV",
         )
 
-    def get_agent(self) -> LlmAgent:
-        """Get the underlying LLM agent."""
+    @property
+    def settings(self) -> str:
+        """Everything but its inputs and model that shapes the rewrite."""
+        return json.dumps([
+            INSTRUCTION,
+            self.prompt_budget,
+            self.dedupe,
+            self.sections and [
+                SECTION_INSTRUCTION,
+                config.rewrite_section_min_tokens,
+                config.rewrite_section_min_sections,
+            ],
+        ])
+
+    def get_agent(self) -> BaseAgent:
+        """Get the underlying agent."""
         return self.agent
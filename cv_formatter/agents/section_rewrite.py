@@ -0,0 +1,285 @@
+"""Section-parallel rewriting of long CVs."""
+import asyncio
+import logging
+import re
+import time
+from typing import AsyncGenerator, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.run_config import StreamingMode
+from google.adk.events import Event, EventActions
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.genai import types
+
+from cv_formatter.prompt_budget import (
+    assemble_slots,
+    count_tokens,
+    fill_template,
+    is_section_heading,
+    split_sections,
+)
+from cv_formatter.tracing import record_model_call
+
+logger = logging.getLogger(__name__)
+
+# Context shared by every section's prompt
+SECTION_SLOTS = ("JD_context", "Company_context")
+
+SECTION_INSTRUCTION = """You are an intelligent CV Rewriting Agent. You rewrite ONE part of a CV; the other parts are rewritten separately and joined with yours in the original order.
+
+            Your goal is to maximize the Applicant Tracking System (ATS) score of this part of the CV.
+
+            You have access to the following context from previous agents:
+            1. **JD Analysis** ({JD_context}): The job requirements and key qualifications
+            2. **Company Profile** ({Company_context}): The company's vision, culture, and goals
+
+            CRITICAL INSTRUCTIONS:
+            - Rewrite ONLY the CV part given in the message, keeping every section, entry and detail it contains
+            - DO NOT add sections, introductions or closing remarks that are not in the given part
+            - DO NOT omit or shorten anything - the rewritten part should be AS LONG OR LONGER than the original
+            - Incorporate relevant keywords from the JD naturally, without keyword stuffing
+            - Highlight experiences and skills that match the role
+            - Adjust the tone and emphasis to match company culture
+            - Ensure all claims are based on the original CV content
+
+            Formatting requirements:
+            - Keep each section header of the given part, written in CAPS
+            - Separate sections with blank lines
+            - Use bullet points (-) for lists
+            - Keep formatting clean and ATS-friendly (no tables, columns, or complex formatting)
+
+            Output only the rewritten CV part.
+            """
+
+_DECORATION_RE = re.compile(r"^[#*\s]+|[*\s:]+$|\*\*")
+_BULLET_RE = re.compile(r"^(\s*)[•*·–]\s+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+def _heading(line: str) -> str:
+    """A section header as written in the output: bare and in CAPS."""
+    return " ".join(_DECORATION_RE.sub("", line).upper().split())
+
+
+def _chunk_lines(lines: list[str], max_tokens: int) -> list[str]:
+    """Cut lines into consecutive chunks of at most about `max_tokens`."""
+    chunks: list[list[str]] = [[]]
+    used = 0
+    for line in lines:
+        if chunks[-1] and used + len(line) + 1 > max_tokens * 4:
+            chunks.append([])
+            used = 0
+        chunks[-1].append(line)
+        used += len(line) + 1
+    return ["\n".join(chunk) for chunk in chunks]
+
+
+def group_sections(text: str, min_tokens: int, max_tokens: Optional[int] = None) -> list[str]:
+    """
+    Split CV text into the parts rewritten in parallel.
+
+    Consecutive sections are joined until a part holds at least
+    `min_tokens`, so a one-line section such as LANGUAGES doesn't cost a
+    model call of its own; a short last part joins the one before it.
+    Sections over `max_tokens` (a long publication list) are cut between
+    lines, and only their first part starts with the heading.
+
+    Returns:
+        The parts' text, in the original order
+    """
+    groups: list[list[str]] = []
+    size = min_tokens
+    for section in split_sections(text):
+        block = "\n".join(section)
+        if max_tokens is not None and count_tokens(block) > max_tokens:
+            groups.extend([chunk] for chunk in _chunk_lines(section, max_tokens))
+            size = min_tokens
+            continue
+        if size >= min_tokens:
+            groups.append([])
+            size = 0
+        groups[-1].append(block)
+        size += count_tokens(block)
+    if len(groups) > 1 and size < min_tokens:
+        groups[-2].extend(groups.pop())
+    return ["\n\n".join(group) for group in groups]
+
+
+def stitch_sections(originals: list[str], rewritten: list[str]) -> list[str]:
+    """
+    Prefix each rewritten part with its separator from the part before.
+
+    Parts are separated by a blank line, except the continuation of a
+    section cut between lines, which follows on the next line.
+    """
+    pieces = []
+    for index, (original, text) in enumerate(zip(originals, rewritten)):
+        if index == 0:
+            pieces.append(text)
+        elif is_section_heading(original.splitlines()[0]):
+            pieces.append("\n\n" + text)
+        else:
+            pieces.append("\n" + text)
+    return pieces
+
+
+def format_section(original: str, rewritten: str) -> str:
+    """
+    Apply Rewrite_Agent's formatting rules to one rewritten part.
+
+    Lines naming one of the part's original section headers are written in
+    CAPS without Markdown decoration, bullets use "-", runs of blank lines
+    collapse to one, and the part's original header is put back if the
+    model dropped it. Other lines are never promoted to headers, however
+    much they look like one ("Research Engineer").
+    """
+    headings = {
+        _heading(section[0]) for section in split_sections(original)
+        if is_section_heading(section[0])
+    }
+    lines = []
+    for line in rewritten.strip().splitlines():
+        bare = _DECORATION_RE.sub("", line)
+        if bare and _heading(bare) in headings:
+            line = _heading(bare)
+        else:
+            line = _BULLET_RE.sub(r"\1- ", line.rstrip())
+        lines.append(line)
+    text = _BLANK_LINES_RE.sub("\n\n", "\n".join(lines))
+
+    heading = original.strip().splitlines()[0] if original.strip() else ""
+    if is_section_heading(heading):
+        heading = _heading(heading)
+        if not text.startswith(heading):
+            text = f"{heading}\n{text}"
+    return text
+
+
+class SectionRewriteAgent(BaseAgent):
+    """
+    Rewrites a long CV section by section, with the sections in parallel.
+
+    The CV is split at its section headings and each group of sections is
+    rewritten by its own model call, all sharing the JD and company
+    context. The parts are joined in the original order and written to
+    `output_key`. CVs that are short or have few sections are handed to the
+    single-shot agent instead, as are CVs a section call fails for (unless
+    earlier parts were already streamed).
+    """
+
+    model: BaseLlm
+    single_shot: LlmAgent
+    output_key: str = "Reformatted_CV"
+    # CVs under either threshold are rewritten in one call
+    min_tokens: int = 1500
+    min_sections: int = 3
+    # Sections smaller than this are grouped with the next, and larger
+    # sections are cut between lines
+    group_tokens: int = 200
+    max_group_tokens: int = 1000
+    # Token budget of each section's prompt (None: unlimited)
+    prompt_budget: Optional[int] = None
+
+    def sections(self, cv_text: str) -> Optional[list[str]]:
+        """Return the parts to rewrite in parallel, or None for a single shot."""
+        if count_tokens(cv_text) < self.min_tokens:
+            return None
+        groups = group_sections(cv_text, self.group_tokens, self.max_group_tokens)
+        return groups if len(groups) >= self.min_sections else None
+
+    def build_instruction(self, state) -> str:
+        """Build the section instruction from the budgeted shared context."""
+        slots = {}
+        for name in SECTION_SLOTS:
+            if name not in state:
+                raise KeyError(f"Context variable not found: `{name}`.")
+            slots[name] = str(state[name])
+        assembly = assemble_slots(
+            slots, self.prompt_budget, count_tokens(SECTION_INSTRUCTION), dedupe=False
+        )
+        return fill_template(SECTION_INSTRUCTION, assembly.slots)
+
+    async def _rewrite(self, instruction: str, section: str) -> str:
+        """Rewrite one part with a direct model call."""
+        request = LlmRequest(
+            model=self.model.model,
+            contents=[
+                types.Content(
+                    role="user",
+                    parts=[types.Part(text=f"Rewrite this part of the CV:\n\n{section}")],
+                )
+            ],
+            config=types.GenerateContentConfig(system_instruction=instruction),
+        )
+        start = time.time()
+        text, usage = "", None
+        async for response in self.model.generate_content_async(request):
+            if response.partial:
+                continue
+            if response.content and response.content.parts:
+                text = "".join(
+                    part.text for part in response.content.parts
+                    if part.text and not part.thought
+                )
+            usage = response.usage_metadata or usage
+        record_model_call(self.name, self.model.model, start, time.time(), usage)
+        if not text.strip():
+            raise RuntimeError(f"{self.name} returned no text for a CV section")
+        return format_section(section, text)
+
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        parts = self.sections(str(state.get("CV_text", "")))
+        if parts is None:
+            async for event in self.single_shot.run_async(ctx):
+                yield event
+            return
+
+        instruction = self.build_instruction(state)
+        tasks = [asyncio.create_task(self._rewrite(instruction, part)) for part in parts]
+        stream = ctx.run_config is not None and ctx.run_config.streaming_mode == StreamingMode.SSE
+        rewritten = []
+        try:
+            # Parts finish in any order; they are emitted in the CV's order
+            for index, task in enumerate(tasks):
+                try:
+                    rewritten.append(await task)
+                except Exception as e:
+                    # Parts already streamed can't be taken back
+                    if stream and index:
+                        raise
+                    logger.warning(
+                        "%s: a section rewrite failed (%s); rewriting the CV in one call",
+                        self.name, e,
+                    )
+                    break
+                if stream:
+                    chunk = stitch_sections(parts[:index + 1], rewritten)[-1]
+                    yield Event(
+                        author=self.name,
+                        invocation_id=ctx.invocation_id,
+                        branch=ctx.branch,
+                        content=types.Content(role="model", parts=[types.Part(text=chunk)]),
+                        partial=True,
+                    )
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if len(rewritten) < len(parts):
+            async for event in self.single_shot.run_async(ctx):
+                yield event
+            return
+
+        text = "".join(stitch_sections(parts, rewritten))
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+            actions=EventActions(state_delta={self.output_key: text}),
+        )
@@ -1,5 +1,8 @@
 """Text Parser Agent for extracting JD text."""
+from typing import Optional
+
 from google.adk.agents import LlmAgent
+from google.adk.models.base_llm import BaseLlm
 from google.adk.models.google_llm import Gemini
 from google.adk.tools import FunctionTool, ToolContext
 
@@ -10,8 +13,14 @@ from cv_formatter.parsers import TextParser
 class TxtParserAgent:
     """Agent for parsing text files (Job Descriptions)."""
 
-    def __init__(self):
-        """Initialize Text Parser Agent."""
+    def __init__(self, model: Optional[BaseLlm] = None):
+        """
+        Initialize Text Parser Agent.
+
+        Args:
+            model: Model to use instead of the default Gemini model
+        """
+        self.model = model
         self.parser = TextParser()
         self.agent = self._create_agent()
 
@@ -39,7 +48,7 @@ class TxtParserAgent:
         txt_extract = FunctionTool(self._read_text_file)
 
         return LlmAgent(
-            model=Gemini(model=config.model_name),
+            model=self.model or Gemini(model=config.model_name),
             name="TxtFile_Parser_Agent",
             instruction="""Your job is to extract text from a .txt file (Job Description).
             From the input, extract the JD path (e.g., /path/to/jd.txt).
@@ -0,0 +1,248 @@
+"""Deterministic ATS keyword score of a CV against a job description."""
+import functools
+import math
+import string
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+# Words that carry no skill or qualification: English function words, the
+# boilerplate every job description repeats and the ends of contractions
+STOPWORDS = frozenset("""
+a about above across after all also am an and any are as at be been being both
+but by can could did do does doing done each either etc for from had has have
+having he her here his how i if in into is it its just may me more most must my
+no nor not of on or other our ours out over own per plus same she should so
+some such than that the their them then there these they this those through to
+too under until up upon us very via was we well were what when where which while
+who whom why will with within without would you your yours
+ability able apply candidate candidates closely committed company deliver driven
+enjoy environment excellent experience good great help ideal including join
+looking new offer opportunity preferred related required requirements
+responsibilities role seeking skills strong team teams thrive using work
+working year years
+d ll m re s t ve
+""".split())
+
+# Words are split at punctuation, keeping "+" and "#" (C++, C#); list and
+# sentence punctuation also ends a phrase, which bigrams never span. Text is
+# split as UTF-8 bytes with bytes.translate(), several times faster than a
+# regex or str.translate() on non-ASCII text
+_BREAK = b"."
+_PHRASE_ENDS = b"\n.,;:()[]|/!?"
+_SPLIT_TABLE = bytes(
+    ord(".") if byte in _PHRASE_ENDS
+    else ord(" ") if chr(byte) in string.punctuation and byte not in b"+#"
+    else byte
+    for byte in range(256)
+)
+_UNICODE_PUNCTUATION = [
+    (char.encode("utf-8"), b" . " if char in "•·–—…" else b" ")
+    for char in "•·–—…‘’“”«»\u00a0"
+]
+
+# BM25 parameters; AVG_CV_TOKENS stands in for the corpus average length,
+# which a single pair doesn't have
+K1 = 1.2
+B = 0.75
+AVG_CV_TOKENS = 400
+
+# Keyword weight by count, 1 + log(count), for the counts a JD has
+_WEIGHTS = [0.0] + [1 + math.log(count) for count in range(1, 256)]
+
+# Term of each word seen so far; None for stopwords and phrase breaks
+_INITIAL_TERMS: dict[bytes, Optional[str]] = dict.fromkeys(
+    [*(word.encode("utf-8") for word in STOPWORDS), _BREAK, b"+", b"#"]
+)
+_MAX_TERMS = 200_000
+_terms = dict(_INITIAL_TERMS)
+
+
+def _stem(word: str) -> str:
+    """Fold simple plurals so "models" matches "model"."""
+    if len(word) <= 4 or not word.endswith("s") or word.endswith(("ss", "us", "is", "ics")):
+        return word
+    return word[:-3] + "y" if word.endswith("ies") else word[:-1]
+
+
+def _lookup(words: list[bytes]) -> list[Optional[str]]:
+    """The term of each word, None where a bigram can't continue."""
+    global _terms
+    try:
+        return [_terms[word] for word in words]
+    except KeyError:
+        if len(_terms) > _MAX_TERMS:
+            _terms = dict(_INITIAL_TERMS)
+        for word in words:
+            if word not in _terms:
+                _terms[word] = _stem(word.decode("utf-8", "replace"))
+        return [_terms[word] for word in words]
+
+
+def _words(text: str) -> list[bytes]:
+    """Lowercase words of the text, with a break token where a phrase ends."""
+    data = text.lower().encode("utf-8")
+    if not data.isascii():
+        for char, replacement in _UNICODE_PUNCTUATION:
+            data = data.replace(char, replacement)
+    return data.translate(_SPLIT_TABLE).replace(_BREAK, b" . ").split()
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase terms, dropping stopwords."""
+    return [term for term in _lookup(_words(text)) if term]
+
+
+@dataclass(frozen=True)
+class ATSScore:
+    """
+    How well a CV covers a job description's keywords.
+
+    Attributes:
+        coverage: Share of the keyword weight the CV mentions at all, 0-1
+        bm25: BM25 similarity with the keywords as the query, normalized to
+            0-1 (each term saturates as it repeats)
+        matched: Keywords the CV mentions, heaviest first
+        missing: Keywords it doesn't, heaviest first
+    """
+
+    coverage: float
+    bm25: float
+    matched: tuple[str, ...] = ()
+    missing: tuple[str, ...] = ()
+
+    @property
+    def score(self) -> float:
+        """Overall score, 0-100: the mean of coverage and BM25."""
+        return round(50 * (self.coverage + self.bm25), 1)
+
+    def as_dict(self) -> dict:
+        return {
+            "score": self.score,
+            "coverage": round(self.coverage, 4),
+            "bm25": round(self.bm25, 4),
+            "matched": list(self.matched),
+            "missing": list(self.missing),
+        }
+
+
+@dataclass(frozen=True)
+class ATSComparison:
+    """ATS scores of the original and the rewritten CV against one JD."""
+
+    before: ATSScore
+    after: ATSScore
+
+    @property
+    def delta(self) -> float:
+        """Change of the overall score made by the rewrite."""
+        return round(self.after.score - self.before.score, 1)
+
+    def as_dict(self) -> dict:
+        return {"before": self.before.as_dict(), "after": self.after.as_dict(), "delta": self.delta}
+
+
+class ATSScorer:
+    """
+    Scores CVs against the keywords of one job description.
+
+    Keywords are the JD's terms and the bigrams it repeats ("machine
+    learning", "data mining"), weighted by 1 + log(count), with bigrams
+    weighted higher as they are more specific. The keywords are extracted
+    once, so scoring many CVs against a JD only tokenizes each CV.
+    """
+
+    def __init__(self, jd_text: str, max_keywords: int = 60, bigram_weight: float = 1.5):
+        """
+        Initialize the scorer.
+
+        Args:
+            jd_text: Job description text
+            max_keywords: Keywords kept, heaviest first
+            bigram_weight: Weight of a bigram relative to a term seen as often
+        """
+        words = _words(jd_text)
+        slots = _lookup(words)
+        terms = [term for term in slots if term]
+        bigrams = [f"{a} {b}" for a, b in zip(slots, slots[1:]) if a and b]
+        table = _WEIGHTS
+        weights = {
+            term: table[count] if count < 256 else 1 + math.log(count)
+            for term, count in Counter(terms).items()
+        }
+        for bigram, count in Counter(bigrams).items():
+            if count >= 2:
+                weights[bigram] = bigram_weight * (1 + math.log(count))
+        # Heaviest first; ties keep the JD's order
+        ranked = sorted(weights.items(), key=lambda item: -item[1])[:max_keywords]
+        self.keywords: dict[str, float] = dict(ranked)
+        self.total_weight = sum(self.keywords.values())
+        self._firsts = frozenset(term.split()[0] for term in self.keywords if " " in term)
+        # Reported as the JD first writes them ("models" rather than "model")
+        first = dict(zip(reversed(slots), reversed(words)))
+        wanted = {term for term in self.keywords if " " in term}
+        first.update(reversed([
+            (f"{a} {b}", first_word + b" " + second_word)
+            for a, b, first_word, second_word in zip(slots, slots[1:], words, words[1:])
+            if a and b and f"{a} {b}" in wanted
+        ]))
+        self._names = {term: first[term].decode("utf-8", "replace") for term in self.keywords}
+
+    def score(self, cv_text: str) -> ATSScore:
+        """Score one CV."""
+        if not self.keywords:
+            return ATSScore(0.0, 0.0)
+        slots = _lookup(_words(cv_text))
+        terms = [term for term in slots if term]
+        counts = Counter(terms)
+        if firsts := self._firsts:
+            # Only bigrams that can be keywords are built
+            counts.update([f"{a} {b}" for a, b in zip(slots, slots[1:]) if a in firsts and b])
+        length_norm = K1 * (1 - B + B * len(terms) / AVG_CV_TOKENS)
+        covered = similarity = 0.0
+        matched, missing = [], []
+        for term, weight in self.keywords.items():
+            frequency = counts.get(term, 0)
+            if frequency:
+                covered += weight
+                similarity += weight * frequency / (frequency + length_norm)
+                matched.append(self._names[term])
+            else:
+                missing.append(self._names[term])
+        return ATSScore(
+            covered / self.total_weight,
+            similarity / self.total_weight,
+            tuple(matched),
+            tuple(missing),
+        )
+
+    def score_many(self, cv_texts: Iterable[str]) -> list[ATSScore]:
+        """Score many CVs against the job description, in order."""
+        return [self.score(cv_text) for cv_text in cv_texts]
+
+    def compare(self, original: str, rewritten: str) -> ATSComparison:
+        """Score a CV before and after its rewrite."""
+        return ATSComparison(self.score(original), self.score(rewritten))
+
+
+@functools.lru_cache(maxsize=256)
+def get_scorer(jd_text: str) -> ATSScorer:
+    """Return the shared scorer of a job description."""
+    return ATSScorer(jd_text)
+
+
+def score_cv(cv_text: str, jd_text: str) -> ATSScore:
+    """Score a CV against a job description."""
+    return get_scorer(jd_text).score(cv_text)
+
+
+def compare_cvs(original: str, rewritten: str, jd_text: Optional[str]) -> Optional[ATSComparison]:
+    """
+    Score a CV before and after its rewrite against a job description.
+
+    Returns:
+        The scores, or None without a job description
+    """
+    if not jd_text:
+        return None
+    return get_scorer(jd_text).compare(original, rewritten)
@@ -0,0 +1,402 @@
+"""Batch processing of many CV/JD pairs with one shared orchestrator."""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from cv_formatter.ats_score import ATSComparison
+from cv_formatter.cache import LRUCache, TieredCache, content_key
+from cv_formatter.config import config
+from cv_formatter.formatter import write_output_async
+
+if TYPE_CHECKING:
+    from cv_formatter.orchestrator import CVFormatterOrchestrator
+
+FORMAT_EXTENSIONS = {"plain": ".txt", "markdown": ".md", "html": ".html", "json": ".json"}
+
+
+@dataclass
+class BatchJob:
+    """A single CV/JD pair to rewrite."""
+
+    cv_path: Path
+    jd_path: Path
+    output_path: Optional[Path] = None
+
+
+@dataclass
+class PairResult:
+    """Outcome and timing of one pair."""
+
+    cv_path: Path
+    jd_path: Path
+    output_path: Optional[Path]
+    seconds: float
+    error: Optional[str] = None
+    ats: Optional[ATSComparison] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def as_dict(self) -> dict:
+        return {
+            "cv_path": str(self.cv_path),
+            "jd_path": str(self.jd_path),
+            "output_path": str(self.output_path) if self.output_path else None,
+            "seconds": round(self.seconds, 3),
+            "error": self.error,
+            "ats": self.ats.as_dict() if self.ats else None,
+        }
+
+
+@dataclass
+class BatchReport:
+    """Per-pair results and overall throughput of a batch."""
+
+    results: list[PairResult]
+    wall_seconds: float
+
+    @property
+    def succeeded(self) -> int:
+        return sum(result.ok for result in self.results)
+
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.succeeded
+
+    @property
+    def throughput(self) -> float:
+        """Completed pairs per minute."""
+        return self.succeeded / self.wall_seconds * 60 if self.wall_seconds else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "pairs": len(self.results),
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "pairs_per_minute": round(self.throughput, 2),
+            "results": [result.as_dict() for result in self.results],
+        }
+
+
+def load_jobs(source: str | Path) -> list[BatchJob]:
+    """
+    Load CV/JD pairs from a manifest file or a directory.
+
+    A directory pairs every CV PDF in it with every JD text file in it, which
+    covers both one CV against many JDs and many CVs against one JD. A
+    manifest is a JSON list (or JSON Lines file) of objects with "cv", "jd"
+    and optionally "output" keys; relative paths are resolved against the
+    manifest's directory.
+
+    Args:
+        source: Manifest file or directory
+
+    Returns:
+        Jobs to run
+
+    Raises:
+        FileNotFoundError: If the source doesn't exist
+        ValueError: If the manifest is malformed
+    """
+    source = Path(source)
+    if not source.exists():
+        raise FileNotFoundError(f"Batch source not found: {source}")
+
+    if source.is_dir():
+        cvs = sorted(source.glob("*.pdf"))
+        jds = sorted(source.glob("*.txt"))
+        return [BatchJob(cv, jd) for cv in cvs for jd in jds]
+
+    text = source.read_text(encoding="utf-8")
+    if source.suffix == ".jsonl":
+        entries = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        entries = json.loads(text)
+    if not isinstance(entries, list):
+        raise ValueError("Batch manifest must be a list of {cv, jd} objects")
+
+    base = source.parent
+    jobs = []
+    for entry in entries:
+        try:
+            output = entry.get("output")
+            jobs.append(
+                BatchJob(
+                    cv_path=base / entry["cv"],
+                    jd_path=base / entry["jd"],
+                    output_path=base / output if output else None,
+                )
+            )
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"Invalid batch manifest entry: {entry!r}") from e
+    return jobs
+
+
+class BatchRunner:
+    """Runs CV/JD pairs concurrently on one warm orchestrator."""
+
+    def __init__(
+        self,
+        orchestrator: "CVFormatterOrchestrator",
+        concurrency: Optional[int] = None,
+        format_type: str = "plain",
+        output_dir: str | Path = "batch_output",
+    ):
+        """
+        Initialize the batch runner.
+
+        Args:
+            orchestrator: Orchestrator shared by all pairs
+            concurrency: Maximum pairs in flight (default: config value)
+            format_type: Output format (plain, markdown, html, or json)
+            output_dir: Directory for outputs without an explicit path
+        """
+        self.orchestrator = orchestrator
+        self.concurrency = concurrency or config.batch_concurrency
+        self.format_type = format_type
+        self.output_dir = Path(output_dir)
+
+        # Parse each distinct file once even when the shared cache is off
+        for reader in (orchestrator.pdf_reader, orchestrator.text_reader):
+            if reader.cache is None:
+                reader.cache = TieredCache(LRUCache())
+
+    def output_path(self, job: BatchJob, unique: bool = False) -> Path:
+        """
+        Return where a job's output is written.
+
+        Args:
+            job: CV/JD pair
+            unique: Add a short hash of the CV and JD paths to a default
+                name, for pairs whose files share their names
+        """
+        if job.output_path:
+            return job.output_path
+        extension = FORMAT_EXTENSIONS.get(self.format_type, ".txt")
+        name = f"{job.cv_path.stem}__{job.jd_path.stem}"
+        if unique:
+            name += "__" + content_key(str(job.cv_path), str(job.jd_path))[:8]
+        return self.output_dir / f"{name}{extension}"
+
+    def output_paths(self, jobs: list[BatchJob]) -> list[Path]:
+        """
+        Return where each job's output is written, one distinct path per job.
+
+        Raises:
+            ValueError: If several jobs would write the same file
+        """
+        names = Counter(self.output_path(job) for job in jobs)
+        paths = [
+            self.output_path(job, unique=names[self.output_path(job)] > 1)
+            for job in jobs
+        ]
+        for path, count in Counter(paths).items():
+            if count > 1:
+                raise ValueError(f"Several pairs write to {path}")
+        return paths
+
+    async def _prefetch(self, jobs: list[BatchJob], semaphore: asyncio.Semaphore) -> None:
+        """Extract every distinct CV and JD once to warm the text cache."""
+
+        async def read(reader, path: Path) -> None:
+            async with semaphore:
+                try:
+                    await reader(path)
+                except (FileNotFoundError, RuntimeError):
+                    pass  # Reported by the pair that uses the file
+
+        await asyncio.gather(
+            *(read(self.orchestrator.pdf_reader.extract_text_async, cv)
+              for cv in {job.cv_path for job in jobs}),
+            *(read(self.orchestrator.text_reader.read_file_async, jd)
+              for jd in {job.jd_path for job in jobs}),
+        )
+
+    async def _run_job(
+        self, job: BatchJob, output_path: Path, semaphore: asyncio.Semaphore, timestamp: str
+    ) -> PairResult:
+        async with semaphore:
+            start = time.perf_counter()
+            ats = None
+            try:
+                result = await self.orchestrator.format_cv_detailed(job.cv_path, job.jd_path)
+                ats = result.ats
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                await write_output_async(
+                    output_path, result.cv, self.format_type, timestamp
+                )
+                error = None
+            except Exception as e:
+                output_path = None
+                error = f"{type(e).__name__}: {e}"
+            return PairResult(
+                job.cv_path, job.jd_path, output_path, time.perf_counter() - start, error, ats
+            )
+
+    async def run(self, jobs: list[BatchJob]) -> BatchReport:
+        """
+        Run all jobs and collect the report.
+
+        Args:
+            jobs: CV/JD pairs to rewrite
+
+        Returns:
+            Per-pair results and overall throughput
+
+        Raises:
+            ValueError: If several jobs would write the same output file
+        """
+        paths = self.output_paths(jobs)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        start = time.perf_counter()
+        await self._prefetch(jobs, semaphore)
+        # Every output of the batch shows the same generation time
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        results = await asyncio.gather(
+            *(self._run_job(job, path, semaphore, timestamp) for job, path in zip(jobs, paths))
+        )
+        return BatchReport(list(results), time.perf_counter() - start)
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="CV Formatter - Batch mode",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Rewrite every CV in a directory against every JD in it
+  python -m cv_formatter.batch pairs/ -o outputs/
+
+  # Run the pairs listed in a manifest, 8 at a time, as HTML
+  python -m cv_formatter.batch manifest.json -j 8 -f html
+
+Manifest format:
+  [{"cv": "cv.pdf", "jd": "jd1.txt"}, {"cv": "cv.pdf", "jd": "jd2.txt", "output": "out.txt"}]
+        """
+    )
+
+    parser.add_argument(
+        "source",
+        type=Path,
+        help="Manifest file (.json/.jsonl) or directory of CV PDFs and JD text files"
+    )
+
+    parser.add_argument(
+        "-o", "--output-dir",
+        type=Path,
+        default=Path("batch_output"),
+        help="Directory for outputs (default: batch_output)"
+    )
+
+    parser.add_argument(
+        "-f", "--format",
+        type=str,
+        choices=["plain", "markdown", "html", "json"],
+        default="plain",
+        help="Output format (default: plain)"
+    )
+
+    parser.add_argument(
+        "-j", "--concurrency",
+        type=int,
+        default=None,
+        help="Pairs processed concurrently (default: BATCH_CONCURRENCY)"
+    )
+
+    parser.add_argument(
+        "--cpu-workers",
+        type=int,
+        default=None,
+        help="Processes for PDF extraction, normalization and formatting "
+             "(default: CPU_WORKERS; 0 uses threads)"
+    )
+
+    parser.add_argument(
+        "--report",
+        type=Path,
+        default=None,
+        help="Path of the JSON timing report (default: <output-dir>/batch_report.json)"
+    )
+
+    parser.add_argument(
+        "-q", "--quiet",
+        action="store_true",
+        help="Suppress per-pair progress output"
+    )
+
+    return parser.parse_args()
+
+
+async def main():
+    """Batch entry point."""
+    args = parse_arguments()
+
+    if not config.is_configured:
+        print("ERROR: GOOGLE_API_KEY not found in .env file")
+        print("Please create a .env file with: GOOGLE_API_KEY=your_key_here")
+        sys.exit(1)
+
+    try:
+        jobs = load_jobs(args.source)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    if not jobs:
+        print(f"ERROR: No CV/JD pairs found in {args.source}")
+        sys.exit(1)
+
+    if args.cpu_workers is not None:
+        config.cpu_workers = args.cpu_workers
+
+    # Imported here so --help and argument errors don't load the agent stack
+    from cv_formatter.agents import AnalysisMemo, get_analysis_memo
+    from cv_formatter.orchestrator import CVFormatterOrchestrator
+
+    # Deduplicate analyses within the batch even when the shared memo is off
+    memo = get_analysis_memo() or AnalysisMemo(TieredCache(LRUCache()))
+    orchestrator = CVFormatterOrchestrator(memo=memo)
+    runner = BatchRunner(orchestrator, args.concurrency, args.format, args.output_dir)
+
+    if not args.quiet:
+        print(f"Processing {len(jobs)} pair(s), {runner.concurrency} at a time...\n")
+
+    try:
+        report = await runner.run(jobs)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    finally:
+        orchestrator.close()
+
+    if not args.quiet:
+        for result in report.results:
+            status = "✓" if result.ok else "✗"
+            detail = result.output_path if result.ok else result.error
+            if result.ats:
+                detail = f"{detail} [ATS {result.ats.before.score:.1f} -> {result.ats.after.score:.1f}]"
+            print(f"{status} {result.cv_path.name} x {result.jd_path.name} "
+                  f"({result.seconds:.1f}s): {detail}")
+
+    report_path = args.report or args.output_dir / "batch_report.json"
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report.as_dict(), indent=2), encoding="utf-8")
+
+    print(f"\n{report.succeeded}/{len(jobs)} pairs succeeded in {report.wall_seconds:.1f}s "
+          f"({report.throughput:.1f} pairs/min)")
+    print(f"Report: {report_path.absolute()}")
+
+    if report.failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,341 @@
+"""Two-tier (memory + disk) caches for extracted text and agent outputs."""
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from cv_formatter.config import config
+
+
+def content_key(*parts: str | bytes) -> str:
+    """
+    Build a cache key by hashing the given parts.
+
+    Args:
+        parts: Strings or bytes that identify the cached value
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        # Length-prefix each part so ("ab", "c") and ("a", "bc") differ
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a cache."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+
+    @property
+    def hits(self) -> int:
+        """Total hits across both tiers."""
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+        }
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU cache with an optional TTL."""
+
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries kept
+            ttl: Seconds an entry stays valid (None: no expiry)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created, value = entry
+            if self.ttl is not None and time.time() - created > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, created: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entries."""
+        with self._lock:
+            self._entries[key] = (created or time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCache:
+    """On-disk cache with size-based LRU eviction and an optional TTL."""
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: Optional[float] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory holding the cache files
+            max_bytes: Total size budget for cached files
+            ttl: Seconds an entry stays valid (None: no expiry)
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[tuple[float, str]]:
+        """Return (creation time, value), or None if missing or expired."""
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        try:
+            created, value = float(entry["created"]), entry["value"]
+            if not isinstance(value, str):
+                raise TypeError(f"cached value is {type(value).__name__}")
+        except (KeyError, TypeError, ValueError):
+            # Valid JSON that isn't an entry: drop it like an unreadable file
+            self.delete(key)
+            return None
+
+        if self.ttl is not None and time.time() - created > self.ttl:
+            self.delete(key)
+            return None
+
+        # The modification time doubles as the last-access time for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return created, value
+
+    def set(self, key: str, value: str, created: Optional[float] = None) -> None:
+        """Store a value atomically, then evict old files over the budget."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        data = json.dumps({"created": created or time.time(), "value": value})
+
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            Path(tmp).unlink(missing_ok=True)
+            return
+
+        self._evict()
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        """Remove least recently used files until the size budget is met."""
+        with self._lock:
+            files = []
+            total = 0
+            for path in self.directory.glob("*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+            if total <= self.max_bytes:
+                return
+
+            for _, size, path in sorted(files):
+                path.unlink(missing_ok=True)
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+
+class TieredCache:
+    """Memory LRU tier in front of an optional disk tier."""
+
+    def __init__(self, memory: LRUCache, disk: Optional[DiskCache] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            memory: In-memory tier
+            disk: On-disk tier (None: memory only)
+        """
+        self.memory = memory
+        self.disk = disk
+        self.stats = CacheStats()
+        self._stats_lock = threading.Lock()
+
+    def _count(self, counter: str) -> None:
+        with self._stats_lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value from the fastest tier that has it."""
+        value = self.memory.get(key)
+        if value is not None:
+            self._count("memory_hits")
+            return value
+
+        if self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                created, value = entry
+                self.memory.set(key, value, created)
+                self._count("disk_hits")
+                return value
+
+        self._count("misses")
+        return None
+
+    def set(self, key: str, value: str) -> None:
+        """Store a value in both tiers."""
+        created = time.time()
+        self.memory.set(key, value, created)
+        if self.disk is not None:
+            self.disk.set(key, value, created)
+
+    def delete(self, key: str) -> None:
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent computations of the same cache key.
+
+    The first invocation to miss a key claims it; later invocations wait for
+    its result instead of repeating the work.
+    """
+
+    def __init__(self, wait_timeout: float = 600.0):
+        """
+        Initialize the tracker.
+
+        Args:
+            wait_timeout: Seconds a waiter blocks before computing the value
+                itself
+        """
+        self.wait_timeout = wait_timeout
+        self._pending: dict[str, asyncio.Future] = {}
+        self._claims: dict[str, set[str]] = defaultdict(set)
+
+    async def wait(self, key: str) -> Optional[str]:
+        """Wait for a concurrent computation of `key`, if there is one."""
+        pending = self._pending.get(key)
+        if pending is None or pending.get_loop() is not asyncio.get_running_loop():
+            return None
+        try:
+            return await asyncio.wait_for(asyncio.shield(pending), self.wait_timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def claim(self, key: str, owner: str) -> None:
+        """Mark `key` as being computed by `owner`."""
+        pending = self._pending.get(key)
+        if pending is None or pending.done():
+            self._pending[key] = asyncio.get_running_loop().create_future()
+            self._claims[owner].add(key)
+
+    def resolve(self, key: str, value: Optional[str], owner: Optional[str] = None) -> None:
+        """Publish the value of `key` to everyone waiting for it."""
+        if owner is not None and owner in self._claims:
+            self._claims[owner].discard(key)
+        pending = self._pending.pop(key, None)
+        if pending is not None and not pending.done():
+            pending.set_result(value)
+
+    def release(self, owner: str) -> None:
+        """
+        Release keys claimed by `owner` that it never resolved.
+
+        Waiters are woken up and compute the value themselves.
+        """
+        for key in self._claims.pop(owner, ()):
+            self.resolve(key, None)
+
+
+_text_cache: Optional[TieredCache] = None
+_text_cache_lock = threading.Lock()
+
+
+def get_text_cache() -> Optional[TieredCache]:
+    """Return the process-wide extracted-text cache, or None if disabled."""
+    global _text_cache
+    if not config.text_cache_enabled:
+        return None
+    with _text_cache_lock:
+        if _text_cache is None:
+            _text_cache = TieredCache(
+                LRUCache(max_entries=config.text_cache_max_entries),
+                DiskCache(
+                    config.cache_dir / "text",
+                    max_bytes=config.text_cache_max_bytes,
+                ),
+            )
+        return _text_cache
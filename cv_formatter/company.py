@@ -0,0 +1,104 @@
+"""Deterministic company name extraction from job descriptions."""
+import re
+from typing import Optional
+
+# Trailing words that only describe the legal form of a company
+_LEGAL_SUFFIXES = {
+    "ag", "co", "company", "corp", "corporation", "gmbh", "group", "holding",
+    "holdings", "inc", "incorporated", "limited", "llc", "llp", "lp", "ltd",
+    "plc", "private", "pte", "pty", "pvt", "sa", "sas", "bv", "nv",
+}
+
+# Words that mark a short standalone line as a company name
+_ORG_WORDS = _LEGAL_SUFFIXES | {
+    "bank", "capital", "consulting", "labs", "partners", "solutions",
+    "systems", "technologies", "technology", "ventures",
+}
+
+_LABEL_RE = re.compile(
+    r"^\W*(?:company(?:\s+name)?|employer|organi[sz]ation|hiring\s+company)"
+    r"\W*[:\-–]\s*\W*(?P<name>[^\n|*]{2,80}?)\W*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+_ABOUT_RE = re.compile(
+    r"^\s*[Aa]bout\s+(?P<name>[A-Z][\w&.'\- ]{1,60}?)\s*:?\s*$", re.MULTILINE
+)
+_NOT_NAMES = {"the job", "the role", "the team", "the position", "us", "you", "this role"}
+
+
+def normalize_company_name(name: str) -> str:
+    """
+    Normalize a company name for use as a cache key.
+
+    Lowercases, drops punctuation and strips legal-form suffixes, so
+    "Minix Meril Group, Inc." and "minix meril" normalize the same way.
+
+    Args:
+        name: Company name as written
+
+    Returns:
+        Normalized name (empty if nothing remains)
+    """
+    words = re.sub(r"[^\w&\s]", " ", name.lower()).split()
+    while len(words) > 1 and words[-1] in _LEGAL_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def _clean(name: str) -> str:
+    return " ".join(name.strip(" \t*_#:-–|,.").split())
+
+
+def _from_labels(text: str) -> Optional[str]:
+    match = _LABEL_RE.search(text)
+    return _clean(match.group("name")) if match else None
+
+
+def _from_org_lines(text: str) -> Optional[str]:
+    """Find a short standalone line ending in an organization word."""
+    for line in text.splitlines():
+        line = _clean(line)
+        words = line.split()
+        if (
+            2 <= len(words) <= 6
+            and all(word[0].isupper() or word == "&" for word in words)
+            and words[-1].lower().strip(".") in _ORG_WORDS
+        ):
+            return line
+    return None
+
+
+def _from_about(text: str) -> Optional[str]:
+    for match in _ABOUT_RE.finditer(text):
+        name = _clean(match.group("name"))
+        if name.lower() not in _NOT_NAMES:
+            return name
+    return None
+
+
+def extract_company_name(
+    jd_text: str, jd_context: Optional[str] = None
+) -> Optional[str]:
+    """
+    Extract the hiring company's name without a model call.
+
+    Tries, in order: explicit "Company:" labels in the JD analysis and the
+    JD text, a standalone line ending in an organization word ("... Group",
+    "... Inc") and an "About <Name>" heading. Nothing is guessed beyond
+    these, since the name keys the company research and is given to the
+    research agent as the employer.
+
+    Args:
+        jd_text: Job description text
+        jd_context: JD_Agent analysis, if available
+
+    Returns:
+        Company name as written, or None if none was found
+    """
+    for source in filter(None, (jd_context, jd_text)):
+        if name := _from_labels(source):
+            return name
+    for strategy in (_from_org_lines, _from_about):
+        if name := strategy(jd_text):
+            return name
+    return None
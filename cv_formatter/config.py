@@ -1,7 +1,15 @@
 """Configuration module for CV Formatter."""
 import os
+import threading
 from pathlib import Path
-from dotenv import load_dotenv
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    """Read a boolean flag from the environment."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
 
 
 class Config:
@@ -9,20 +17,17 @@ class Config:
 
     def __init__(self):
         """Initialize configuration by loading environment variables."""
+        from dotenv import load_dotenv
+
         # Load .env file from project root
         env_path = Path(__file__).parent.parent / ".env"
         load_dotenv(dotenv_path=env_path)
 
-        # Get API key
+        # Get API key; checked by require_api_key() once a Gemini model is used
         self.google_api_key = os.getenv("GOOGLE_API_KEY")
-        if not self.google_api_key:
-            raise ValueError(
-                "GOOGLE_API_KEY not found in environment variables. "
-                "Please create a .env file with GOOGLE_API_KEY=your_key"
-            )
-
-        # Set environment variable for Google SDK
-        os.environ["GOOGLE_API_KEY"] = self.google_api_key
+        if self.google_api_key:
+            # Set environment variable for Google SDK
+            os.environ["GOOGLE_API_KEY"] = self.google_api_key
 
         # App configuration
         self.app_name = os.getenv("APP_NAME", "agents")
@@ -31,11 +36,196 @@ class Config:
         # Model configuration
         self.model_name = os.getenv("MODEL_NAME", "gemini-2.5-flash")
 
+        # Model call scheduling shared by all agents: in-flight caps, rate
+        # limits (0 = unlimited) and backoff for 429/5xx errors
+        self.model_max_concurrency = int(os.getenv("MODEL_MAX_CONCURRENCY", "8"))
+        self.model_max_concurrency_per_model = int(
+            os.getenv("MODEL_MAX_CONCURRENCY_PER_MODEL", "0")
+        ) or None
+        self.model_requests_per_minute = float(os.getenv("MODEL_RPM", "0"))
+        self.model_tokens_per_minute = float(os.getenv("MODEL_TPM", "0"))
+        self.model_max_retries = int(os.getenv("MODEL_MAX_RETRIES", "5"))
+        self.model_backoff_base = float(os.getenv("MODEL_BACKOFF_BASE", "1.0"))
+        self.model_backoff_max = float(os.getenv("MODEL_BACKOFF_MAX", "60"))
+
+        # Ingestion configuration: read CV/JD files directly (default) or via
+        # the LLM-driven PDF_Parser_Agent / TxtFile_Parser_Agent
+        self.use_llm_parsers = _env_flag("USE_LLM_PARSERS", False)
+
+        # Rewrite_Agent prompt: token budget (0 = unlimited) the context
+        # slots are trimmed to, lowest priority first, and whether CV_context
+        # lines that repeat CV_text are dropped
+        self.rewrite_prompt_budget = int(os.getenv("REWRITE_PROMPT_BUDGET", "12000")) or None
+        self.rewrite_prompt_dedupe = _env_flag("REWRITE_PROMPT_DEDUPE", True)
+
+        # Section-parallel rewrite: CVs of at least REWRITE_SECTION_MIN_TOKENS
+        # with at least REWRITE_SECTION_MIN_SECTIONS section groups are
+        # rewritten one group per model call, concurrently
+        self.rewrite_sections = _env_flag("REWRITE_SECTIONS", False)
+        self.rewrite_section_min_tokens = int(os.getenv("REWRITE_SECTION_MIN_TOKENS", "1500"))
+        self.rewrite_section_min_sections = int(os.getenv("REWRITE_SECTION_MIN_SECTIONS", "3"))
+
+        # ATS keyword score of the CV before and after the rewrite, computed
+        # locally (no model call) and returned with each detailed result
+        self.ats_score = _env_flag("ATS_SCORE", True)
+
+        # Worker processes for CPU-bound stages (PDF extraction, text
+        # normalization, HTML/Markdown formatting); 0 runs them in threads
+        self.cpu_workers = int(os.getenv("CPU_WORKERS", "0"))
+
+        # Batch mode: CV/JD pairs processed concurrently
+        self.batch_concurrency = int(os.getenv("BATCH_CONCURRENCY", "4"))
+
+        # HTTP service mode: address, jobs run concurrently, jobs waiting
+        # before submissions are refused, upload size limit and how long
+        # (and how many) finished jobs are kept for clients to fetch
+        self.server_host = os.getenv("SERVER_HOST", "127.0.0.1")
+        self.server_port = int(os.getenv("SERVER_PORT", "8080"))
+        self.server_workers = int(os.getenv("SERVER_WORKERS", "4"))
+        self.server_max_queue = int(os.getenv("SERVER_MAX_QUEUE", "100"))
+        self.server_max_upload_bytes = int(
+            os.getenv("SERVER_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024))
+        )
+        self.server_job_ttl = float(os.getenv("SERVER_JOB_TTL", "3600"))
+        self.server_max_jobs = int(os.getenv("SERVER_MAX_JOBS", "1000"))
+
+        # Cache configuration: base directory for on-disk caches and the
+        # content-addressed cache of extracted CV/JD text
+        self.cache_dir = Path(
+            os.getenv("CACHE_DIR", Path.home() / ".cache" / "cv_formatter")
+        ).expanduser()
+        self.text_cache_enabled = _env_flag("TEXT_CACHE", True)
+        self.text_cache_max_entries = int(os.getenv("TEXT_CACHE_MAX_ENTRIES", "256"))
+        self.text_cache_max_bytes = int(
+            os.getenv("TEXT_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+        )
+
+        # Memo of CV_Agent/JD_Agent analyses keyed by input text, instruction
+        # and model; entries expire after ANALYSIS_MEMO_TTL seconds
+        self.analysis_memo_enabled = _env_flag("ANALYSIS_MEMO", True)
+        self.analysis_memo_ttl = float(os.getenv("ANALYSIS_MEMO_TTL", str(7 * 24 * 3600)))
+        self.analysis_memo_max_entries = int(os.getenv("ANALYSIS_MEMO_MAX_ENTRIES", "128"))
+        self.analysis_memo_max_bytes = int(
+            os.getenv("ANALYSIS_MEMO_MAX_BYTES", str(32 * 1024 * 1024))
+        )
+
+        # Cache of Company_Agent research keyed by normalized company name;
+        # entries older than COMPANY_CACHE_TTL seconds are researched again
+        self.company_cache_enabled = _env_flag("COMPANY_CACHE", True)
+        self.company_cache_ttl = float(os.getenv("COMPANY_CACHE_TTL", str(30 * 24 * 3600)))
+        self.company_cache_max_entries = int(os.getenv("COMPANY_CACHE_MAX_ENTRIES", "256"))
+        self.company_cache_max_bytes = int(
+            os.getenv("COMPANY_CACHE_MAX_BYTES", str(16 * 1024 * 1024))
+        )
+
+        # Incremental reruns: keep the last run's stage outputs with hashes of
+        # their inputs, and skip stages whose inputs are unchanged
+        self.incremental_rerun = _env_flag("INCREMENTAL_RERUN", True)
+
+        # Session storage: "memory" or a "sqlite" file. Sessions idle for
+        # SESSION_TTL seconds are dropped and the least recently used are
+        # evicted beyond SESSION_MAX_COUNT or SESSION_MAX_BYTES (0 = unlimited)
+        self.session_backend = os.getenv("SESSION_BACKEND", "memory").strip().lower()
+        self.session_db_path = Path(
+            os.getenv("SESSION_DB", self.cache_dir / "sessions.db")
+        ).expanduser()
+        self.session_max_count = int(os.getenv("SESSION_MAX_COUNT", "1000")) or None
+        self.session_ttl = float(os.getenv("SESSION_TTL", str(24 * 3600))) or None
+        self.session_max_bytes = int(
+            os.getenv("SESSION_MAX_BYTES", str(128 * 1024 * 1024))
+        ) or None
+
+        # Long-term memory of past sessions, bounded the same way
+        self.memory_max_sessions = int(os.getenv("MEMORY_MAX_SESSIONS", "1000")) or None
+        self.memory_ttl = float(os.getenv("MEMORY_TTL", str(7 * 24 * 3600))) or None
+        self.memory_max_bytes = int(
+            os.getenv("MEMORY_MAX_BYTES", str(64 * 1024 * 1024))
+        ) or None
+
+        # Inverted index of extracted CVs searched for the best matches of a JD
+        self.cv_index_path = Path(
+            os.getenv("CV_INDEX_PATH", self.cache_dir / "cv_index.db")
+        ).expanduser()
+
+        # PDF extraction engine: "tika" or the in-process "pdfminer" engine,
+        # which falls back to Tika for documents it cannot handle
+        self.pdf_engine = os.getenv("PDF_ENGINE", "tika")
+
+        # Tika server pool: number of managed servers and the first port, or
+        # a comma-separated list of externally managed server endpoints
+        self.tika_pool_size = int(os.getenv("TIKA_POOL_SIZE", "1"))
+        self.tika_base_port = int(os.getenv("TIKA_BASE_PORT", "9990"))
+        self.tika_server_endpoints = [
+            endpoint.strip()
+            for endpoint in os.getenv("TIKA_SERVER_ENDPOINTS", "").split(",")
+            if endpoint.strip()
+        ]
+
     @property
     def is_configured(self) -> bool:
         """Check if configuration is valid."""
         return bool(self.google_api_key)
 
+    def require_api_key(self) -> None:
+        """
+        Ensure the Google API key is set.
+
+        Raises:
+            ValueError: If GOOGLE_API_KEY is not configured
+        """
+        if not self.is_configured:
+            raise ValueError(
+                "GOOGLE_API_KEY not found in environment variables. "
+                "Please create a .env file with GOOGLE_API_KEY=your_key"
+            )
+
+
+class _LazyConfig:
+    """
+    Proxy for the global Config, loaded on first attribute access.
+
+    Importing the package neither reads .env nor touches the environment;
+    that happens the first time a setting is read or overridden.
+    """
+
+    def __init__(self):
+        object.__setattr__(self, "_config", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _load(self) -> Config:
+        config = self._config
+        if config is None:
+            with self._lock:
+                config = self._config
+                if config is None:
+                    config = Config()
+                    object.__setattr__(self, "_config", config)
+        return config
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._config is not None
+
+    def reload(self) -> Config:
+        """Re-read the environment, dropping any overrides."""
+        with self._lock:
+            object.__setattr__(self, "_config", Config())
+        return self._config
+
+    def __getattr__(self, name: str):
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name: str, value) -> None:
+        setattr(self._load(), name, value)
+
+    def __repr__(self) -> str:
+        return f"<lazy {self._config!r}>" if self.is_loaded else "<lazy Config (not loaded)>"
+
+
+def get_config() -> Config:
+    """Return the global configuration, loading it if needed."""
+    return config._load()
+
 
-# Global config instance
-config = Config()
+# Global config instance, loaded on first use
+config = _LazyConfig()
@@ -0,0 +1,724 @@
+"""On-disk inverted index of extracted CVs for matching a JD to candidates."""
+import argparse
+import asyncio
+import heapq
+import math
+import os
+import sqlite3
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import asdict, dataclass
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Iterable, Optional
+
+from cv_formatter.ats_score import AVG_CV_TOKENS, B, K1, get_scorer, tokenize
+from cv_formatter.cache import content_key
+from cv_formatter.config import config
+
+# CV files ingest() reads, by the parser that reads them
+PDF_SUFFIXES = (".pdf",)
+TEXT_SUFFIXES = (".txt", ".md")
+
+# Segments of one size class merged into one as they pile up; each posting
+# is rewritten about log8(CVs / batch) times
+MERGE_FACTOR = 8
+# Removed CVs are masked at query time until a merge drops their postings;
+# past this share of the index, every segment is merged at once
+MAX_DELETED_SHARE = 0.2
+# A postings list this many times longer than the candidates left is
+# searched for each of them rather than scanned
+SCAN_RATIO = 8
+
+
+@dataclass(frozen=True)
+class Candidate:
+    """A CV matching a job description."""
+
+    path: str
+    score: float
+    matched: tuple[str, ...] = ()
+
+    def as_dict(self) -> dict:
+        return {"path": self.path, "score": round(self.score, 4), "matched": list(self.matched)}
+
+
+@dataclass
+class IngestReport:
+    """What ingesting a directory changed in the index."""
+
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def _find(docs: array, doc_id: int) -> Optional[int]:
+    """Position of a document in a sorted postings list, or None."""
+    position = bisect_left(docs, doc_id)
+    if position < len(docs) and docs[position] == doc_id:
+        return position
+    return None
+
+
+def _rank(
+    postings: dict[int, tuple[array, array]],
+    weights: dict[int, float],
+    bounds: dict[int, float],
+    deleted: set[int],
+    k: int,
+    exhaustive: bool = False,
+) -> list[tuple[int, float]]:
+    """
+    The k documents with the highest weighted sum of impacts (MaxScore).
+
+    Terms are accumulated in full, highest bound first, until the bounds of
+    the terms left add up to no more than the k-th best score so far, so no
+    document not seen yet can reach the top k. The documents seen that
+    still can then look the remaining terms up by binary search (or scan
+    lists short enough), dropping out as the bound left shrinks.
+
+    Args:
+        postings: Sorted document ids and impacts of each term
+        weights: Query weight of each term
+        bounds: Highest weighted impact of each term
+        deleted: Documents whose postings are masked
+        k: Number of documents
+        exhaustive: Accumulate every term in full
+
+    Returns:
+        Pairs of document id and score, best first
+    """
+    order = sorted(bounds, key=bounds.get, reverse=True)
+    total = remaining = sum(bounds.values())
+    scores: dict[int, float] = {}
+    threshold = 0.0
+    done = 0
+    for term_id in order:
+        if remaining <= threshold and not exhaustive:
+            break
+        docs, impacts = postings[term_id]
+        weight = weights[term_id]
+        get = scores.get
+        for doc_id, impact in zip(docs, impacts):
+            scores[doc_id] = get(doc_id, 0.0) + weight * impact
+        for doc_id in scores.keys() & deleted:
+            del scores[doc_id]
+        remaining -= bounds[term_id]
+        done += 1
+        # No score exceeds the bounds of the terms read, so until those
+        # outweigh the terms left the k-th best can't either
+        if len(scores) >= k and total - remaining >= remaining:
+            threshold = heapq.nlargest(k, scores.values())[-1]
+
+    candidates = [doc_id for doc_id, score in scores.items() if score + remaining >= threshold]
+    for term_id in order[done:]:
+        docs, impacts = postings[term_id]
+        weight = weights[term_id]
+        if len(docs) < SCAN_RATIO * len(candidates):
+            wanted = set(candidates)
+            for doc_id, impact in zip(docs, impacts):
+                if doc_id in wanted:
+                    scores[doc_id] += weight * impact
+        else:
+            for doc_id in candidates:
+                position = _find(docs, doc_id)
+                if position is not None:
+                    scores[doc_id] += weight * impacts[position]
+        remaining -= bounds[term_id]
+        if len(candidates) >= k:
+            threshold = max(threshold, heapq.nlargest(k, [scores[d] for d in candidates])[-1])
+        candidates = [doc_id for doc_id in candidates if scores[doc_id] + remaining >= threshold]
+    return heapq.nlargest(k, ((doc_id, scores[doc_id]) for doc_id in candidates), key=itemgetter(1))
+
+
+class CVIndex:
+    """
+    Inverted index of CV terms in a SQLite file.
+
+    CVs are tokenized as the ATS scorer does (lowercase, stopwords dropped,
+    plurals folded, "C++" and "C#" kept). Each add_many() writes a segment:
+    per term, the sorted ids of its CVs and the term's BM25 weight in each,
+    length-normalized against a typical CV length so it never has to be
+    rewritten, packed into two blobs. Segments of a size class are merged
+    as they pile up, so a term's postings are a handful of rows. Removing
+    or replacing a CV masks its old postings until a merge drops them.
+
+    A query takes the JD's keywords, weighted by the scorer's weights and
+    by IDF, and ranks every CV by BM25 without reading the postings of the
+    frequent terms in full (see _rank()).
+
+    Documents are keyed by path; adding a path again replaces it only if
+    its text changed. One process writes the index at a time.
+    """
+
+    # Document ids only grow and segments are numbered in the order they
+    # were written (a merge keeps the first number), so a term's rows read
+    # by segment concatenate into a sorted postings list
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS documents (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            path TEXT NOT NULL UNIQUE,
+            digest TEXT NOT NULL,
+            mtime REAL,
+            size INTEGER,
+            length INTEGER NOT NULL,
+            terms BLOB NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS terms (
+            id INTEGER PRIMARY KEY,
+            term TEXT NOT NULL UNIQUE,
+            df INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS segments (
+            id INTEGER PRIMARY KEY,
+            level INTEGER NOT NULL,
+            first_doc INTEGER NOT NULL,
+            last_doc INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS postings (
+            term_id INTEGER NOT NULL,
+            segment_id INTEGER NOT NULL,
+            docs BLOB NOT NULL,
+            impacts BLOB NOT NULL,
+            max_impact REAL NOT NULL,
+            PRIMARY KEY (term_id, segment_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS postings_segment ON postings (segment_id);
+        CREATE TABLE IF NOT EXISTS deleted (doc_id INTEGER PRIMARY KEY);
+    """
+
+    def __init__(self, path: Optional[str | Path] = None):
+        """
+        Open or create the index.
+
+        Args:
+            path: SQLite database file (default: config.cv_index_path)
+        """
+        self.path = Path(path or config.cv_index_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        # WAL with NORMAL sync stays consistent on a crash, without an fsync
+        # per batch
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(self._SCHEMA)
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        """Read the state kept in memory: term ids, counts, deleted CVs."""
+        self._term_ids: dict[str, int] = dict(self._db.execute("SELECT term, id FROM terms"))
+        self._next_term_id = max(self._term_ids.values(), default=0) + 1
+        (self._documents,) = self._db.execute("SELECT COUNT(*) FROM documents").fetchone()
+        self._deleted = {doc_id for (doc_id,) in self._db.execute("SELECT doc_id FROM deleted")}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def __len__(self) -> int:
+        return self._documents
+
+    def __contains__(self, path: str | Path) -> bool:
+        return self._db.execute(
+            "SELECT 1 FROM documents WHERE path=?", (_key(path),)
+        ).fetchone() is not None
+
+    @property
+    def vocabulary(self) -> int:
+        """Distinct terms indexed."""
+        return len(self._term_ids)
+
+    @property
+    def segments(self) -> int:
+        """Segments the postings are split into."""
+        return self._db.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+
+    def _transaction(self, func, *args):
+        """Run a write in one transaction."""
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                result = func(*args)
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                # Term ids handed out in the rolled back transaction are gone
+                self._load()
+                raise
+            self._db.execute("COMMIT")
+            return result
+
+    def add(self, path: str | Path, text: str) -> bool:
+        """
+        Index a CV, replacing an earlier version of it.
+
+        Args:
+            path: CV file the text was extracted from
+            text: Extracted CV text
+
+        Returns:
+            Whether the index changed (False if the text is unchanged)
+        """
+        return self.add_many([(path, text)]) == 1
+
+    def add_many(self, documents: Iterable[tuple[str | Path, str]]) -> int:
+        """
+        Index many CVs in one transaction and segment.
+
+        Args:
+            documents: Pairs of CV file and extracted text
+
+        Returns:
+            Number of CVs added or changed
+        """
+        return self._transaction(self._add_many, documents)
+
+    def _add_many(self, documents: Iterable[tuple[str | Path, str]]) -> int:
+        db = self._db
+        postings: dict[int, tuple[array, array]] = {}
+        doc_ids: list[int] = []
+        df: Counter = Counter()
+        for path, text in documents:
+            key, digest = _key(path), content_key(text)
+            mtime, size = _stamp(path)
+            old = db.execute(
+                "SELECT id, digest, terms FROM documents WHERE path=?", (key,)
+            ).fetchone()
+            if old is not None:
+                if old[1] == digest:
+                    db.execute("UPDATE documents SET mtime=?, size=? WHERE id=?", (mtime, size, old[0]))
+                    continue
+                self._delete(old[0], old[2], df)
+
+            terms = tokenize(text)
+            counts = Counter(terms)
+            ids = array("I", map(self._term_id, counts))
+            (doc_id,) = db.execute(
+                "INSERT INTO documents (path, digest, mtime, size, length, terms)"
+                " VALUES (?, ?, ?, ?, ?, ?) RETURNING id",
+                (key, digest, mtime, size, len(terms), ids.tobytes()),
+            ).fetchone()
+            # BM25 weight of each term in the CV
+            norm = K1 * (1 - B + B * len(terms) / AVG_CV_TOKENS)
+            for term_id, tf in zip(ids, counts.values()):
+                entry = postings.get(term_id)
+                if entry is None:
+                    entry = postings[term_id] = (array("I"), array("f"))
+                entry[0].append(doc_id)
+                entry[1].append(tf * (K1 + 1) / (tf + norm))
+            df.update(ids)
+            doc_ids.append(doc_id)
+            self._documents += 1
+
+        if doc_ids:
+            (segment_id,) = db.execute(
+                "INSERT INTO segments (level, first_doc, last_doc) VALUES (0, ?, ?) RETURNING id",
+                (doc_ids[0], doc_ids[-1]),
+            ).fetchone()
+            db.executemany("INSERT INTO postings VALUES (?, ?, ?, ?, ?)", [
+                (term_id, segment_id, docs.tobytes(), impacts.tobytes(), max(impacts))
+                for term_id, (docs, impacts) in postings.items()
+            ])
+        self._update_df(df)
+        self._merge_segments()
+        return len(doc_ids)
+
+    def _term_id(self, term: str) -> int:
+        term_id = self._term_ids.get(term)
+        if term_id is None:
+            term_id = self._term_ids[term] = self._next_term_id
+            self._next_term_id += 1
+            self._db.execute("INSERT INTO terms VALUES (?, ?, 0)", (term_id, term))
+        return term_id
+
+    def _update_df(self, df: Counter) -> None:
+        self._db.executemany(
+            "UPDATE terms SET df = df + ? WHERE id = ?",
+            [(change, term_id) for term_id, change in df.items() if change],
+        )
+
+    def _delete(self, doc_id: int, terms: bytes, df: Counter) -> None:
+        """Drop a document and mask its postings, counting the document frequency changes."""
+        ids = array("I")
+        ids.frombytes(terms)
+        self._db.execute("DELETE FROM documents WHERE id=?", (doc_id,))
+        self._db.execute("INSERT INTO deleted VALUES (?)", (doc_id,))
+        self._deleted.add(doc_id)
+        df.subtract(ids)
+        self._documents -= 1
+
+    def _merge_segments(self) -> None:
+        """Merge the segments of a size class that piled up, or all if many CVs are masked."""
+        segments = self._db.execute("SELECT id, level FROM segments ORDER BY id").fetchall()
+        if self._deleted and len(self._deleted) > MAX_DELETED_SHARE * self._documents:
+            if segments:
+                self._merge([segment_id for segment_id, _ in segments], segments[0][1])
+            return
+        # Levels never increase with the segment number, so the segments of a
+        # level are adjacent
+        while True:
+            levels: dict[int, list[int]] = {}
+            for segment_id, level in segments:
+                levels.setdefault(level, []).append(segment_id)
+            full = [level for level, ids in levels.items() if len(ids) >= MERGE_FACTOR]
+            if not full:
+                return
+            self._merge(levels[min(full)], min(full) + 1)
+            segments = self._db.execute("SELECT id, level FROM segments ORDER BY id").fetchall()
+
+    def _merge(self, segment_ids: list[int], level: int) -> None:
+        """Merge adjacent segments into the first, dropping masked postings."""
+        db = self._db
+        marks = ",".join("?" * len(segment_ids))
+        first, last = db.execute(
+            f"SELECT MIN(first_doc), MAX(last_doc) FROM segments WHERE id IN ({marks})", segment_ids
+        ).fetchone()
+        deleted = {doc_id for doc_id in self._deleted if first <= doc_id <= last}
+        rows = db.execute(
+            f"SELECT term_id, segment_id, docs, impacts FROM postings WHERE segment_id IN ({marks})",
+            segment_ids,
+        ).fetchall()
+        rows.sort(key=itemgetter(0, 1))
+        target, merged = segment_ids[0], []
+        for term_id, group in groupby(rows, key=itemgetter(0)):
+            docs, impacts = array("I"), array("f")
+            for _, _, doc_blob, impact_blob in group:
+                docs.frombytes(doc_blob)
+                impacts.frombytes(impact_blob)
+            if deleted and not deleted.isdisjoint(docs):
+                keep = [position for position, doc_id in enumerate(docs) if doc_id not in deleted]
+                docs = array("I", [docs[position] for position in keep])
+                impacts = array("f", [impacts[position] for position in keep])
+            if docs:
+                merged.append((term_id, target, docs.tobytes(), impacts.tobytes(), max(impacts)))
+
+        db.execute(f"DELETE FROM postings WHERE segment_id IN ({marks})", segment_ids)
+        db.executemany("INSERT INTO postings VALUES (?, ?, ?, ?, ?)", merged)
+        db.execute(f"DELETE FROM segments WHERE id IN ({marks}) AND id != ?", [*segment_ids, target])
+        db.execute("UPDATE segments SET level=?, last_doc=? WHERE id=?", (level, last, target))
+        db.execute("DELETE FROM deleted WHERE doc_id BETWEEN ? AND ?", (first, last))
+        self._deleted -= deleted
+
+    def remove(self, path: str | Path) -> bool:
+        """
+        Drop a CV from the index.
+
+        Returns:
+            Whether the CV was indexed
+        """
+        return self.remove_many([path]) == 1
+
+    def remove_many(self, paths: Iterable[str | Path]) -> int:
+        """Drop CVs from the index in one transaction; returns how many were indexed."""
+        return self._transaction(self._remove_many, paths)
+
+    def _remove_many(self, paths: Iterable[str | Path]) -> int:
+        df: Counter = Counter()
+        removed = 0
+        for path in paths:
+            row = self._db.execute(
+                "SELECT id, terms FROM documents WHERE path=?", (_key(path),)
+            ).fetchone()
+            if row is not None:
+                self._delete(row[0], row[1], df)
+                removed += 1
+        self._update_df(df)
+        self._merge_segments()
+        return removed
+
+    def search(self, jd_text: str, k: int = 10, exhaustive: bool = False) -> list[Candidate]:
+        """
+        Return the CVs that best match a job description.
+
+        Args:
+            jd_text: Job description text
+            k: Number of candidates
+            exhaustive: Read every posting of the JD's terms rather than
+                stopping once the top k are settled (the same ranking,
+                slower; for checking the pruning)
+
+        Returns:
+            Up to `k` candidates, best first, with the JD keywords they
+            mention
+        """
+        if not self._documents or k <= 0:
+            return []
+        keywords = {
+            term: weight for term, weight in get_scorer(jd_text).keywords.items()
+            if " " not in term and term in self._term_ids
+        }
+        if not keywords:
+            return []
+
+        with self._lock:
+            ids = {self._term_ids[term]: term for term in keywords}
+            marks = ",".join("?" * len(ids))
+            df = dict(self._db.execute(f"SELECT id, df FROM terms WHERE id IN ({marks})", list(ids)))
+            # Query weight of each term: the JD's weight times BM25's IDF
+            documents = self._documents
+            weights = {
+                term_id: keywords[term] * math.log(1 + (documents - df[term_id] + 0.5) / (df[term_id] + 0.5))
+                for term_id, term in ids.items() if df.get(term_id)
+            }
+            postings = {term_id: (array("I"), array("f")) for term_id in weights}
+            bounds = dict.fromkeys(weights, 0.0)
+            for term_id, docs, impacts, max_impact in self._db.execute(
+                f"SELECT term_id, docs, impacts, max_impact FROM postings WHERE term_id IN ({marks})"
+                " ORDER BY term_id, segment_id",
+                list(ids),
+            ):
+                if term_id in postings:
+                    postings[term_id][0].frombytes(docs)
+                    postings[term_id][1].frombytes(impacts)
+                    bounds[term_id] = max(bounds[term_id], weights[term_id] * max_impact)
+
+            best = _rank(postings, weights, bounds, self._deleted, k, exhaustive)
+            paths = dict(self._db.execute(
+                f"SELECT id, path FROM documents WHERE id IN ({','.join('?' * len(best))})",
+                [doc_id for doc_id, _ in best],
+            ))
+
+        return [
+            Candidate(
+                paths[doc_id],
+                score,
+                tuple(sorted(
+                    (ids[term_id] for term_id in weights if _find(postings[term_id][0], doc_id) is not None),
+                    key=lambda term: -keywords[term],
+                )),
+            )
+            for doc_id, score in best
+        ]
+
+    async def search_file(
+        self, jd_path: str | Path, k: int = 10, text_reader=None
+    ) -> list[Candidate]:
+        """
+        Return the CVs that best match a job description file.
+
+        Args:
+            jd_path: JD text file
+            k: Number of candidates
+            text_reader: TextParser to read it with (default: a new one)
+        """
+        from cv_formatter.parsers import TextParser
+
+        text_reader = text_reader or TextParser()
+        jd_text = await text_reader.read_file_async(jd_path)
+        return await asyncio.to_thread(self.search, jd_text, k)
+
+    def _stamps_under(self, directory: Path) -> dict[str, tuple]:
+        """Modification time and size of the indexed files under a directory."""
+        prefix = _key(directory).rstrip(os.sep) + os.sep
+        with self._lock:
+            return {
+                path: (mtime, size) for path, mtime, size in self._db.execute(
+                    "SELECT path, mtime, size FROM documents WHERE substr(path, 1, ?) = ?",
+                    (len(prefix), prefix),
+                )
+            }
+
+    async def ingest(
+        self,
+        directory: str | Path,
+        pdf_reader=None,
+        text_reader=None,
+        concurrency: Optional[int] = None,
+        batch_size: int = 500,
+    ) -> IngestReport:
+        """
+        Bring the index in line with a directory of CVs.
+
+        PDFs are extracted with PDFParser and text files read with
+        TextParser, concurrently. Files whose modification time and size
+        match the index are not read again, changed ones are re-indexed,
+        and indexed files no longer in the directory are removed.
+
+        Args:
+            directory: Directory searched recursively for CVs
+            pdf_reader: PDFParser to extract PDFs with (default: a new one)
+            text_reader: TextParser to read text files with (default: a new one)
+            concurrency: Files read at a time (default: config.batch_concurrency)
+            batch_size: CVs written per transaction
+
+        Returns:
+            Counts of added, updated, unchanged, removed and failed CVs
+        """
+        from cv_formatter.parsers import PDFParser, TextParser
+
+        start = time.perf_counter()
+        directory = Path(directory)
+        if not directory.is_dir():
+            raise FileNotFoundError(f"CV directory not found: {directory}")
+        pdf_reader = pdf_reader or PDFParser()
+        text_reader = text_reader or TextParser()
+        report = IngestReport()
+
+        files = sorted(
+            path for path in directory.rglob("*")
+            if path.suffix.lower() in PDF_SUFFIXES + TEXT_SUFFIXES and path.is_file()
+        )
+        known = await asyncio.to_thread(self._stamps_under, directory)
+        changed = []
+        for path in files:
+            stamp = known.pop(_key(path), None)
+            if stamp is not None and stamp == _stamp(path):
+                report.unchanged += 1
+            else:
+                changed.append((path, stamp is not None))
+        report.removed = await asyncio.to_thread(self.remove_many, list(known))
+
+        semaphore = asyncio.Semaphore(concurrency or config.batch_concurrency)
+
+        async def read(path: Path) -> Optional[str]:
+            async with semaphore:
+                try:
+                    if path.suffix.lower() in PDF_SUFFIXES:
+                        return await pdf_reader.extract_text_async(path)
+                    return await text_reader.read_file_async(path)
+                except (FileNotFoundError, RuntimeError):
+                    return None
+
+        for first in range(0, len(changed), batch_size):
+            batch = changed[first:first + batch_size]
+            texts = await asyncio.gather(*(read(path) for path, _ in batch))
+            documents, updates = [], 0
+            for (path, known_before), text in zip(batch, texts):
+                if text is None:
+                    report.failed += 1
+                    continue
+                documents.append((path, text))
+                updates += known_before
+            written = await asyncio.to_thread(self.add_many, documents)
+            # New files are always written; known ones only if their text changed
+            report.added += len(documents) - updates
+            report.updated += written - (len(documents) - updates)
+            report.unchanged += len(documents) - written
+
+        report.seconds = time.perf_counter() - start
+        return report
+
+
+def _key(path: str | Path) -> str:
+    return str(Path(path).absolute())
+
+
+def _stamp(path: str | Path) -> tuple[Optional[float], Optional[int]]:
+    """Modification time and size of a file, or Nones if it doesn't exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None, None
+    return stat.st_mtime, stat.st_size
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="CV Formatter - CV index",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Index every CV under a directory, or bring the index up to date
+  python -m cv_formatter.cv_index ingest cvs/
+
+  # The 20 CVs that best match a job description
+  python -m cv_formatter.cv_index search jd.txt -k 20
+
+  # Rewrite the 5 best matching CVs for the job
+  python -m cv_formatter.cv_index search jd.txt -k 5 --rewrite -o outputs/
+        """
+    )
+    parser.add_argument("--index", type=Path, default=None,
+                        help="Index file (default: CV_INDEX_PATH)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="Index the CVs in a directory")
+    ingest.add_argument("directory", type=Path, help="Directory of CV PDFs and text files")
+    ingest.add_argument("-j", "--concurrency", type=int, default=None,
+                        help="Files read at a time (default: BATCH_CONCURRENCY)")
+
+    search = commands.add_parser("search", help="Find the CVs matching a JD")
+    search.add_argument("jd", type=Path, help="Job description text file")
+    search.add_argument("-k", "--top", type=int, default=10,
+                        help="Number of candidates (default: 10)")
+    search.add_argument("--rewrite", action="store_true",
+                        help="Send the candidate PDFs through the rewrite workflow")
+    search.add_argument("-o", "--output-dir", type=Path, default=Path("batch_output"),
+                        help="Directory for rewritten CVs (default: batch_output)")
+    search.add_argument("-f", "--format", choices=["plain", "markdown", "html", "json"],
+                        default="plain", help="Rewritten CV format (default: plain)")
+    return parser.parse_args()
+
+
+async def main_async():
+    """Main async function."""
+    args = parse_arguments()
+    if getattr(args, "rewrite", False) and not config.is_configured:
+        print("ERROR: GOOGLE_API_KEY not found in .env file")
+        print("Please create a .env file with: GOOGLE_API_KEY=your_key_here")
+        return 1
+    index = CVIndex(args.index)
+    try:
+        if args.command == "ingest":
+            report = await index.ingest(args.directory, concurrency=args.concurrency)
+            print(f"{report.added} added, {report.updated} updated, {report.unchanged} unchanged, "
+                  f"{report.removed} removed, {report.failed} failed in {report.seconds:.1f}s "
+                  f"({len(index)} CVs indexed)")
+            return 1 if report.failed else 0
+
+        from cv_formatter.parsers import TextParser
+
+        jd_text = await TextParser().read_file_async(args.jd)
+        start = time.perf_counter()
+        candidates = index.search(jd_text, args.top)
+        elapsed = time.perf_counter() - start
+    finally:
+        index.close()
+
+    for rank, candidate in enumerate(candidates, 1):
+        print(f"{rank:>3}. {candidate.score:7.2f}  {candidate.path}")
+        print(f"       {', '.join(candidate.matched[:10])}")
+    print(f"\n{len(candidates)} candidates in {elapsed * 1000:.1f}ms")
+
+    if args.rewrite:
+        from cv_formatter.batch import BatchJob, BatchRunner
+        from cv_formatter.orchestrator import CVFormatterOrchestrator
+
+        jobs = [BatchJob(Path(c.path), args.jd) for c in candidates
+                if Path(c.path).suffix.lower() in PDF_SUFFIXES]
+        orchestrator = CVFormatterOrchestrator()
+        try:
+            report = await BatchRunner(orchestrator, format_type=args.format,
+                                       output_dir=args.output_dir).run(jobs)
+        finally:
+            orchestrator.close()
+        for result in report.results:
+            detail = result.output_path if result.ok else result.error
+            print(f"{'✓' if result.ok else '✗'} {result.cv_path.name}: {detail}")
+        return 0 if report.failed == 0 else 1
+    return 0
+
+
+def main():
+    """Entry point for CV index CLI."""
+    try:
+        sys.exit(asyncio.run(main_async()))
+    except KeyboardInterrupt:
+        print("\n\nOperation cancelled by user.")
+        sys.exit(130)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,151 +1,183 @@
 """Output formatting module for different file formats."""
+import functools
+import html
+import os
+import re
+from dataclasses import dataclass
 from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, Optional, TextIO
 
+from cv_formatter.process_pool import run_cpu_bound
+from cv_formatter.structured import StructuredCV
 
-def format_output(content: str, format_type: str = "plain") -> str:
+
+def format_output(content: str | StructuredCV, format_type: str = "plain") -> str:
     """
     Format the CV output in the specified format.
 
     Args:
-        content: The reformatted CV text
-        format_type: Output format (plain, markdown, or html)
+        content: The reformatted CV text, or its section model, which is
+            rendered without parsing the text again
+        format_type: Output format (plain, markdown, html, or json)
 
     Returns:
         Formatted content string
     """
-    if format_type == "markdown":
+    if format_type == "json":
+        return as_structured(content).to_json()
+    elif format_type == "markdown":
         return format_as_markdown(content)
     elif format_type == "html":
         return format_as_html(content)
+    elif isinstance(content, StructuredCV):
+        return content.to_text()
     else:  # plain
         return content
 
 
-def format_as_markdown(content: str) -> str:
+async def format_output_async(content: str | StructuredCV, format_type: str = "plain") -> str:
     """
-    Format CV content as Markdown.
+    Format the CV output without blocking the event loop.
+
+    Markdown, HTML and JSON are built in the shared process pool.
 
     Args:
-        content: The CV text
+        content: The reformatted CV text, or its section model
+        format_type: Output format (plain, markdown, html, or json)
 
     Returns:
-        Markdown-formatted CV
+        Formatted content string
     """
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    if format_type == "plain" and isinstance(content, str):
+        return content
+    return await run_cpu_bound(format_output, content, format_type)
 
-    markdown = f"""# Reformatted CV
 
-*Generated on: {timestamp}*
-*Optimized for ATS by CV Formatter*
+def as_structured(content: str | StructuredCV) -> StructuredCV:
+    """Return the section model of a CV, parsing its text if needed."""
+    return content if isinstance(content, StructuredCV) else StructuredCV.parse(content)
 
----
 
-{content}
+# Characters of CV text write_output() formats at a time
+_WRITE_SLICE = 64 * 1024
 
----
 
-*This CV was optimized using multi-agent AI analysis to maximize compatibility with Applicant Tracking Systems (ATS).*
-"""
-    return markdown
+def _timestamp() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 
-def format_as_html(content: str) -> str:
+@dataclass(frozen=True)
+class Template:
     """
-    Format CV content as HTML.
-
-    Args:
-        content: The CV text
+    A document wrapped around the CV text.
 
-    Returns:
-        HTML-formatted CV
+    `text` holds a {content} slot once, where the CV goes, and a {timestamp}
+    slot any number of times; other braces are literal, so CSS needs no
+    escaping. With `paragraphs`, the CV's blank-line separated paragraphs
+    are converted to HTML headings and paragraphs instead of being inserted
+    as is.
     """
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-    # Convert plain text to HTML with basic formatting
-    # Preserve line breaks and paragraphs
-    paragraphs = content.split('\n\n')
-    html_paragraphs = []
+    text: str
+    paragraphs: bool = False
+
+    @classmethod
+    def from_file(cls, path: str | Path, paragraphs: Optional[bool] = None) -> "Template":
+        """
+        Load a template from a file.
+
+        Args:
+            path: Template file
+            paragraphs: Convert the CV to HTML paragraphs (default: for
+                .html and .htm files)
+        """
+        path = Path(path)
+        if paragraphs is None:
+            paragraphs = path.suffix.lower() in (".html", ".htm")
+        return cls(path.read_text(encoding="utf-8"), paragraphs)
 
-    for para in paragraphs:
-        if para.strip():
-            # Check if it looks like a heading (short line, possibly all caps or title case)
-            lines = para.split('\n')
-            if len(lines) == 1 and len(para) < 100:
-                # Likely a heading
-                html_paragraphs.append(f'<h2>{para.strip()}</h2>')
-            else:
-                # Regular paragraph - preserve line breaks
-                formatted = para.replace('\n', '<br>\n')
-                html_paragraphs.append(f'<p>{formatted}</p>')
 
-    content_html = '\n'.join(html_paragraphs)
+MARKDOWN_TEMPLATE = Template('''# Reformatted CV
+
+*Generated on: {timestamp}*
+*Optimized for ATS by CV Formatter*
+
+---
+
+{content}
+
+---
+
+*This CV was optimized using multi-agent AI analysis to maximize compatibility with Applicant Tracking Systems (ATS).*
+''')
 
-    html = f"""<!DOCTYPE html>
+HTML_TEMPLATE = Template('''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Reformatted CV - ATS Optimized</title>
     <style>
-        body {{
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             line-height: 1.6;
             max-width: 900px;
             margin: 40px auto;
             padding: 20px;
             background-color: #f5f5f5;
-        }}
-        .container {{
+        }
+        .container {
             background-color: white;
             padding: 40px;
             border-radius: 8px;
             box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        .header {{
+        }
+        .header {
             border-bottom: 3px solid #2c3e50;
             margin-bottom: 30px;
             padding-bottom: 20px;
-        }}
-        h1 {{
+        }
+        h1 {
             color: #2c3e50;
             margin: 0;
             font-size: 2.5em;
-        }}
-        .meta {{
+        }
+        .meta {
             color: #7f8c8d;
             font-size: 0.9em;
             margin-top: 10px;
-        }}
-        h2 {{
+        }
+        h2 {
             color: #34495e;
             border-bottom: 2px solid #3498db;
             padding-bottom: 5px;
             margin-top: 30px;
             margin-bottom: 15px;
-        }}
-        p {{
+        }
+        p {
             margin: 15px 0;
             color: #2c3e50;
-        }}
-        .footer {{
+        }
+        .footer {
             margin-top: 40px;
             padding-top: 20px;
             border-top: 1px solid #ecf0f1;
             text-align: center;
             color: #7f8c8d;
             font-size: 0.85em;
-        }}
-        @media print {{
-            body {{
+        }
+        @media print {
+            body {
                 background-color: white;
                 margin: 0;
                 padding: 0;
-            }}
-            .container {{
+            }
+            .container {
                 box-shadow: none;
                 padding: 20px;
-            }}
-        }}
+            }
+        }
     </style>
 </head>
 <body>
@@ -159,7 +191,7 @@ def format_as_html(content: str) -> str:
         </div>
 
         <div class="content">
-{content_html}
+{content}
         </div>
 
         <div class="footer">
@@ -168,5 +200,388 @@ def format_as_html(content: str) -> str:
     </div>
 </body>
 </html>
-"""
-    return html
+''', paragraphs=True)
+
+TEMPLATES = {"markdown": MARKDOWN_TEMPLATE, "html": HTML_TEMPLATE}
+
+_SLOT_RE = re.compile(r"\{(content|timestamp)\}")
+
+
+class Renderer:
+    """
+    Renders CVs into a template split once into static segments.
+
+    The template's text between slots is kept as strings and as UTF-8
+    bytes, so rendering a document only joins segments; many documents can
+    share one timestamp and be written without building each one as a
+    single string first.
+    """
+
+    def __init__(self, template: Template | str = "html"):
+        """
+        Initialize the renderer.
+
+        Args:
+            template: Template, or the name of a built-in one (markdown or
+                html)
+
+        Raises:
+            KeyError: If there is no built-in template of that name
+            ValueError: If the template doesn't have exactly one {content}
+                slot
+        """
+        if isinstance(template, str):
+            template = TEMPLATES[template]
+        self.template = template
+        pieces = _SLOT_RE.split(template.text)
+        self._static = pieces[0::2]
+        self._slots = pieces[1::2]
+        if self._slots.count("content") != 1:
+            raise ValueError("A template needs exactly one {content} slot")
+        self._static_bytes = [piece.encode("utf-8") for piece in self._static]
+
+    def body(self, content: str | StructuredCV) -> str:
+        """The CV text, or its section model, as it goes into the {content} slot."""
+        if isinstance(content, StructuredCV):
+            if self.template.paragraphs:
+                return _sections_html(content)
+            return _sections_markdown(content)
+        if not self.template.paragraphs:
+            return content
+        # Convert plain text to HTML with basic formatting
+        # Preserve line breaks and paragraphs
+        return '\n'.join(
+            _html_paragraph(para) for para in content.split('\n\n') if para.strip()
+        )
+
+    def _join(self, static: list, body, stamp) -> list:
+        parts = [static[0]]
+        for slot, piece in zip(self._slots, static[1:]):
+            parts.append(body if slot == "content" else stamp)
+            parts.append(piece)
+        return parts
+
+    def split(self, timestamp: Optional[str] = None) -> tuple[str, str]:
+        """Return the document before and after the CV text."""
+        parts = self._join(self._static, None, timestamp or _timestamp())
+        index = parts.index(None)
+        return "".join(parts[:index]), "".join(parts[index + 1:])
+
+    def render(self, content: str | StructuredCV, timestamp: Optional[str] = None) -> str:
+        """Render one document."""
+        return "".join(self._join(self._static, self.body(content), timestamp or _timestamp()))
+
+    def render_many(
+        self, contents: Iterable[str | StructuredCV], timestamp: Optional[str] = None
+    ) -> list[bytes]:
+        """
+        Render many documents with one timestamp.
+
+        Args:
+            contents: CV texts or section models
+            timestamp: Generation time shown in every document (default: now)
+
+        Returns:
+            The UTF-8 encoded documents, in order
+        """
+        stamp = (timestamp or _timestamp()).encode("utf-8")
+        return [
+            b"".join(self._join(self._static_bytes, self.body(content).encode("utf-8"), stamp))
+            for content in contents
+        ]
+
+    def write_many(
+        self, outputs: Iterable[tuple[str | Path, str | StructuredCV]], timestamp: Optional[str] = None
+    ) -> int:
+        """
+        Render documents with one timestamp straight into their files.
+
+        Each file gets the template's static segments and the CV's encoded
+        text in one writev() call, without the document being joined in
+        memory.
+
+        Args:
+            outputs: Pairs of output path and CV text or section model
+            timestamp: Generation time shown in every document (default: now)
+
+        Returns:
+            Number of files written
+        """
+        stamp = (timestamp or _timestamp()).encode("utf-8")
+        written = 0
+        for path, content in outputs:
+            body = self.body(content).encode("utf-8")
+            _write_segments(path, self._join(self._static_bytes, body, stamp))
+            written += 1
+        return written
+
+
+def _write_segments(path: str | Path, segments: list[bytes]) -> None:
+    """Write byte segments to a file, with a single writev() where available."""
+    if not hasattr(os, "writev"):
+        with open(path, "wb") as out:
+            out.writelines(segments)
+        return
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        written = os.writev(fd, segments)
+        # Short writes are rare on regular files; finish with plain writes
+        if written < sum(len(segment) for segment in segments):
+            rest = memoryview(b"".join(segments))[written:]
+            while rest:
+                rest = rest[os.write(fd, rest):]
+    finally:
+        os.close(fd)
+
+
+@functools.lru_cache(maxsize=None)
+def get_renderer(format_type: str) -> Renderer:
+    """Return the shared renderer of a built-in template."""
+    return Renderer(format_type)
+
+
+def _html_paragraph(para: str) -> str:
+    """Convert one blank-line separated paragraph to HTML."""
+    # Check if it looks like a heading (short line, possibly all caps or title case)
+    if len(para) < 100 and '\n' not in para:
+        # Likely a heading
+        return f'<h2>{para.strip()}</h2>'
+    # Regular paragraph - preserve line breaks
+    formatted = para.replace('\n', '<br>\n')
+    return f'<p>{formatted}</p>'
+
+
+def _sections_markdown(cv: StructuredCV) -> str:
+    """Markdown body of a section model: headings, paragraphs and lists."""
+    blocks = ["  \n".join(cv.header)] if cv.header else []
+    for section in cv.sections:
+        blocks.append(f"## {section.name}")
+        lines: list[str] = []
+        for entry in section.entries:
+            if entry.bullet:
+                lines.append(f"- {entry.text}")
+                continue
+            # A line of text starts a new paragraph; the bullets under it follow
+            if lines:
+                blocks.append("\n".join(lines))
+            lines = [entry.text]
+        if lines:
+            blocks.append("\n".join(lines))
+    return "\n\n".join(blocks)
+
+
+def _sections_html(cv: StructuredCV) -> str:
+    """HTML body of a section model, with its text escaped."""
+    parts = []
+    if cv.header:
+        parts.append("<p>" + "<br>\n".join(html.escape(line) for line in cv.header) + "</p>")
+    for section in cv.sections:
+        parts.append(f"<h2>{html.escape(section.name)}</h2>")
+        items: list[str] = []
+        for entry in section.entries:
+            if entry.bullet:
+                items.append(f"<li>{html.escape(entry.text)}</li>")
+                continue
+            if items:
+                parts.append("<ul>\n" + "\n".join(items) + "\n</ul>")
+                items = []
+            parts.append(f"<p>{html.escape(entry.text)}</p>")
+        if items:
+            parts.append("<ul>\n" + "\n".join(items) + "\n</ul>")
+    return "\n".join(parts)
+
+
+def format_as_markdown(content: str | StructuredCV, timestamp: Optional[str] = None) -> str:
+    """
+    Format CV content as Markdown.
+
+    Args:
+        content: The CV text, or its section model
+        timestamp: Generation time shown in the document (default: now)
+
+    Returns:
+        Markdown-formatted CV
+    """
+    return get_renderer("markdown").render(content, timestamp)
+
+
+def format_as_html(content: str | StructuredCV, timestamp: Optional[str] = None) -> str:
+    """
+    Format CV content as HTML.
+
+    Args:
+        content: The CV text, or its section model
+        timestamp: Generation time shown in the document (default: now)
+
+    Returns:
+        HTML-formatted CV
+    """
+    return get_renderer("html").render(content, timestamp)
+
+
+class StreamFormatter:
+    """
+    Formats a CV incrementally as its text arrives.
+
+    Plain text and Markdown pass chunks through; HTML holds back only the
+    paragraph being received, converting each one once the blank line after
+    it arrives. JSON needs every section, so it holds the text back and
+    parses it once in finish(). The concatenated output of start(), feed() and finish() is
+    identical to format_output() on the whole text.
+    """
+
+    def __init__(self, format_type: str = "plain", timestamp: Optional[str] = None):
+        """
+        Initialize the formatter.
+
+        Args:
+            format_type: Output format (plain, markdown, html, or json)
+            timestamp: Generation time shown in the document (default: now)
+        """
+        self.format_type = format_type
+        if format_type in TEMPLATES:
+            self._head, self._tail = get_renderer(format_type).split(timestamp)
+        else:
+            self._head = self._tail = ""
+        # Chunks of the paragraph being received
+        self._held: list[str] = []
+        self._paragraphs = 0
+
+    def start(self) -> str:
+        """Return the document's opening."""
+        return self._head
+
+    def feed(self, chunk: str) -> str:
+        """Add CV text and return the output it completes."""
+        if self.format_type == "json":
+            self._held.append(chunk)
+            return ""
+        if self.format_type != "html":
+            return chunk
+        # Without a blank line the paragraph isn't complete; hold the chunk
+        # rather than copying the paragraph received so far again
+        if "\n\n" not in chunk and not (self._held and self._held[-1].endswith("\n")
+                                         and chunk.startswith("\n")):
+            if chunk:
+                self._held.append(chunk)
+            return ""
+        held = "".join(self._held)
+        text = held + chunk
+        parts = []
+        start = 0
+        # The held text has no blank line of its own
+        while (end := text.find('\n\n', max(start, len(held) - 1))) != -1:
+            parts.append(self._paragraph(text[start:end]))
+            start = end + 2
+        self._held = [text[start:]] if start < len(text) else []
+        return "".join(parts)
+
+    def finish(self) -> str:
+        """Return the rest of the output, closing the document."""
+        rest = ""
+        if self.format_type == "json":
+            rest = format_output("".join(self._held), "json")
+            self._held = []
+        elif self.format_type == "html":
+            rest = self._paragraph("".join(self._held))
+            self._held = []
+        return rest + self._tail
+
+    def _paragraph(self, para: str) -> str:
+        if not para.strip():
+            return ""
+        html = _html_paragraph(para)
+        self._paragraphs += 1
+        return html if self._paragraphs == 1 else '\n' + html
+
+
+def format_stream(
+    chunks: Iterable[str], format_type: str = "plain", timestamp: Optional[str] = None
+) -> Iterator[str]:
+    """
+    Format CV text chunks as they arrive.
+
+    Args:
+        chunks: Pieces of the CV text, in order
+        format_type: Output format (plain, markdown, html, or json)
+        timestamp: Generation time shown in the document (default: now)
+
+    Yields:
+        Pieces of the formatted document, never holding more than one
+        paragraph of the CV back
+    """
+    formatter = StreamFormatter(format_type, timestamp)
+    yield formatter.start()
+    for chunk in chunks:
+        if output := formatter.feed(chunk):
+            yield output
+    yield formatter.finish()
+
+
+async def format_stream_async(
+    chunks: AsyncIterable[str], format_type: str = "plain", timestamp: Optional[str] = None
+) -> AsyncIterator[str]:
+    """Format CV text chunks from an async iterator, as format_stream() does."""
+    formatter = StreamFormatter(format_type, timestamp)
+    yield formatter.start()
+    async for chunk in chunks:
+        if output := formatter.feed(chunk):
+            yield output
+    yield formatter.finish()
+
+
+def write_formatted(
+    chunks: Iterable[str],
+    out: TextIO,
+    format_type: str = "plain",
+    timestamp: Optional[str] = None,
+) -> None:
+    """
+    Format CV text chunks straight into a file.
+
+    Args:
+        chunks: Pieces of the CV text, in order
+        out: Text file to write to
+        format_type: Output format (plain, markdown, html, or json)
+        timestamp: Generation time shown in the document (default: now)
+    """
+    for output in format_stream(chunks, format_type, timestamp):
+        if output:
+            out.write(output)
+
+
+def write_output(
+    path: str | Path,
+    content: str,
+    format_type: str = "plain",
+    timestamp: Optional[str] = None,
+) -> None:
+    """
+    Format the CV straight into a file, without building the document.
+
+    Args:
+        path: File to write
+        content: The reformatted CV text
+        format_type: Output format (plain, markdown, html, or json)
+        timestamp: Generation time shown in the document (default: now)
+    """
+    # Fed in slices so only one slice's worth of output is held at a time
+    slices = (
+        content[start:start + _WRITE_SLICE] for start in range(0, len(content), _WRITE_SLICE)
+    )
+    with open(path, "w", encoding="utf-8") as out:
+        write_formatted(slices, out, format_type, timestamp)
+
+
+async def write_output_async(
+    path: str | Path,
+    content: str,
+    format_type: str = "plain",
+    timestamp: Optional[str] = None,
+) -> None:
+    """
+    Format the CV into a file without blocking the event loop.
+
+    The file is formatted and written in the shared process pool.
+    """
+    await run_cpu_bound(write_output, str(path), content, format_type, timestamp)
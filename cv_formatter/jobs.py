@@ -0,0 +1,274 @@
+"""Queue of CV formatting jobs run by a pool of workers on one orchestrator."""
+import asyncio
+import logging
+import shutil
+import statistics
+import tempfile
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+
+from cv_formatter.config import config
+from cv_formatter.structured import StructuredCV
+from cv_formatter.tracing import Trace, tracing
+
+if TYPE_CHECKING:
+    from cv_formatter.orchestrator import CVFormatterOrchestrator
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is full."""
+
+
+@dataclass
+class Job:
+    """A CV/JD pair submitted for formatting, and its progress."""
+
+    id: str
+    cv_path: Path
+    jd_path: Path
+    status: str = QUEUED
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    chunks: list[str] = field(default_factory=list)
+    error: Optional[str] = None
+    trace: Optional[Trace] = None
+    _structured: Optional[StructuredCV] = field(default=None, repr=False)
+    _changed: asyncio.Condition = field(default_factory=asyncio.Condition, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    @property
+    def result(self) -> Optional[str]:
+        """The reformatted CV once the job has succeeded."""
+        return "".join(self.chunks) if self.status == DONE else None
+
+    @property
+    def structured(self) -> Optional[StructuredCV]:
+        """The result's sections, parsed once when first asked for."""
+        if self._structured is None and (result := self.result) is not None:
+            self._structured = StructuredCV.parse(result)
+        return self._structured
+
+    async def update(self, **changes) -> None:
+        """Change fields of the job and wake up its followers."""
+        async with self._changed:
+            for name, value in changes.items():
+                setattr(self, name, value)
+            self._changed.notify_all()
+
+    async def append(self, chunk: str) -> None:
+        """Add a chunk of generated text and wake up its followers."""
+        async with self._changed:
+            self.chunks.append(chunk)
+            self._changed.notify_all()
+
+    async def follow(self) -> AsyncIterator[str]:
+        """Yield the CV text generated so far, then new chunks until done."""
+        sent = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: len(self.chunks) > sent or self.done)
+                new = self.chunks[sent:]
+                finished = self.done
+            sent += len(new)
+            for chunk in new:
+                yield chunk
+            if finished and sent == len(self.chunks):
+                return
+
+    def as_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "error": self.error,
+            "skipped_stages": self.trace.skipped_stages if self.trace else [],
+        }
+
+
+class StageStats:
+    """Latency of a workflow stage over recent jobs."""
+
+    def __init__(self, window: int = 1024):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.recent: deque[float] = deque(maxlen=window)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.recent.append(seconds)
+
+    def as_dict(self) -> dict:
+        recent = sorted(self.recent)
+        return {
+            "count": self.count,
+            "mean_ms": self.total_seconds / self.count * 1000,
+            "p50_ms": statistics.median(recent) * 1000,
+            "p95_ms": recent[min(len(recent) - 1, int(0.95 * len(recent)))] * 1000,
+            "max_ms": recent[-1] * 1000,
+        }
+
+
+class JobQueue:
+    """
+    Runs submitted jobs on a fixed pool of workers sharing one orchestrator.
+
+    Uploaded files live in a per-job temporary directory removed when the
+    job finishes. Finished jobs are kept for `job_ttl` seconds, up to
+    `max_jobs` of them, so clients can fetch their results.
+    """
+
+    def __init__(
+        self,
+        orchestrator: "CVFormatterOrchestrator",
+        workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        max_jobs: Optional[int] = None,
+        job_ttl: Optional[float] = None,
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            orchestrator: Orchestrator every job runs on
+            workers: Jobs run concurrently (default: SERVER_WORKERS)
+            max_queue: Jobs waiting before submissions are refused
+                (default: SERVER_MAX_QUEUE)
+            max_jobs: Finished jobs kept (default: SERVER_MAX_JOBS)
+            job_ttl: Seconds finished jobs are kept (default: SERVER_JOB_TTL)
+        """
+        self.orchestrator = orchestrator
+        self.workers = workers or config.server_workers
+        self.max_jobs = max_jobs or config.server_max_jobs
+        self.job_ttl = job_ttl or config.server_job_ttl
+        self.jobs: OrderedDict[str, Job] = OrderedDict()
+        self.stages: dict[str, StageStats] = {}
+        self.completed = 0
+        self.failed = 0
+        self._queue: asyncio.Queue[Job] = asyncio.Queue(max_queue or config.server_max_queue)
+        self._tasks: list[asyncio.Task] = []
+        self._active = 0
+        self._upload_root = Path(tempfile.mkdtemp(prefix="cv_formatter_jobs_"))
+
+    def start(self) -> None:
+        """Start the workers on the running event loop."""
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel the workers and remove leftover uploads."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        shutil.rmtree(self._upload_root, ignore_errors=True)
+
+    def submit(self, cv_pdf: bytes, jd_text: bytes) -> Job:
+        """
+        Store the uploaded files and queue a job for them.
+
+        Args:
+            cv_pdf: Content of the CV PDF
+            jd_text: Content of the JD text file
+
+        Returns:
+            The queued job
+
+        Raises:
+            QueueFullError: If the queue has no room for another job
+        """
+        if self._queue.full():
+            raise QueueFullError(f"{self._queue.qsize()} jobs already queued")
+        self._prune()
+
+        job_id = uuid.uuid4().hex
+        directory = self._upload_root / job_id
+        directory.mkdir()
+        job = Job(id=job_id, cv_path=directory / "cv.pdf", jd_path=directory / "jd.txt")
+        job.cv_path.write_bytes(cv_pdf)
+        job.jd_path.write_bytes(jd_text)
+
+        self.jobs[job_id] = job
+        self._queue.put_nowait(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def _prune(self) -> None:
+        """Forget finished jobs past the TTL or beyond the retention limit."""
+        now = time.time()
+        finished = [job for job in self.jobs.values() if job.done]
+        excess = len(finished) - self.max_jobs
+        for job in finished:
+            if excess > 0 or now - job.finished > self.job_ttl:
+                del self.jobs[job.id]
+                excess -= 1
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            self._active += 1
+            try:
+                await self._run(job)
+            finally:
+                self._active -= 1
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        await job.update(status=RUNNING, started=time.time())
+        self._record("queue_wait", job.started - job.created)
+        trace = Trace()
+        try:
+            with tracing(trace):
+                async for chunk in self.orchestrator.format_cv_stream(job.cv_path, job.jd_path):
+                    await job.append(chunk)
+        except Exception as e:
+            logger.exception("Job %s failed", job.id)
+            self.failed += 1
+            await job.update(status=FAILED, error=str(e), finished=time.time(), trace=trace)
+        else:
+            self.completed += 1
+            await job.update(status=DONE, finished=time.time(), trace=trace)
+        finally:
+            trace.finish()
+            shutil.rmtree(job.cv_path.parent, ignore_errors=True)
+
+        for span in trace.spans:
+            if span.duration is not None:
+                self._record(span.name, span.duration)
+        self._record("total", job.finished - job.started)
+
+    def _record(self, stage: str, seconds: float) -> None:
+        self.stages.setdefault(stage, StageStats()).add(seconds)
+
+    def metrics(self) -> dict:
+        """Queue length, active jobs, job counts and per-stage latency."""
+        return {
+            "queue_length": self._queue.qsize(),
+            "active_jobs": self._active,
+            "workers": self.workers,
+            "jobs_completed": self.completed,
+            "jobs_failed": self.failed,
+            "jobs_kept": len(self.jobs),
+            "stages": {name: stats.as_dict() for name, stats in self.stages.items()},
+            "scheduler": self.orchestrator.scheduler_stats(),
+            "caches": self.orchestrator.cache_stats(),
+            "sessions": self.orchestrator.session_stats(),
+        }
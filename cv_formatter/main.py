@@ -4,7 +4,53 @@ import asyncio
 import sys
 from pathlib import Path
 
-from cv_formatter import CVFormatterOrchestrator, config
+from cv_formatter import config
+
+
+async def stream_cv(orchestrator, args):
+    """
+    Write the CV to the output file or terminal as it is generated.
+
+    Plain text and Markdown are written chunk by chunk, and HTML paragraph
+    by paragraph.
+
+    Args:
+        orchestrator: Orchestrator running the workflow
+        args: Parsed command line arguments
+
+    Returns:
+        Streaming metrics of the run
+    """
+    from cv_formatter.formatter import StreamFormatter
+    from cv_formatter.orchestrator import StreamMetrics
+
+    metrics = StreamMetrics()
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        out = args.output.open("w", encoding="utf-8")
+    else:
+        out = sys.stdout
+        if not args.quiet:
+            print("="*80)
+            print("REFORMATTED CV")
+            print("="*80 + "\n")
+
+    try:
+        formatter = StreamFormatter(args.format)
+        out.write(formatter.start())
+        async for chunk in orchestrator.format_cv_stream(
+            args.cv_path, args.jd_path, metrics=metrics
+        ):
+            if output := formatter.feed(chunk):
+                out.write(output)
+                out.flush()
+        out.write(formatter.finish())
+        out.write("\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    return metrics
 
 
 def parse_arguments():
@@ -25,6 +71,21 @@ Examples:
 
   # Save as HTML
   python -m cv_formatter.main cv.pdf jd.txt -o output.html -f html
+
+  # Save the sections as JSON
+  python -m cv_formatter.main cv.pdf jd.txt -o output.json -f json
+
+  # Print the CV as it is generated
+  python -m cv_formatter.main cv.pdf jd.txt --stream
+
+  # Show where the time and tokens went, and save the trace
+  python -m cv_formatter.main cv.pdf jd.txt --trace --trace-json trace.json
+
+  # Recompute every stage instead of reusing unchanged ones from the last run
+  python -m cv_formatter.main cv.pdf jd.txt --full
+
+  # Rewrite a long CV section by section, with the sections in parallel
+  python -m cv_formatter.main cv.pdf jd.txt --sections
         """
     )
 
@@ -50,11 +111,42 @@ Examples:
     parser.add_argument(
         "-f", "--format",
         type=str,
-        choices=["plain", "markdown", "html"],
+        choices=["plain", "markdown", "html", "json"],
         default="plain",
         help="Output format (default: plain)"
     )
 
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Write the CV incrementally as it is generated"
+    )
+
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Print per-stage latency, tokens, tool calls and cache hits"
+    )
+
+    parser.add_argument(
+        "--trace-json",
+        type=Path,
+        default=None,
+        help="Write the per-stage trace as JSON to this file"
+    )
+
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Rerun every stage, even those whose inputs match the last run"
+    )
+
+    parser.add_argument(
+        "--sections",
+        action="store_true",
+        help="Rewrite long CVs section by section, with the sections in parallel"
+    )
+
     parser.add_argument(
         "-q", "--quiet",
         action="store_true",
@@ -64,6 +156,20 @@ Examples:
     return parser.parse_args()
 
 
+def report_trace(trace, args) -> None:
+    """Print the trace and/or write it as JSON, as --trace and --trace-json ask."""
+    if args.trace:
+        print("="*80)
+        print("TRACE")
+        print("="*80)
+        print(trace.summary() + "\n")
+    if args.trace_json:
+        args.trace_json.parent.mkdir(parents=True, exist_ok=True)
+        args.trace_json.write_text(trace.to_json(), encoding="utf-8")
+        if not args.quiet:
+            print(f"✓ Trace saved to: {args.trace_json.absolute()}")
+
+
 async def main():
     """Main entry point."""
     args = parse_arguments()
@@ -99,20 +205,41 @@ async def main():
         print(f"  Format: {args.format}")
         print("\nStarting multi-agent workflow...\n")
 
+    # Imported here so --help and argument errors don't load the agent stack
+    from cv_formatter.orchestrator import CVFormatterOrchestrator
+
+    if args.full:
+        config.incremental_rerun = False
+    if args.sections:
+        config.rewrite_sections = True
     orchestrator = CVFormatterOrchestrator()
 
     try:
-        # Run with or without debug based on output destination
-        if args.output:
-            # Run without debug output, collect result
-            reformatted_cv = await orchestrator.format_cv(cv_path, jd_path)
+        if args.stream:
+            from cv_formatter.tracing import Trace, tracing
+
+            with tracing(Trace()) as trace:
+                metrics = await stream_cv(orchestrator, args)
+            if not args.quiet:
+                if args.output:
+                    print(f"\n✓ Reformatted CV saved to: {args.output.absolute()}")
+                print(f"\nTime to first byte: {metrics.ttfb_seconds:.2f}s, "
+                      f"total: {metrics.total_seconds:.2f}s")
+                if trace.skipped_stages:
+                    print(f"Unchanged since the last run, skipped: "
+                          f"{', '.join(trace.skipped_stages)}")
+            report_trace(trace, args)
+            reformatted_cv = None
         else:
-            # Run in debug mode for visibility
-            if args.quiet:
-                reformatted_cv = await orchestrator.format_cv(cv_path, jd_path)
-            else:
-                await orchestrator.format_cv_debug(cv_path, jd_path)
-                reformatted_cv = None
+            result = await orchestrator.format_cv_detailed(cv_path, jd_path)
+            reformatted_cv = result.structured if args.format == "json" else result.cv
+            if not args.quiet and result.skipped_stages:
+                print(f"Unchanged since the last run, skipped: "
+                      f"{', '.join(result.skipped_stages)}\n")
+            if not args.quiet and result.ats:
+                print(f"ATS keyword score: {result.ats.before.score:.1f} -> "
+                      f"{result.ats.after.score:.1f} ({result.ats.delta:+.1f})\n")
+            report_trace(result.trace, args)
 
         # Format the output if we have content
         if reformatted_cv:
@@ -141,6 +268,8 @@ async def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        orchestrator.close()
 
 
 if __name__ == "__main__":
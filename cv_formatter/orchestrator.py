@@ -1,17 +1,23 @@
 """Orchestrator for managing the CV reformatting workflow."""
+import asyncio
 import warnings
 import logging
 import sys
-import io
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
-from typing import Optional
-from contextlib import redirect_stderr
+from typing import AsyncGenerator, Callable, Optional
+from contextlib import contextmanager
 
-from google.adk.agents import SequentialAgent, ParallelAgent, LlmAgent
+from google.adk.agents import SequentialAgent, ParallelAgent
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.events import Event, EventActions
+from google.adk.models.base_llm import BaseLlm
 from google.adk.models.google_llm import Gemini
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.adk.memory import InMemoryMemoryService
 from google.genai import types
 
 from cv_formatter.config import config
@@ -19,6 +25,7 @@ from cv_formatter.config import config
 # Suppress expected warnings from dependencies
 warnings.filterwarnings("ignore", message="pkg_resources is deprecated")
 warnings.filterwarnings("ignore", message=".*non-text parts in the response.*")
+warnings.filterwarnings("ignore", message="The `plugins` argument is deprecated")
 
 # Suppress verbose ADK logging
 logging.getLogger("google.adk").setLevel(logging.ERROR)
@@ -30,7 +37,25 @@ from cv_formatter.agents import (
     JDAgent,
     CompanyAgent,
     RewriteAgent,
+    AnalysisMemo,
+    get_analysis_memo,
+    CompanyCache,
+    get_company_cache,
+    StageReuse,
 )
+from cv_formatter.ats_score import ATSComparison, compare_cvs
+from cv_formatter.cache import content_key
+from cv_formatter.parsers import PDFParser, TextParser, shutdown_tika_pool
+from cv_formatter.parsers.pdf_parser import PARSER_VERSION as PDF_PARSER_VERSION
+from cv_formatter.process_pool import shutdown_process_pool
+from cv_formatter.scheduler import ModelScheduler, ScheduledModel
+from cv_formatter.sessions import (
+    BoundedMemoryService,
+    SqliteSessionService,
+    session_service_from_config,
+)
+from cv_formatter.structured import StructuredCV
+from cv_formatter.tracing import Trace, TracingPlugin, record_stage_skipped, span, tracing
 
 
 class _StderrFilter:
@@ -55,43 +80,179 @@ class _StderrFilter:
         return self.original_stderr.fileno()
 
 
+_stderr_lock = threading.Lock()
+_stderr_users = 0
+_stderr_original = None
+
+
+@contextmanager
+def _filtered_stderr():
+    """
+    Filter ADK warnings from stderr while any run is in progress.
+
+    Concurrent runs share one filter: it is installed by the first run to
+    start and removed by the last one to finish, so overlapping runs never
+    restore each other's stream.
+    """
+    global _stderr_users, _stderr_original
+    with _stderr_lock:
+        if _stderr_users == 0:
+            _stderr_original = sys.stderr
+            sys.stderr = _StderrFilter(_stderr_original)
+        _stderr_users += 1
+    try:
+        yield
+    finally:
+        with _stderr_lock:
+            _stderr_users -= 1
+            if _stderr_users == 0:
+                sys.stderr = _stderr_original
+                _stderr_original = None
+
+
+@dataclass
+class FormatResult:
+    """Reformatted CV and the trace of the run that produced it."""
+
+    cv: str
+    trace: Trace
+    ats: Optional[ATSComparison] = None
+
+    @cached_property
+    def structured(self) -> StructuredCV:
+        """The reformatted CV's sections, parsed and validated on first use."""
+        return StructuredCV.parse(self.cv)
+
+    @property
+    def skipped_stages(self) -> list[str]:
+        """Stages skipped because their inputs matched the previous run."""
+        return self.trace.skipped_stages
+
+
+@dataclass
+class StreamMetrics:
+    """Timing of a streamed run, filled in as chunks are yielded."""
+
+    ttfb_seconds: Optional[float] = None
+    total_seconds: Optional[float] = None
+    chunks: int = 0
+    chars: int = 0
+
+
 class CVFormatterOrchestrator:
     """Orchestrates the multi-agent CV reformatting workflow."""
 
-    def __init__(self):
-        """Initialize the orchestrator with all agents."""
+    def __init__(
+        self,
+        use_llm_parsers: Optional[bool] = None,
+        model_factory: Optional[Callable[[str], BaseLlm]] = None,
+        memo: Optional[AnalysisMemo] = None,
+        company_cache: Optional[CompanyCache] = None,
+        scheduler: Optional[ModelScheduler] = None,
+        reuse: Optional[StageReuse] = None,
+    ):
+        """
+        Initialize the orchestrator with all agents.
+
+        Args:
+            use_llm_parsers: Extract CV/JD text through the LLM parser agents
+                instead of reading the files directly (default: config value)
+            model_factory: Callable returning the model for a given agent name
+                (default: a Gemini model per agent)
+            memo: Memo for CV/JD analyses (default: the shared memo, if
+                enabled)
+            company_cache: Cache of company research (default: the shared
+                cache, if enabled)
+            scheduler: Scheduler all model calls go through (default: one
+                built from the configuration)
+            reuse: Store of the previous run's stage outputs, used to skip
+                stages whose inputs are unchanged (default: one built from
+                the configuration, if enabled)
+        """
+        if use_llm_parsers is None:
+            use_llm_parsers = config.use_llm_parsers
+        self.use_llm_parsers = use_llm_parsers
+        self.model_factory = model_factory
+        self.scheduler = scheduler or ModelScheduler.from_config()
+        self._gemini: Optional[Gemini] = None
+        self.memo = memo if memo is not None else get_analysis_memo()
+        self.company_cache = (
+            company_cache if company_cache is not None else get_company_cache()
+        )
+        self.reuse = reuse if reuse is not None else StageReuse.from_config()
+
+        # Direct ingestion readers, used when the parser agents are disabled
+        self.pdf_reader = PDFParser()
+        self.text_reader = TextParser()
+
         # Initialize all agent instances
-        self.pdf_parser = PDFParserAgent()
-        self.txt_parser = TxtParserAgent()
-        self.cv_agent = CVAgent()
-        self.jd_agent = JDAgent()
-        self.company_agent = CompanyAgent()
-        self.rewrite_agent = RewriteAgent()
-
-        # Create sequential workflows
-        self.cv_sequential = SequentialAgent(
-            name="CV_Sequential_Agent",
-            sub_agents=[
-                self.pdf_parser.get_agent(),
-                self.cv_agent.get_agent(),
-            ],
+        self.cv_agent = CVAgent(model=self._make_model("CV_Agent"), memo=self.memo)
+        self.jd_agent = JDAgent(model=self._make_model("JD_Agent"), memo=self.memo)
+        self.company_agent = CompanyAgent(
+            model=self._make_model("Company_Agent"), cache=self.company_cache
         )
+        self.rewrite_agent = RewriteAgent(model=self._make_model("Rewrite_Agent"))
+
+        # On a rerun, skip the stages whose inputs match the previous run's
+        if self.reuse is not None:
+            self.reuse.attach(self.cv_agent.get_agent(), "CV_text")
+            self.reuse.attach(self.jd_agent.get_agent(), "JD_text")
+            self.reuse.attach_company(self.company_agent.get_agent())
+            self.reuse.attach(
+                self.rewrite_agent.get_agent(),
+                "CV_text", "CV_context", "JD_context", "Company_context",
+                settings=self.rewrite_agent.settings,
+            )
 
-        self.jd_sequential = SequentialAgent(
-            name="JD_Sequential_Agent",
-            sub_agents=[
-                self.txt_parser.get_agent(),
+        if self.use_llm_parsers:
+            self.pdf_parser = PDFParserAgent(
+                model=self._make_model("PDF_Parser_Agent")
+            )
+            self.txt_parser = TxtParserAgent(
+                model=self._make_model("TxtFile_Parser_Agent")
+            )
+
+            # Create sequential workflows
+            cv_branch = SequentialAgent(
+                name="CV_Sequential_Agent",
+                sub_agents=[
+                    self.pdf_parser.get_agent(),
+                    self.cv_agent.get_agent(),
+                ],
+            )
+
+            # Company research needs only the JD text, so it starts as soon
+            # as the JD is read and runs alongside JD_Agent
+            jd_branch = SequentialAgent(
+                name="JD_Sequential_Agent",
+                sub_agents=[
+                    self.txt_parser.get_agent(),
+                    ParallelAgent(
+                        name="JD_Company_Parallel_Agent",
+                        sub_agents=[
+                            self.jd_agent.get_agent(),
+                            self.company_agent.get_agent(),
+                        ],
+                    ),
+                ],
+            )
+            branches = [cv_branch, jd_branch]
+        else:
+            # CV_text and JD_text are seeded into session state before the
+            # run, so the workflow starts directly at the analysis agents,
+            # company research included
+            self.pdf_parser = None
+            self.txt_parser = None
+            branches = [
+                self.cv_agent.get_agent(),
                 self.jd_agent.get_agent(),
-            ],
-        )
+                self.company_agent.get_agent(),
+            ]
 
-        # Create a parallel agent for CV and JD processing
+        # Analyze the CV and JD and research the company in parallel
         self.parallel_processing = ParallelAgent(
             name="Parallel_Processing_Agent",
-            sub_agents=[
-                self.cv_sequential,
-                self.jd_sequential,
-            ],
+            sub_agents=branches,
         )
 
         # Create the complete sequential workflow
@@ -99,40 +260,203 @@ class CVFormatterOrchestrator:
         self.root_agent = SequentialAgent(
             name="Complete_CV_Formatter_Workflow",
             sub_agents=[
-                self.parallel_processing,  # Process CV and JD in parallel
-                self.company_agent.get_agent(),  # Research company
+                self.parallel_processing,  # Analyses and company research
                 self.rewrite_agent.get_agent(),  # Generate reformatted CV
             ],
         )
 
-        # Create services
-        self.session_service = InMemorySessionService()
-        self.memory_service = InMemoryMemoryService()
+        # Create services, bounded so a long-running process does not keep
+        # every session's history
+        self.session_service = session_service_from_config()
+        self.memory_service = BoundedMemoryService.from_config()
 
-        # Create runner
+        # Create runner; the tracing plugin records runs made inside tracing()
         self.runner = Runner(
             agent=self.root_agent,
             app_name=config.app_name,
             session_service=self.session_service,
             memory_service=self.memory_service,
+            plugins=[TracingPlugin()],
         )
 
-    async def format_cv(
-        self,
-        cv_path: str | Path,
-        jd_path: str | Path,
-        session_id: str = "default",
-    ) -> str:
+    def cache_stats(self) -> dict:
         """
-        Format a CV based on a job description.
+        Report hit/miss counters of the caches used by the workflow.
+
+        Returns:
+            Mapping of cache name to its counters
+        """
+        stats = {}
+        if self.pdf_reader.cache is not None:
+            stats["text"] = self.pdf_reader.cache.stats.as_dict()
+        if self.memo is not None:
+            stats["analysis"] = self.memo.cache.stats.as_dict()
+        if self.company_cache is not None:
+            stats["company"] = self.company_cache.cache.stats.as_dict()
+        return stats
+
+    def scheduler_stats(self) -> dict:
+        """
+        Report queue depth, in-flight requests, retries and wait times of
+        model calls.
+
+        Returns:
+            Scheduler counters
+        """
+        return self.scheduler.stats.as_dict()
+
+    def session_stats(self) -> dict:
+        """
+        Report the size and evictions of the session store.
+
+        Returns:
+            Session store counters
+        """
+        return self.session_service.stats.as_dict()
+
+    def close(self) -> None:
+        """Release external resources such as the Tika server and process pools."""
+        if self.pdf_reader.pool is None:
+            shutdown_tika_pool()
+        shutdown_process_pool()
+        if isinstance(self.session_service, SqliteSessionService):
+            self.session_service.close()
+
+    async def __aenter__(self) -> "CVFormatterOrchestrator":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    async def _end_run(
+        self, session, ephemeral: bool, invocation_id: Optional[str]
+    ) -> None:
+        """
+        Release the run's cache claims, save its stage outputs and delete
+        its ephemeral session.
+        """
+        self._release_claims(invocation_id)
+        if self.reuse is not None:
+            await asyncio.to_thread(self.reuse.save)
+        self.session_service.unpin(session)
+        if ephemeral:
+            await self.session_service.delete_session(
+                app_name=config.app_name,
+                user_id=config.user_id,
+                session_id=session.id,
+            )
+
+    def _release_claims(self, invocation_id: Optional[str]) -> None:
+        """Wake up runs waiting on work this invocation did not finish."""
+        if not invocation_id:
+            return
+        if self.memo is not None:
+            self.memo.release(invocation_id)
+        if self.company_cache is not None:
+            self.company_cache.release(invocation_id)
+
+    def _make_model(self, agent_name: str) -> BaseLlm:
+        """Build the model for an agent, routed through the scheduler."""
+        if self.model_factory is None:
+            config.require_api_key()
+            # One Gemini instance, and so one warm API client, for all agents
+            if self._gemini is None:
+                self._gemini = Gemini(model=config.model_name)
+            model = self._gemini
+        else:
+            model = self.model_factory(agent_name)
+        return ScheduledModel(model, self.scheduler)
+
+    async def _read_inputs(self, cv_path: Path, jd_path: Path) -> dict:
+        """
+        Read the CV and JD files directly, bypassing the parser agents.
 
         Args:
             cv_path: Path to the CV PDF file
             jd_path: Path to the JD text file
+
+        Returns:
+            Initial session state with CV_text and JD_text
+        """
+        async def read(name, reader, path):
+            with span(name, "ingestion"):
+                return await reader(path)
+
+        async def extract_cv(path: Path) -> str:
+            if self.reuse is None:
+                return await self.pdf_reader.extract_text_async(path)
+            # Reuse the previous run's text if the CV file and the engine
+            # that extracted it are unchanged, as the text cache does
+            key = content_key(
+                "CV_Extraction",
+                PDF_PARSER_VERSION,
+                self.pdf_reader.engine.name,
+                await asyncio.to_thread(path.read_bytes),
+            )
+            text = self.reuse.get("CV_Extraction", key)
+            if text is not None:
+                record_stage_skipped()
+                return text
+            text = await self.pdf_reader.extract_text_async(path)
+            self.reuse.set("CV_Extraction", key, text)
+            return text
+
+        cv_text, jd_text = await asyncio.gather(
+            read("CV_Extraction", extract_cv, cv_path),
+            read("JD_Read", self.text_reader.read_file_async, jd_path),
+        )
+        return {"CV_text": cv_text, "JD_text": jd_text}
+
+    async def _prepare_session(self, session_id: str, state: Optional[dict] = None):
+        """
+        Create or get a session and write the initial state into it.
+
+        Args:
             session_id: Session identifier
+            state: State to seed before the workflow runs
 
         Returns:
-            Reformatted CV text
+            The prepared session
+        """
+        session = await self.session_service.get_session(
+            app_name=config.app_name,
+            user_id=config.user_id,
+            session_id=session_id,
+        )
+        if session is None:
+            session = await self.session_service.create_session(
+                app_name=config.app_name,
+                user_id=config.user_id,
+                session_id=session_id,
+            )
+
+        if state:
+            await self.session_service.append_event(
+                session,
+                Event(
+                    author="user",
+                    invocation_id=Event.new_id(),
+                    actions=EventActions(state_delta=state),
+                ),
+            )
+
+        # Keep the session from being evicted until the run ends
+        self.session_service.pin(session)
+        return session
+
+    async def _start_run(
+        self, cv_path: str | Path, jd_path: str | Path, session_id: Optional[str]
+    ) -> tuple:
+        """
+        Validate the inputs and prepare the session and query of a run.
+
+        Args:
+            cv_path: Path to the CV PDF file
+            jd_path: Path to the JD text file
+            session_id: Session identifier, or None for a new ephemeral session
+
+        Returns:
+            The prepared session and the query content
         """
         cv_path = Path(cv_path)
         jd_path = Path(jd_path)
@@ -146,102 +470,190 @@ class CVFormatterOrchestrator:
         # Create query
         query = f"CV at {cv_path.absolute()} ; JD at {jd_path.absolute()}"
 
-        # Create or get session
-        try:
-            session = await self.session_service.create_session(
-                app_name=config.app_name,
-                user_id=config.user_id,
-                session_id=session_id,
-            )
-        except:
-            session = await self.session_service.get_session(
-                app_name=config.app_name,
-                user_id=config.user_id,
-                session_id=session_id,
-            )
+        # Read the input files up front unless the parser agents do it
+        initial_state = None
+        if not self.use_llm_parsers:
+            initial_state = await self._read_inputs(cv_path, jd_path)
+
+        # Create or get session; each call gets its own unless one is named,
+        # so concurrent calls never share state keys
+        session = await self._prepare_session(
+            session_id or f"run-{uuid.uuid4().hex}", initial_state
+        )
 
         # Prepare query content
         query_content = types.Content(
             role="user", parts=[types.Part(text=query)]
         )
 
+        return session, query_content
+
+    async def format_cv(
+        self,
+        cv_path: str | Path,
+        jd_path: str | Path,
+        session_id: Optional[str] = None,
+    ) -> str:
+        """
+        Format a CV based on a job description.
+
+        Args:
+            cv_path: Path to the CV PDF file
+            jd_path: Path to the JD text file
+            session_id: Session to run in and keep afterwards (default: a
+                new session that is deleted when the call returns)
+
+        Returns:
+            Reformatted CV text
+        """
+        result = await self.format_cv_detailed(cv_path, jd_path, session_id)
+        return result.cv
+
+    async def format_cv_detailed(
+        self,
+        cv_path: str | Path,
+        jd_path: str | Path,
+        session_id: Optional[str] = None,
+    ) -> FormatResult:
+        """
+        Format a CV and trace each stage of the run.
+
+        The trace has one span per agent and input read, with timestamps,
+        model name, token counts, tool calls and cache hits.
+
+        Args:
+            cv_path: Path to the CV PDF file
+            jd_path: Path to the JD text file
+            session_id: Session to run in and keep afterwards (default: a
+                new session that is deleted when the call returns)
+
+        Returns:
+            Reformatted CV text, the trace of the run and, unless disabled,
+            the ATS keyword score of the CV before and after the rewrite
+        """
+        ats = None
+        with tracing(Trace()) as trace:
+            cv, inputs = await self._run(cv_path, jd_path, session_id)
+            if config.ats_score and inputs.get("CV_text"):
+                with span("ATS_Score", "scoring"):
+                    ats = compare_cvs(inputs["CV_text"], cv, inputs.get("JD_text"))
+        return FormatResult(cv, trace, ats)
+
+    async def _run(
+        self, cv_path: str | Path, jd_path: str | Path, session_id: Optional[str]
+    ) -> tuple[str, dict]:
+        """Run the workflow and return the reformatted CV text and the CV/JD text it read."""
+        session, query_content = await self._start_run(cv_path, jd_path, session_id)
+
         # Collect response - the last agent in the sequence (Rewrite_Agent) produces the final CV
         reformatted_cv = ""
-
-        # Temporarily replace stderr to filter ADK warnings
-        original_stderr = sys.stderr
-        sys.stderr = _StderrFilter(original_stderr)
+        invocation_id = None
+        # Seeded before the run, or extracted by the parser agents during it
+        inputs = {key: session.state.get(key) for key in ("CV_text", "JD_text")}
 
         try:
-            async for event in self.runner.run_async(
-                user_id=config.user_id,
-                session_id=session.id,
-                new_message=query_content,
-            ):
-                # Collect all final responses, the last one will be from Rewrite_Agent
-                if event.is_final_response() and event.content and event.content.parts:
-                    # Extract only text parts, filtering out function_call parts
-                    text_parts = [part.text for part in event.content.parts if hasattr(part, 'text') and part.text]
-                    if text_parts:
-                        text = "".join(text_parts)
-                        if text != "None":
-                            # Keep updating - the last response is from Rewrite_Agent
-                            reformatted_cv = text
+            # Filter ADK warnings from stderr while the workflow runs
+            with _filtered_stderr():
+                async for event in self.runner.run_async(
+                    user_id=config.user_id,
+                    session_id=session.id,
+                    new_message=query_content,
+                ):
+                    invocation_id = event.invocation_id
+                    delta = event.actions.state_delta if event.actions else None
+                    if delta:
+                        inputs.update((key, delta[key]) for key in inputs if key in delta)
+
+                    # Collect all final responses, the last one will be from Rewrite_Agent
+                    if event.is_final_response() and event.content and event.content.parts:
+                        # Extract only text parts, filtering out function_call parts
+                        text_parts = [part.text for part in event.content.parts if hasattr(part, 'text') and part.text]
+                        if text_parts:
+                            text = "".join(text_parts)
+                            if text != "None":
+                                # Keep updating - the last response is from Rewrite_Agent
+                                reformatted_cv = text
         finally:
-            # Restore original stderr
-            sys.stderr = original_stderr
+            await self._end_run(session, session_id is None, invocation_id)
 
         if not reformatted_cv:
             raise RuntimeError(
                 "No reformatted CV was generated. The workflow may not have completed all steps."
             )
 
-        return reformatted_cv
+        return reformatted_cv, inputs
 
-    async def format_cv_debug(
+    async def format_cv_stream(
         self,
         cv_path: str | Path,
         jd_path: str | Path,
-        session_id: str = "default",
-    ) -> None:
+        session_id: Optional[str] = None,
+        metrics: Optional[StreamMetrics] = None,
+    ) -> AsyncGenerator[str, None]:
         """
-        Format a CV with debug output.
+        Format a CV, yielding Rewrite_Agent's text as it is generated.
+
+        The earlier agents run as usual; once Rewrite_Agent starts, its
+        partial responses are yielded as they arrive. Models that do not
+        stream yield the whole CV as a single chunk.
 
         Args:
             cv_path: Path to the CV PDF file
             jd_path: Path to the JD text file
-            session_id: Session identifier
-        """
-        cv_path = Path(cv_path)
-        jd_path = Path(jd_path)
-
-        # Validate paths
-        if not cv_path.exists():
-            raise FileNotFoundError(f"CV file not found: {cv_path}")
-        if not jd_path.exists():
-            raise FileNotFoundError(f"JD file not found: {jd_path}")
-
-        # Create query
-        query = f"CV at {cv_path.absolute()} ; JD at {jd_path.absolute()}"
+            session_id: Session to run in and keep afterwards (default: a
+                new session that is deleted when the call returns)
+            metrics: Filled in with time-to-first-byte, total time and chunk
+                counts while streaming
 
-        print(f"\n{'='*80}")
-        print(f"CV Formatter - Debug Mode")
-        print(f"{'='*80}")
-        print(f"CV Path: {cv_path.absolute()}")
-        print(f"JD Path: {jd_path.absolute()}")
-        print(f"{'='*80}\n")
+        Yields:
+            Chunks of the reformatted CV text
+        """
+        metrics = metrics if metrics is not None else StreamMetrics()
+        start = time.perf_counter()
+        session, query_content = await self._start_run(cv_path, jd_path, session_id)
 
-        # Temporarily replace stderr to filter ADK warnings
-        original_stderr = sys.stderr
-        sys.stderr = _StderrFilter(original_stderr)
+        # The section-parallel rewrite hands short CVs to its single-shot agent
+        rewrite_agent = self.rewrite_agent.get_agent()
+        rewrite_authors = {rewrite_agent.name, *(agent.name for agent in rewrite_agent.sub_agents)}
+        streamed_turn = False
+        invocation_id = None
 
         try:
-            # Use runner's debug method
-            await self.runner.run_debug(
-                user_messages=query,
-                user_id=config.user_id,
-                session_id=session_id,
-            )
+            # Filter ADK warnings from stderr while the workflow runs
+            with _filtered_stderr():
+                async for event in self.runner.run_async(
+                    user_id=config.user_id,
+                    session_id=session.id,
+                    new_message=query_content,
+                    run_config=RunConfig(streaming_mode=StreamingMode.SSE),
+                ):
+                    invocation_id = event.invocation_id
+                    if event.author not in rewrite_authors or not (event.content and event.content.parts):
+                        continue
+
+                    text = "".join(
+                        part.text for part in event.content.parts if part.text and not part.thought
+                    )
+                    if event.partial:
+                        streamed_turn = True
+                    elif streamed_turn:
+                        # Aggregate of the partial chunks already yielded
+                        streamed_turn = False
+                        continue
+                    elif text == "None":
+                        continue
+
+                    if text:
+                        if metrics.ttfb_seconds is None:
+                            metrics.ttfb_seconds = time.perf_counter() - start
+                        metrics.chunks += 1
+                        metrics.chars += len(text)
+                        yield text
         finally:
-            # Restore original stderr
-            sys.stderr = original_stderr
+            await self._end_run(session, session_id is None, invocation_id)
+            metrics.total_seconds = time.perf_counter() - start
+
+        if not metrics.chunks:
+            raise RuntimeError(
+                "No reformatted CV was generated. The workflow may not have completed all steps."
+            )
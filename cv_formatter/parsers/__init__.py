@@ -1,5 +1,27 @@
 """File parsing utilities."""
-from .pdf_parser import PDFParser
-from .text_parser import TextParser
+import importlib
 
-__all__ = ["PDFParser", "TextParser"]
+# Public name -> submodule defining it
+_EXPORTS = {
+    "PDFBackend": "pdf_backends",
+    "PDFMinerBackend": "pdf_backends",
+    "TikaBackend": "pdf_backends",
+    "create_backend": "pdf_backends",
+    "clean_text": "normalize",
+    "normalize_pdf_text": "normalize",
+    "PDFParser": "pdf_parser",
+    "TextParser": "text_parser",
+    "TikaServerPool": "tika_pool",
+    "get_tika_pool": "tika_pool",
+    "shutdown_tika_pool": "tika_pool",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    # The parsers pull in google.adk through tracing; import submodules on
+    # first use so process pool workers running the normalizers stay light
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
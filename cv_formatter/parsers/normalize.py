@@ -0,0 +1,57 @@
+"""
+Text normalization for extracted CV and JD text.
+
+Kept free of heavy imports: these functions run in process pool workers.
+"""
+import re
+
+
+def normalize_pdf_text(raw: str) -> str:
+    """
+    Normalize raw extracted PDF text.
+
+    Args:
+        raw: Raw text from an extraction engine
+
+    Returns:
+        Text with leading whitespace removed and trailing spaces stripped
+        from every line
+    """
+    # Remove leading whitespace/newlines
+    text = re.sub(r"^\s+", "", raw)
+
+    # Normalize trailing spaces on each line
+    return "\n".join(line.rstrip() for line in text.splitlines())
+
+
+def clean_text(data: bytes, encoding: str = "utf-8") -> str:
+    """
+    Decode and clean the content of a plain text file.
+
+    Performs:
+    - BOM stripping
+    - Line ending normalization
+    - Whitespace cleanup
+
+    Args:
+        data: Raw file content
+        encoding: File encoding (default: utf-8)
+
+    Returns:
+        Cleaned text content
+    """
+    # Decode raw text
+    text = data.decode(encoding, errors="replace")
+
+    # Strip Unicode BOM (Byte Order Mark)
+    if text.startswith("\ufeff"):
+        text = text.lstrip("\ufeff")
+
+    # Normalize line endings to '\n'
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+    # Clean trailing whitespace on each line
+    text = "\n".join(line.rstrip() for line in text.split("\n"))
+
+    # Remove excessive blank lines at beginning and end
+    return text.strip()
@@ -0,0 +1,101 @@
+"""Pluggable PDF text extraction engines."""
+import io
+import logging
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional
+
+from .tika_pool import TikaServerPool, get_tika_pool
+
+
+class PDFBackend(ABC):
+    """Interface for PDF text extraction engines."""
+
+    name: str = ""
+    # In-process engines parse the PDF themselves and are run in the
+    # process pool by async callers; the others wait on I/O
+    cpu_bound: bool = False
+
+    @abstractmethod
+    def extract_raw(self, pdf_path: Path) -> str:
+        """
+        Extract raw, unnormalized text from a PDF.
+
+        Args:
+            pdf_path: Path to the PDF file
+
+        Returns:
+            Raw text content
+        """
+
+
+class TikaBackend(PDFBackend):
+    """Apache Tika engine backed by the managed server pool."""
+
+    name = "tika"
+
+    def __init__(self, pool: Optional[TikaServerPool] = None):
+        """
+        Initialize the Tika engine.
+
+        Args:
+            pool: Tika server pool to use (default: the shared pool)
+        """
+        self.pool = pool
+
+    def extract_raw(self, pdf_path: Path) -> str:
+        pool = self.pool or get_tika_pool()
+        return pool.extract_text(pdf_path)
+
+
+class PDFMinerBackend(PDFBackend):
+    """In-process engine using pdfminer.six; needs no JVM or server."""
+
+    name = "pdfminer"
+    cpu_bound = True
+
+    def __init__(self):
+        """Initialize the pdfminer engine."""
+        # pdfminer logs a warning for every malformed object it skips
+        logging.getLogger("pdfminer").setLevel(logging.ERROR)
+
+    def extract_raw(self, pdf_path: Path) -> str:
+        try:
+            from pdfminer.high_level import extract_text
+        except ImportError as e:
+            raise RuntimeError(
+                "The pdfminer engine requires pdfminer.six "
+                "(pip install 'CVFormatter[pdfminer]')"
+            ) from e
+
+        # Read the file once so pdfminer parses from memory
+        return extract_text(io.BytesIO(pdf_path.read_bytes()))
+
+
+BACKENDS = {
+    TikaBackend.name: TikaBackend,
+    PDFMinerBackend.name: PDFMinerBackend,
+}
+
+
+def create_backend(name: str, pool: Optional[TikaServerPool] = None) -> PDFBackend:
+    """
+    Create a PDF engine by name.
+
+    Args:
+        name: Engine name (tika or pdfminer)
+        pool: Tika server pool for the tika engine
+
+    Returns:
+        The engine instance
+
+    Raises:
+        ValueError: If the engine name is unknown
+    """
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unknown PDF engine: {name}. Choose one of: {', '.join(BACKENDS)}"
+        )
+    if name == TikaBackend.name:
+        return TikaBackend(pool)
+    return BACKENDS[name]()
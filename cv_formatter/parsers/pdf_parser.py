@@ -1,22 +1,56 @@
-"""PDF parsing utilities using Apache Tika."""
+"""PDF parsing utilities with pluggable extraction engines."""
+import asyncio
 import logging
-import re
 from pathlib import Path
-from tika import parser
+from typing import Optional
+
+from cv_formatter.cache import TieredCache, content_key, get_text_cache
+from cv_formatter.config import config
+from cv_formatter.process_pool import run_cpu_bound
+from cv_formatter.tracing import record_cache_hit
+from .normalize import normalize_pdf_text
+from .pdf_backends import PDFBackend, TikaBackend, create_backend
+from .tika_pool import TikaServerPool
+
+# Bump when extraction or normalization changes so cached text is refreshed
+PARSER_VERSION = "1"
 
 
 class PDFParser:
-    """PDF parser using Apache Tika."""
+    """PDF parser using a configurable engine with Apache Tika as fallback."""
+
+    def __init__(
+        self,
+        pool: Optional[TikaServerPool] = None,
+        engine: Optional[str] = None,
+        cache: Optional[TieredCache] = None,
+    ):
+        """
+        Initialize PDF parser with logging configuration.
 
-    def __init__(self):
-        """Initialize PDF parser with logging configuration."""
+        Args:
+            pool: Tika server pool to use (default: the shared pool)
+            engine: Extraction engine name (default: config.pdf_engine)
+            cache: Extracted-text cache (default: the shared text cache)
+        """
         # Silence Tika logs
         logging.getLogger('tika').setLevel(logging.ERROR)
         logging.getLogger('tika.tika').setLevel(logging.ERROR)
 
+        self.pool = pool
+        self.engine: PDFBackend = create_backend(engine or config.pdf_engine, pool)
+        self.fallback: Optional[PDFBackend] = (
+            None if isinstance(self.engine, TikaBackend) else TikaBackend(pool)
+        )
+        self.cache = cache if cache is not None else get_text_cache()
+
     def extract_text(self, pdf_path: str | Path) -> str:
         """
-        Extract clean text from a PDF using Apache Tika.
+        Extract clean text from a PDF.
+
+        The configured engine is tried first; if it fails or finds no text
+        (e.g. scanned or unusual PDFs), extraction falls back to Tika.
+        Results are cached by file content, so repeated CVs skip extraction.
 
         Args:
             pdf_path: Path to the PDF file
@@ -29,25 +63,85 @@ class PDFParser:
             RuntimeError: If extraction fails
         """
         pdf_path = Path(pdf_path)
+        key, cached = self._lookup(pdf_path)
+        if cached is not None:
+            record_cache_hit()
+            return cached
 
-        if not pdf_path.exists():
-            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+        text = normalize_pdf_text(self._extract_raw(pdf_path))
+        if key is not None:
+            self.cache.set(key, text)
+        return text
+
+    async def extract_text_async(self, pdf_path: str | Path) -> str:
+        """
+        Extract clean text from a PDF without blocking the event loop.
+
+        Same as extract_text, but CPU-bound work (in-process engines and
+        normalization) runs in the shared process pool and I/O in threads.
+
+        Args:
+            pdf_path: Path to the PDF file
+
+        Returns:
+            Cleaned and normalized text content
+
+        Raises:
+            FileNotFoundError: If PDF file doesn't exist
+            RuntimeError: If extraction fails
+        """
+        pdf_path = Path(pdf_path)
+        key, cached = await asyncio.to_thread(self._lookup, pdf_path)
+        if cached is not None:
+            record_cache_hit()
+            return cached
 
         try:
-            # Extract raw text
-            parsed = parser.from_file(str(pdf_path))
-            raw = parsed.get("content", "")
+            if self.engine.cpu_bound:
+                raw = await run_cpu_bound(self.engine.extract_raw, pdf_path)
+            else:
+                raw = await asyncio.to_thread(self.engine.extract_raw, pdf_path)
+            self._check_found(raw)
+        except Exception as e:
+            raw = await asyncio.to_thread(self._fallback_raw, pdf_path, e)
 
-            if raw is None:
-                return ""
+        text = await run_cpu_bound(normalize_pdf_text, raw)
+        if key is not None:
+            await asyncio.to_thread(self.cache.set, key, text)
+        return text
 
-            # Remove leading whitespace/newlines
-            text = re.sub(r"^\s+", "", raw)
+    def _lookup(self, pdf_path: Path) -> tuple[Optional[str], Optional[str]]:
+        """Return the cache key of a PDF and its cached text, if any."""
+        if not pdf_path.exists():
+            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+        if self.cache is None:
+            return None, None
+        key = content_key("pdf", PARSER_VERSION, self.engine.name, pdf_path.read_bytes())
+        return key, self.cache.get(key)
 
-            # Normalize trailing spaces on each line
-            text = "\n".join(line.rstrip() for line in text.splitlines())
+    def _extract_raw(self, pdf_path: Path) -> str:
+        """Extract raw text with the engine, falling back to Tika."""
+        try:
+            raw = self.engine.extract_raw(pdf_path)
+            self._check_found(raw)
+        except Exception as e:
+            raw = self._fallback_raw(pdf_path, e)
+        return raw
 
-            return text
+    def _check_found(self, raw: str) -> None:
+        """Treat an engine finding no text as a failure when Tika can retry."""
+        if self.fallback is not None and not raw.strip():
+            raise RuntimeError(f"{self.engine.name} engine found no text")
 
+    def _fallback_raw(self, pdf_path: Path, error: Exception) -> str:
+        """Extract raw text with Tika after the engine failed with `error`."""
+        if self.fallback is None:
+            raise RuntimeError(f"Failed to extract text from PDF: {error}") from error
+        logging.getLogger(__name__).info(
+            "%s engine failed on %s (%s); falling back to tika",
+            self.engine.name, pdf_path, error,
+        )
+        try:
+            return self.fallback.extract_raw(pdf_path)
         except Exception as e:
             raise RuntimeError(f"Failed to extract text from PDF: {e}") from e
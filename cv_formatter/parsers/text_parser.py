@@ -1,10 +1,29 @@
 """Text file parsing utilities."""
+import asyncio
 from pathlib import Path
+from typing import Optional
+
+from cv_formatter.cache import TieredCache, content_key, get_text_cache
+from cv_formatter.process_pool import run_cpu_bound
+from cv_formatter.tracing import record_cache_hit
+from .normalize import clean_text
+
+# Bump when cleaning changes so cached text is refreshed
+PARSER_VERSION = "1"
 
 
 class TextParser:
     """Plain text file parser."""
 
+    def __init__(self, cache: Optional[TieredCache] = None):
+        """
+        Initialize the text parser.
+
+        Args:
+            cache: Extracted-text cache (default: the shared text cache)
+        """
+        self.cache = cache if cache is not None else get_text_cache()
+
     def read_file(self, file_path: str | Path, encoding: str = "utf-8") -> str:
         """
         Read a plain text file with proper cleaning.
@@ -14,6 +33,8 @@ class TextParser:
         - Line ending normalization
         - Whitespace cleanup
 
+        Results are cached by file content and encoding.
+
         Args:
             file_path: Path to the text file
             encoding: File encoding (default: utf-8)
@@ -26,29 +47,64 @@ class TextParser:
             RuntimeError: If reading fails
         """
         file_path = Path(file_path)
-
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
+        key, data, cached = self._lookup(file_path, encoding)
+        if cached is not None:
+            record_cache_hit()
+            return cached
 
         try:
-            # Read raw text
-            with open(file_path, "r", encoding=encoding, errors="replace") as f:
-                text = f.read()
+            text = clean_text(data, encoding)
+        except Exception as e:
+            raise RuntimeError(f"Failed to read text file: {e}") from e
+
+        if key is not None:
+            self.cache.set(key, text)
+        return text
 
-            # Strip Unicode BOM (Byte Order Mark)
-            if text.startswith("\ufeff"):
-                text = text.lstrip("\ufeff")
+    async def read_file_async(self, file_path: str | Path, encoding: str = "utf-8") -> str:
+        """
+        Read and clean a text file without blocking the event loop.
 
-            # Normalize line endings to '\n'
-            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        Same as read_file, but the cleaning runs in the shared process pool
+        and file and cache access in threads.
 
-            # Clean trailing whitespace on each line
-            text = "\n".join(line.rstrip() for line in text.split("\n"))
+        Args:
+            file_path: Path to the text file
+            encoding: File encoding (default: utf-8)
 
-            # Remove excessive blank lines at beginning and end
-            text = text.strip()
+        Returns:
+            Cleaned text content
 
-            return text
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            RuntimeError: If reading fails
+        """
+        file_path = Path(file_path)
+        key, data, cached = await asyncio.to_thread(self._lookup, file_path, encoding)
+        if cached is not None:
+            record_cache_hit()
+            return cached
 
+        try:
+            text = await run_cpu_bound(clean_text, data, encoding)
         except Exception as e:
             raise RuntimeError(f"Failed to read text file: {e}") from e
+
+        if key is not None:
+            await asyncio.to_thread(self.cache.set, key, text)
+        return text
+
+    def _lookup(
+        self, file_path: Path, encoding: str
+    ) -> tuple[Optional[str], bytes, Optional[str]]:
+        """Read a file and return its cache key, content and cached text."""
+        if not file_path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+        try:
+            data = file_path.read_bytes()
+        except OSError as e:
+            raise RuntimeError(f"Failed to read text file: {e}") from e
+        if self.cache is None:
+            return None, data, None
+        key = content_key("text", PARSER_VERSION, encoding, data)
+        return key, data, self.cache.get(key)
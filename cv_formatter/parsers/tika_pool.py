@@ -0,0 +1,358 @@
+"""Managed pool of Apache Tika servers for PDF text extraction."""
+import atexit
+import http.client
+import logging
+import os
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+
+from cv_formatter.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class TikaServer:
+    """A single Tika server endpoint, optionally backed by a managed process."""
+
+    def __init__(self, endpoint: str, command: Optional[list[str]] = None):
+        """
+        Initialize a Tika server handle.
+
+        Args:
+            endpoint: Base URL of the server (e.g. http://127.0.0.1:9998)
+            command: Command that starts the server, or None if it is
+                managed externally
+        """
+        self.endpoint = endpoint.rstrip("/")
+        self.command = command
+        self.process: Optional[subprocess.Popen] = None
+        self.in_flight = 0
+        self.served = 0
+        # Bumped on every restart, so requests that failed on the same run
+        # of the server restart it only once
+        self.restarts = 0
+
+        url = urlparse(self.endpoint)
+        self._host = url.hostname or "127.0.0.1"
+        self._port = url.port or 9998
+        self._idle: list[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self._restart_lock = threading.Lock()
+
+    @property
+    def is_managed(self) -> bool:
+        """Whether this pool started the server process."""
+        return self.command is not None
+
+    def start(self) -> None:
+        """Start the server process if it is managed and not running."""
+        if not self.is_managed or (self.process and self.process.poll() is None):
+            return
+        self.process = subprocess.Popen(
+            self.command,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Close idle connections and stop the server process if managed."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self.process = None
+
+    def is_healthy(self, timeout: float = 2.0) -> bool:
+        """Check that the server answers its status endpoint."""
+        if self.is_managed and (self.process is None or self.process.poll() is not None):
+            return False
+        conn = http.client.HTTPConnection(self._host, self._port, timeout=timeout)
+        try:
+            conn.request("GET", "/tika")
+            response = conn.getresponse()
+            response.read()
+            return response.status == 200
+        except OSError:
+            return False
+        finally:
+            conn.close()
+
+    def wait_until_healthy(self, timeout: float) -> None:
+        """
+        Block until the server is healthy.
+
+        Raises:
+            RuntimeError: If the server is not healthy within the timeout
+        """
+        deadline = time.monotonic() + timeout
+        while not self.is_healthy():
+            if self.is_managed and self.process and self.process.poll() is not None:
+                raise RuntimeError(f"Tika server at {self.endpoint} exited during startup")
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Tika server at {self.endpoint} did not become healthy")
+            time.sleep(0.25)
+
+    @staticmethod
+    def _put(conn: http.client.HTTPConnection, data: bytes) -> tuple[http.client.HTTPResponse, bytes]:
+        """Send a document over a connection and read the response."""
+        conn.request(
+            "PUT",
+            "/tika",
+            body=data,
+            headers={"Accept": "text/plain", "Content-Type": "application/pdf"},
+        )
+        response = conn.getresponse()
+        return response, response.read()
+
+    def extract(self, data: bytes, timeout: float) -> str:
+        """
+        Send a document to the server and return its plain text.
+
+        Args:
+            data: Raw document bytes
+            timeout: Request timeout in seconds
+
+        Returns:
+            Extracted text
+
+        Raises:
+            RuntimeError: If the server returns an error status
+            OSError: If the connection fails
+        """
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+
+        try:
+            if conn is not None:
+                try:
+                    response, body = self._put(conn, data)
+                except ConnectionError:
+                    # The server may have closed the idle connection (its
+                    # keep-alive timeout): retry once on a fresh one rather
+                    # than fail the server
+                    conn.close()
+                    conn = None
+            if conn is None:
+                conn = http.client.HTTPConnection(self._host, self._port, timeout=timeout)
+                response, body = self._put(conn, data)
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            raise
+
+        # Keep the connection for the next request
+        with self._lock:
+            self._idle.append(conn)
+
+        if response.status != 200:
+            raise RuntimeError(f"Tika server returned HTTP {response.status}")
+        return body.decode("utf-8", errors="replace")
+
+
+class TikaServerPool:
+    """Pool of long-lived Tika servers shared across extractions."""
+
+    def __init__(
+        self,
+        size: int = 1,
+        endpoints: Optional[list[str]] = None,
+        base_port: int = 9990,
+        jar_path: Optional[str | Path] = None,
+        startup_timeout: float = 60.0,
+        request_timeout: float = 120.0,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            size: Number of server processes to start
+            endpoints: Externally managed server URLs; when given, no
+                processes are started and `size` is ignored
+            base_port: Port of the first managed server
+            jar_path: Path to tika-server.jar (default: tika's download path)
+            startup_timeout: Seconds to wait for each server to become healthy
+            request_timeout: Seconds to wait for a single extraction
+        """
+        self.startup_timeout = startup_timeout
+        self.request_timeout = request_timeout
+        self._lock = threading.Lock()
+        self._started = False
+
+        if endpoints:
+            self.servers = [TikaServer(endpoint) for endpoint in endpoints]
+        else:
+            jar = self._resolve_jar(jar_path)
+            self.servers = [
+                TikaServer(f"http://127.0.0.1:{port}", self._server_command(jar, port))
+                for port in range(base_port, base_port + max(size, 1))
+            ]
+
+    @staticmethod
+    def _resolve_jar(jar_path: Optional[str | Path]) -> str:
+        """Return the Tika server jar, downloading it the way tika-python does."""
+        from tika import tika
+
+        if jar_path:
+            return str(jar_path)
+        jar = os.path.join(tika.TikaJarPath, "tika-server.jar")
+        if not os.path.isfile(jar):
+            tika.getRemoteJar(tika.TikaServerJar, jar)
+        return jar
+
+    @staticmethod
+    def _server_command(jar: str, port: int) -> list[str]:
+        """Build the command line for one managed server."""
+        from tika import tika
+
+        return [
+            tika.TikaJava,
+            *tika.TikaJavaArgs.split(),
+            "-cp",
+            jar,
+            "org.apache.tika.server.core.TikaServerCli",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+        ]
+
+    @property
+    def endpoints(self) -> list[str]:
+        """Endpoints of all servers in the pool."""
+        return [server.endpoint for server in self.servers]
+
+    def start(self) -> None:
+        """Start all servers and wait until they are healthy."""
+        with self._lock:
+            if self._started:
+                return
+            for server in self.servers:
+                server.start()
+            for server in self.servers:
+                server.wait_until_healthy(self.startup_timeout)
+            self._started = True
+
+    def close(self) -> None:
+        """Stop all managed servers and drop pooled connections."""
+        with self._lock:
+            for server in self.servers:
+                server.stop()
+            self._started = False
+
+    def __enter__(self) -> "TikaServerPool":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _acquire(self, exclude: set) -> Optional[TikaServer]:
+        """Pick the least busy server not in `exclude`, rotating on ties."""
+        with self._lock:
+            candidates = [s for s in self.servers if s.endpoint not in exclude]
+            if not candidates:
+                return None
+            server = min(candidates, key=lambda s: (s.in_flight, s.served))
+            server.in_flight += 1
+            server.served += 1
+            return server
+
+    def _release(self, server: TikaServer) -> None:
+        with self._lock:
+            server.in_flight -= 1
+
+    def _recover(self, server: TikaServer, restarts: int) -> None:
+        """
+        Restart a managed server that stopped answering.
+
+        Concurrent failures on the same server are serialized: the first
+        one restarts it and the others wait for it, then return without
+        restarting the fresh process.
+
+        Args:
+            server: Server a request failed on
+            restarts: The server's restart count when the request was sent
+        """
+        if not server.is_managed:
+            return
+        with server._restart_lock:
+            if server.restarts != restarts or server.is_healthy():
+                return
+            logger.warning("Restarting unhealthy Tika server at %s", server.endpoint)
+            server.stop()
+            server.start()
+            server.restarts += 1
+            server.wait_until_healthy(self.startup_timeout)
+
+    def extract_text(self, pdf_path: str | Path) -> str:
+        """
+        Extract raw text from a document using the least busy server.
+
+        Args:
+            pdf_path: Path to the document
+
+        Returns:
+            Raw extracted text
+
+        Raises:
+            RuntimeError: If every server fails to extract the document
+        """
+        self.start()
+        data = Path(pdf_path).read_bytes()
+
+        tried: set = set()
+        last_error: Optional[Exception] = None
+        while (server := self._acquire(tried)) is not None:
+            tried.add(server.endpoint)
+            restarts = server.restarts
+            try:
+                return server.extract(data, self.request_timeout)
+            except (OSError, http.client.HTTPException, RuntimeError) as e:
+                last_error = e
+                logger.warning("Tika server at %s failed: %s", server.endpoint, e)
+            finally:
+                self._release(server)
+            self._recover(server, restarts)
+
+        raise RuntimeError(f"All Tika servers failed: {last_error}")
+
+
+_shared_pool: Optional[TikaServerPool] = None
+_shared_lock = threading.Lock()
+
+
+def get_tika_pool() -> TikaServerPool:
+    """Return the process-wide Tika pool, creating it from config on first use."""
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = TikaServerPool(
+                size=config.tika_pool_size,
+                endpoints=config.tika_server_endpoints,
+                base_port=config.tika_base_port,
+            )
+        return _shared_pool
+
+
+def shutdown_tika_pool() -> None:
+    """Stop the process-wide Tika pool if it was created."""
+    global _shared_pool
+    with _shared_lock:
+        pool, _shared_pool = _shared_pool, None
+    if pool is not None:
+        pool.close()
+
+
+atexit.register(shutdown_tika_pool)
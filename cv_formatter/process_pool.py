@@ -0,0 +1,78 @@
+"""Shared process pool for CPU-bound stages: PDF extraction, normalization, formatting."""
+import asyncio
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Callable, Optional, TypeVar
+
+from cv_formatter.config import config
+
+T = TypeVar("T")
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Return the shared process pool, started on first use.
+
+    Returns:
+        The pool, or None if CPU_WORKERS is 0
+    """
+    global _pool
+    if config.cpu_workers <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # Spawned workers don't inherit the parent's threads, Tika servers
+            # or event loop; they only import the modules of the functions run
+            _pool = ProcessPoolExecutor(
+                max_workers=config.cpu_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def shutdown_process_pool() -> None:
+    """Stop the shared process pool, if it was started."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(shutdown_process_pool)
+
+
+async def run_cpu_bound(func: Callable[..., T], *args) -> T:
+    """
+    Run a CPU-bound function without blocking the event loop.
+
+    The function runs in the shared process pool, or in a worker thread if
+    the pool is disabled. It and its arguments must be picklable, so use
+    module-level functions.
+
+    Args:
+        func: Function to run
+        args: Positional arguments for the function
+
+    Returns:
+        The function's result
+    """
+    global _pool
+    pool = get_process_pool()
+    if pool is None:
+        return await asyncio.to_thread(func, *args)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, partial(func, *args))
+    except BrokenProcessPool:
+        # A worker died; start a fresh pool for the next call
+        with _pool_lock:
+            if _pool is pool:
+                _pool = None
+        raise
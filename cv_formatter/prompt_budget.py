@@ -0,0 +1,277 @@
+"""Token-budgeted assembly of the context slots interpolated into a prompt."""
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+# Slots trimmed first when a prompt is over budget; CV_text comes last since
+# it is the only complete record of the candidate
+TRIM_ORDER = ("Company_context", "CV_context", "JD_context", "CV_text")
+
+# Tokens a slot keeps however far over budget the prompt is
+MIN_SLOT_TOKENS = {"Company_context": 200, "CV_context": 500, "JD_context": 500}
+
+# Lines shorter than this are kept even if CV_text repeats them, so short
+# items such as "Python" stay in the analysis
+MIN_DEDUPE_CHARS = 24
+
+TRIMMED_MARKER = "[... trimmed to fit the prompt budget]"
+
+_HEADING_WORDS = {
+    "summary", "profile", "objective", "skills", "expertise", "experience",
+    "employment", "education", "qualifications", "publications", "papers",
+    "research", "projects", "certifications", "certificates", "awards",
+    "honors", "honours", "achievements", "languages", "interests",
+    "references", "teaching", "conferences", "presentations", "talks",
+    "grants", "patents", "activities", "courses", "coursework", "volunteer",
+    "leadership", "memberships", "positions", "history",
+}
+_BULLET_RE = re.compile(r"^[\s\-•*·–]+")
+_ENTRY_RE = re.compile(r"[\d,;()\[\]|@]")
+
+
+def count_tokens(text: str) -> int:
+    """Rough size of text in tokens (about four characters per token)."""
+    return len(text) // 4 + 1 if text else 0
+
+
+def _normalize_line(line: str) -> str:
+    return " ".join(_BULLET_RE.sub("", line).lower().split())
+
+
+def is_section_heading(line: str) -> bool:
+    """
+    Tell whether a CV line is a section heading.
+
+    Headings are short capitalized lines without trailing punctuation that
+    name a usual CV section ("PUBLICATIONS", "Academic Qualifications").
+    Lines with digits, commas, brackets or separators are entries such as
+    "Research Engineer, Meta (2019-2022)", whatever words they contain, and
+    a heading not in CAPS ends in its section word, unlike the job title
+    "Research Scientist".
+    """
+    text = line.strip().rstrip(":").strip()
+    if not text or len(text) > 60 or len(text.split()) > 6 or text[-1] in ".,;":
+        return False
+    if _ENTRY_RE.search(text):
+        return False
+    words = re.findall(r"[a-z]+", text.lower())
+    if not text[0].isupper() or not words:
+        return False
+    if text.isupper():
+        return any(word in _HEADING_WORDS for word in words)
+    return words[-1] in _HEADING_WORDS
+
+
+def split_sections(text: str) -> list[list[str]]:
+    """
+    Split CV text into sections of lines, each starting at its heading.
+
+    Lines before the first heading (name, contact details) form their own
+    section. Blank lines are dropped.
+    """
+    sections: list[list[str]] = [[]]
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        if is_section_heading(line) and sections[-1]:
+            sections.append([])
+        sections[-1].append(line)
+    return [section for section in sections if section]
+
+
+def dedupe_lines(text: str, reference: str) -> tuple[str, int]:
+    """
+    Drop lines of `text` that `reference` already contains.
+
+    Lines are compared ignoring case, bullets and spacing.
+
+    Returns:
+        The remaining text and the number of lines dropped
+    """
+    known = {_normalize_line(line) for line in reference.splitlines()}
+    kept, dropped = [], 0
+    for line in text.splitlines():
+        normalized = _normalize_line(line)
+        if len(normalized) >= MIN_DEDUPE_CHARS and normalized in known:
+            dropped += 1
+        else:
+            kept.append(line)
+    return "\n".join(kept), dropped
+
+
+def trim_text(text: str, max_tokens: int) -> str:
+    """Keep the leading lines of text that fit in `max_tokens`."""
+    if count_tokens(text) <= max_tokens:
+        return text
+    budget = max_tokens * 4 - len(TRIMMED_MARKER)
+    kept, used = [], 0
+    for line in text.splitlines():
+        if used + len(line) + 1 > budget:
+            break
+        kept.append(line)
+        used += len(line) + 1
+    kept.append(TRIMMED_MARKER)
+    return "\n".join(kept)
+
+
+def compress_sections(text: str, max_tokens: int) -> str:
+    """
+    Shrink CV text to about `max_tokens` while keeping every section.
+
+    Each section keeps its heading and first line; the rest of the budget is
+    shared between sections in proportion to their size, and lines that do
+    not fit are replaced by a count of the lines left out.
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+    sections = split_sections(text)
+    floors = [len("\n".join(section[:2])) for section in sections]
+    sizes = [len("\n".join(section)) for section in sections]
+    spare = max(0, max_tokens * 4 - sum(floors))
+    extra = sum(size - floor for size, floor in zip(sizes, floors)) or 1
+
+    parts = []
+    for section, floor, size in zip(sections, floors, sizes):
+        allowance = floor + spare * (size - floor) // extra
+        kept, used = section[:2], floor
+        for line in section[2:]:
+            if used + len(line) + 1 > allowance:
+                break
+            kept.append(line)
+            used += len(line) + 1
+        if len(kept) < len(section):
+            kept.append(f"[... {len(section) - len(kept)} more lines]")
+        parts.append("\n".join(kept))
+    return "\n\n".join(parts)
+
+
+@dataclass
+class SlotReport:
+    """Size of one slot before and after assembly."""
+
+    name: str
+    tokens_before: int
+    tokens_after: int
+    deduped_lines: int = 0
+    trimmed: bool = False
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "deduped_lines": self.deduped_lines,
+            "trimmed": self.trimmed,
+        }
+
+
+@dataclass
+class PromptAssembly:
+    """Slot values fitted to a budget, and how each was changed."""
+
+    slots: dict[str, str]
+    fixed_tokens: int = 0
+    budget: Optional[int] = None
+    reports: list[SlotReport] = field(default_factory=list)
+
+    @property
+    def tokens_before(self) -> int:
+        return self.fixed_tokens + sum(report.tokens_before for report in self.reports)
+
+    @property
+    def tokens_after(self) -> int:
+        return self.fixed_tokens + sum(report.tokens_after for report in self.reports)
+
+    @property
+    def over_budget(self) -> bool:
+        """True if the slot minimums alone exceed the budget."""
+        return self.budget is not None and self.tokens_after > self.budget
+
+    def as_dict(self) -> dict:
+        return {
+            "budget": self.budget,
+            "fixed_tokens": self.fixed_tokens,
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "over_budget": self.over_budget,
+            "slots": [report.as_dict() for report in self.reports],
+        }
+
+
+def assemble_slots(
+    slots: dict[str, str],
+    budget: Optional[int] = None,
+    fixed_tokens: int = 0,
+    dedupe: bool = True,
+) -> PromptAssembly:
+    """
+    Fit a prompt's context slots into a token budget.
+
+    CV_context lines that repeat CV_text are dropped first. If the prompt is
+    still over budget, slots are trimmed in TRIM_ORDER, each down to at most
+    its minimum size, and CV_text is compressed section by section so every
+    section of the original CV stays represented.
+
+    Args:
+        slots: Slot name to text
+        budget: Token budget of the whole prompt (None: unlimited)
+        fixed_tokens: Tokens of the prompt outside the slots
+        dedupe: Drop CV_context lines that CV_text already contains
+
+    Returns:
+        The fitted slots with a report per slot
+    """
+    fitted = dict(slots)
+    reports = {name: SlotReport(name, count_tokens(text), 0) for name, text in slots.items()}
+
+    if dedupe and fitted.get("CV_context") and fitted.get("CV_text"):
+        fitted["CV_context"], reports["CV_context"].deduped_lines = dedupe_lines(
+            fitted["CV_context"], fitted["CV_text"]
+        )
+
+    def total() -> int:
+        return fixed_tokens + sum(count_tokens(text) for text in fitted.values())
+
+    if budget is not None:
+        for name in TRIM_ORDER:
+            over = total() - budget
+            if over <= 0:
+                break
+            text = fitted.get(name)
+            if not text:
+                continue
+            size = count_tokens(text)
+            target = max(MIN_SLOT_TOKENS.get(name, 0), size - over)
+            if target >= size:
+                continue
+            if name == "CV_text":
+                fitted[name] = compress_sections(text, target)
+            else:
+                fitted[name] = trim_text(text, target)
+            reports[name].trimmed = fitted[name] != text
+
+    for name, text in fitted.items():
+        reports[name].tokens_after = count_tokens(text)
+    return PromptAssembly(fitted, fixed_tokens, budget, list(reports.values()))
+
+
+_PLACEHOLDER_RE = re.compile(r"\{(\w+)\}")
+
+
+def fill_template(template: str, values: dict[str, str]) -> str:
+    """
+    Substitute {name} placeholders in one pass.
+
+    Values are not scanned again, so braces inside them are left as is.
+
+    Raises:
+        KeyError: If a placeholder has no value
+    """
+
+    def substitute(match: re.Match) -> str:
+        name = match.group(1)
+        if name not in values:
+            raise KeyError(f"Context variable not found: `{name}`.")
+        return values[name]
+
+    return _PLACEHOLDER_RE.sub(substitute, template)
@@ -0,0 +1,262 @@
+"""Shared scheduling of model calls: concurrency caps, rate limits and retries."""
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, asdict
+from typing import AsyncGenerator, Optional
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+from cv_formatter.config import config
+
+logger = logging.getLogger(__name__)
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Check whether a model error is worth retrying.
+
+    Args:
+        error: Exception raised by a model call
+
+    Returns:
+        True for rate limiting (HTTP 429) and server errors (HTTP 5xx)
+    """
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    return isinstance(code, int) and (code == 429 or 500 <= code < 600)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a fixed rate."""
+
+    def __init__(self, per_minute: float):
+        """
+        Initialize the bucket.
+
+        Args:
+            per_minute: Tokens added per minute; also the bucket capacity
+        """
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.tokens = per_minute
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """Wait until `amount` tokens are available and take them."""
+        # A request larger than the bucket would never fit; let it drain it
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= amount
+
+    def adjust(self, amount: float) -> None:
+        """Charge (or refund, if negative) tokens after the fact."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+@dataclass
+class SchedulerStats:
+    """Queue and wait metrics of a ModelScheduler."""
+
+    queued: int = 0
+    in_flight: int = 0
+    requests: int = 0
+    retries: int = 0
+    throttled: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    @property
+    def mean_wait_seconds(self) -> float:
+        return self.total_wait_seconds / self.requests if self.requests else 0.0
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "mean_wait_seconds": self.mean_wait_seconds}
+
+
+class ModelScheduler:
+    """
+    Admission control for model calls shared by all agents.
+
+    Caps in-flight requests globally and per model, applies requests/min and
+    tokens/min token buckets, and retries throttling and server errors with
+    jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        per_model_concurrency: Optional[int] = None,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrency: Maximum in-flight model requests overall
+            per_model_concurrency: Maximum in-flight requests per model name
+                (default: max_concurrency)
+            requests_per_minute: Request rate limit (0: unlimited)
+            tokens_per_minute: Token rate limit (0: unlimited)
+            max_retries: Retries for 429/5xx errors before giving up
+            backoff_base: Initial backoff in seconds
+            backoff_max: Maximum backoff in seconds
+        """
+        self.max_concurrency = max_concurrency
+        self.per_model_concurrency = per_model_concurrency or max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.stats = SchedulerStats()
+
+        self._global = asyncio.Semaphore(max_concurrency)
+        self._per_model: dict[str, asyncio.Semaphore] = {}
+        self._requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    @classmethod
+    def from_config(cls) -> "ModelScheduler":
+        """Create a scheduler from the application configuration."""
+        return cls(
+            max_concurrency=config.model_max_concurrency,
+            per_model_concurrency=config.model_max_concurrency_per_model,
+            requests_per_minute=config.model_requests_per_minute,
+            tokens_per_minute=config.model_tokens_per_minute,
+            max_retries=config.model_max_retries,
+            backoff_base=config.model_backoff_base,
+            backoff_max=config.model_backoff_max,
+        )
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry attempt."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    @asynccontextmanager
+    async def slot(self, model_name: str, estimated_tokens: int = 0):
+        """
+        Wait for capacity to make one model request.
+
+        Args:
+            model_name: Model the request is sent to
+            estimated_tokens: Tokens charged against the tokens/min limit
+        """
+        per_model = self._per_model.setdefault(
+            model_name, asyncio.Semaphore(self.per_model_concurrency)
+        )
+
+        self.stats.queued += 1
+        start = time.monotonic()
+        try:
+            await self._global.acquire()
+            try:
+                await per_model.acquire()
+            except BaseException:
+                self._global.release()
+                raise
+        finally:
+            self.stats.queued -= 1
+
+        try:
+            if self._requests is not None:
+                await self._requests.acquire()
+            if self._tokens is not None and estimated_tokens:
+                await self._tokens.acquire(estimated_tokens)
+
+            waited = time.monotonic() - start
+            self.stats.requests += 1
+            self.stats.total_wait_seconds += waited
+            self.stats.max_wait_seconds = max(self.stats.max_wait_seconds, waited)
+
+            self.stats.in_flight += 1
+            try:
+                yield
+            finally:
+                self.stats.in_flight -= 1
+        finally:
+            per_model.release()
+            self._global.release()
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """Correct the tokens/min bucket once the real usage is known."""
+        if self._tokens is not None and actual_tokens is not None:
+            self._tokens.adjust(actual_tokens - estimated_tokens)
+
+
+def estimate_tokens(llm_request: LlmRequest) -> int:
+    """Rough prompt size in tokens (about four characters per token)."""
+    chars = len(str(llm_request.config.system_instruction or "")) if llm_request.config else 0
+    for content in llm_request.contents:
+        for part in content.parts or []:
+            chars += len(part.text or "")
+    return chars // 4 + 1
+
+
+class ScheduledModel(BaseLlm):
+    """Model wrapper that routes every call through a ModelScheduler."""
+
+    inner: BaseLlm
+    scheduler: ModelScheduler
+
+    def __init__(self, inner: BaseLlm, scheduler: ModelScheduler):
+        """
+        Wrap a model.
+
+        Args:
+            inner: Model that performs the calls
+            scheduler: Scheduler shared by all agents
+        """
+        super().__init__(model=inner.model, inner=inner, scheduler=scheduler)
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        estimated = estimate_tokens(llm_request)
+        attempt = 0
+        while True:
+            yielded = False
+            try:
+                async with self.scheduler.slot(self.model, estimated):
+                    async for response in self.inner.generate_content_async(
+                        llm_request, stream
+                    ):
+                        yielded = True
+                        if response.usage_metadata and not response.partial:
+                            self.scheduler.record_usage(
+                                estimated, response.usage_metadata.total_token_count
+                            )
+                        yield response
+                return
+            except Exception as e:
+                # Never retry once output has been passed on to the caller
+                if yielded or not is_retryable(e) or attempt >= self.scheduler.max_retries:
+                    raise
+                self.scheduler.stats.retries += 1
+                if getattr(e, "code", None) == 429:
+                    self.scheduler.stats.throttled += 1
+                delay = self.scheduler.backoff_delay(attempt)
+                logger.warning(
+                    "Model %s returned %s; retrying in %.1fs", self.model, e, delay
+                )
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    def connect(self, llm_request: LlmRequest):
+        return self.inner.connect(llm_request)
@@ -0,0 +1,222 @@
+"""
+HTTP service mode: accept CV/JD uploads and run them on one warm orchestrator.
+
+Endpoints:
+    POST /jobs                  Multipart upload of `cv` (PDF) and `jd` (text
+                                file) or `jd_text`; returns a job ID
+    GET  /jobs/{id}             Job status, with the CV once done
+    GET  /jobs/{id}/result      The CV in the requested format
+    GET  /jobs/{id}/stream      The CV streamed as it is generated
+    GET  /metrics               Queue length, active jobs, per-stage latency
+    GET  /health                Liveness check
+
+Usage:
+    python -m cv_formatter.server [--host HOST] [--port PORT] [--workers N]
+        [--cpu-workers N]
+"""
+import argparse
+import sys
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Literal, Optional
+
+from cv_formatter.config import config
+from cv_formatter.formatter import StreamFormatter, format_output_async
+
+if TYPE_CHECKING:
+    from cv_formatter.orchestrator import CVFormatterOrchestrator
+
+MEDIA_TYPES = {
+    "plain": "text/plain",
+    "markdown": "text/markdown",
+    "html": "text/html",
+    "json": "application/json",
+}
+
+OutputFormat = Literal["plain", "markdown", "html", "json"]
+
+
+def create_app(
+    orchestrator: Optional["CVFormatterOrchestrator"] = None,
+    workers: Optional[int] = None,
+):
+    """
+    Build the HTTP application.
+
+    The job queue's workers start and stop with the application.
+
+    Args:
+        orchestrator: Orchestrator every job runs on (default: a new one)
+        workers: Jobs run concurrently (default: SERVER_WORKERS)
+
+    Returns:
+        The FastAPI application
+    """
+    try:
+        import python_multipart  # noqa: F401  (needed for form uploads)
+        from fastapi import FastAPI, File, Form, HTTPException, Query, UploadFile
+        from fastapi.responses import JSONResponse, Response, StreamingResponse
+    except ImportError as e:
+        raise RuntimeError(
+            "The HTTP service requires fastapi and python-multipart "
+            "(pip install 'CVFormatter[server]')"
+        ) from e
+
+    # Imported here so --help and argument errors don't load the agent stack
+    from cv_formatter.jobs import FAILED, JobQueue, QueueFullError
+
+    if orchestrator is None:
+        from cv_formatter.orchestrator import CVFormatterOrchestrator
+
+        orchestrator = CVFormatterOrchestrator()
+    queue = JobQueue(orchestrator, workers=workers)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        queue.start()
+        try:
+            yield
+        finally:
+            await queue.stop()
+            orchestrator.close()
+
+    app = FastAPI(title="CV Formatter", lifespan=lifespan)
+    app.state.queue = queue
+
+    async def read_upload(upload: UploadFile, name: str) -> bytes:
+        data = await upload.read(config.server_max_upload_bytes + 1)
+        if len(data) > config.server_max_upload_bytes:
+            raise HTTPException(413, f"{name} is larger than {config.server_max_upload_bytes} bytes")
+        return data
+
+    def find_job(job_id: str):
+        job = queue.get(job_id)
+        if job is None:
+            raise HTTPException(404, f"Unknown job {job_id}")
+        return job
+
+    @app.post("/jobs", status_code=202)
+    async def submit(
+        cv: UploadFile = File(..., description="CV PDF"),
+        jd: Optional[UploadFile] = File(None, description="Job description text file"),
+        jd_text: Optional[str] = Form(None, description="Job description text"),
+    ):
+        cv_pdf = await read_upload(cv, "cv")
+        if not cv_pdf.startswith(b"%PDF"):
+            raise HTTPException(400, "cv must be a PDF file")
+        if jd is not None:
+            jd_bytes = await read_upload(jd, "jd")
+        elif jd_text:
+            jd_bytes = jd_text.encode("utf-8")
+        else:
+            raise HTTPException(400, "Provide the job description as jd or jd_text")
+
+        try:
+            job = queue.submit(cv_pdf, jd_bytes)
+        except QueueFullError as e:
+            raise HTTPException(503, f"Queue is full: {e}", headers={"Retry-After": "5"})
+        return job.as_dict()
+
+    @app.get("/jobs/{job_id}")
+    async def status(job_id: str, format: OutputFormat = Query("plain")):
+        job = find_job(job_id)
+        body = job.as_dict()
+        if format == "json" and job.structured is not None:
+            body["result"] = job.structured.as_dict()
+            body["format"] = format
+        elif job.result is not None:
+            body["result"] = await format_output_async(job.result, format)
+            body["format"] = format
+        return body
+
+    @app.get("/jobs/{job_id}/result")
+    async def result(job_id: str, format: OutputFormat = Query("plain")):
+        job = find_job(job_id)
+        if job.status == FAILED:
+            return JSONResponse(job.as_dict(), status_code=500)
+        if job.result is None:
+            return JSONResponse(job.as_dict(), status_code=409)
+        # JSON is rendered from the sections the job parsed once
+        content = job.structured if format == "json" else job.result
+        return Response(
+            await format_output_async(content, format), media_type=MEDIA_TYPES[format]
+        )
+
+    @app.get("/jobs/{job_id}/stream")
+    async def stream(job_id: str, format: OutputFormat = Query("plain")):
+        job = find_job(job_id)
+
+        async def body():
+            formatter = StreamFormatter(format)
+            if head := formatter.start():
+                yield head
+            async for chunk in job.follow():
+                if output := formatter.feed(chunk):
+                    yield output
+            # A failed job's partial CV is left without the closing footer
+            if job.result is not None:
+                yield formatter.finish()
+
+        return StreamingResponse(body(), media_type=MEDIA_TYPES[format])
+
+    @app.get("/metrics")
+    async def metrics():
+        return queue.metrics()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    return app
+
+
+def parse_arguments():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="CV Formatter - HTTP service mode",
+        epilog="""
+Examples:
+  # Serve on the default address
+  python -m cv_formatter.server
+
+  # Submit a job, then poll it or stream its result
+  curl -F cv=@cv.pdf -F jd=@jd.txt http://127.0.0.1:8080/jobs
+  curl http://127.0.0.1:8080/jobs/<job_id>
+  curl -N "http://127.0.0.1:8080/jobs/<job_id>/stream?format=plain"
+        """,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--host", default=None,
+                        help="Address to listen on (default: SERVER_HOST)")
+    parser.add_argument("--port", type=int, default=None,
+                        help="Port to listen on (default: SERVER_PORT)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Jobs run concurrently (default: SERVER_WORKERS)")
+    parser.add_argument("--cpu-workers", type=int, default=None,
+                        help="Processes for PDF extraction, normalization and formatting "
+                             "(default: CPU_WORKERS; 0 uses threads)")
+    return parser.parse_args()
+
+
+def main():
+    """HTTP service entry point."""
+    args = parse_arguments()
+
+    if not config.is_configured:
+        print("ERROR: GOOGLE_API_KEY not found in .env file")
+        print("Please create a .env file with: GOOGLE_API_KEY=your_key_here")
+        sys.exit(1)
+
+    if args.cpu_workers is not None:
+        config.cpu_workers = args.cpu_workers
+
+    import uvicorn
+
+    uvicorn.run(
+        create_app(workers=args.workers),
+        host=args.host or config.server_host,
+        port=args.port or config.server_port,
+    )
+
+
+if __name__ == "__main__":
+    main()
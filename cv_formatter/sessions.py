@@ -0,0 +1,560 @@
+"""Session and memory services bounded by count, idle TTL and size."""
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Optional
+
+from google.adk.errors.already_exists_error import AlreadyExistsError
+from google.adk.events import Event
+from google.adk.memory import InMemoryMemoryService
+from google.adk.sessions import BaseSessionService, InMemorySessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+
+from cv_formatter.config import config
+
+SessionKey = tuple[str, str, str]
+
+
+@dataclass
+class StoreStats:
+    """Size and eviction counters of a bounded session or memory store."""
+
+    sessions: int = 0
+    bytes: int = 0
+    evicted: int = 0
+    expired: int = 0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def _event_size(event: Event) -> int:
+    """Approximate bytes held for an event and its state delta."""
+    size = len(event.model_dump_json(exclude_none=True))
+    if event.actions and event.actions.state_delta:
+        # Session state keeps a second copy of every delta value
+        size += len(json.dumps(event.actions.state_delta, default=str))
+    return size
+
+
+class _SessionLimits:
+    """Limits and pinning shared by the bounded session services."""
+
+    def __init__(
+        self,
+        max_sessions: Optional[int] = None,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Initialize the limits.
+
+        Args:
+            max_sessions: Maximum number of sessions kept (None: unlimited)
+            ttl: Seconds a session is kept after its last use (None: forever)
+            max_bytes: Approximate size budget of all sessions (None: unlimited)
+        """
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = StoreStats()
+        self._pinned: Counter[SessionKey] = Counter()
+
+    def pin(self, session: Session) -> None:
+        """Protect a session from eviction while a run is using it."""
+        self._pinned[(session.app_name, session.user_id, session.id)] += 1
+
+    def unpin(self, session: Session) -> None:
+        """Make a pinned session evictable again."""
+        key = (session.app_name, session.user_id, session.id)
+        self._pinned[key] -= 1
+        if self._pinned[key] <= 0:
+            del self._pinned[key]
+
+    def _over_budget(self, sessions: int, size: int) -> bool:
+        return (self.max_sessions is not None and sessions > self.max_sessions) or (
+            self.max_bytes is not None and size > self.max_bytes
+        )
+
+    def _expired(self, accessed: float, now: float) -> bool:
+        return self.ttl is not None and now - accessed > self.ttl
+
+
+class BoundedSessionService(_SessionLimits, InMemorySessionService):
+    """
+    In-memory session service that evicts least recently used sessions.
+
+    Sessions idle for longer than the TTL are dropped, and the least
+    recently used ones are evicted whenever the session count or the
+    approximate size of their events exceeds its budget. Pinned sessions,
+    such as those of runs in progress, are never evicted.
+    """
+
+    def __init__(
+        self,
+        max_sessions: Optional[int] = None,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        InMemorySessionService.__init__(self)
+        _SessionLimits.__init__(self, max_sessions, ttl, max_bytes)
+        # Last access time and size of each session, least recently used first
+        self._usage: OrderedDict[SessionKey, list] = OrderedDict()
+
+    @classmethod
+    def from_config(cls) -> "BoundedSessionService":
+        """Build the service from the SESSION_* settings."""
+        return cls(
+            max_sessions=config.session_max_count,
+            ttl=config.session_ttl,
+            max_bytes=config.session_max_bytes,
+        )
+
+    def _touch(self, key: SessionKey, added_bytes: int = 0) -> None:
+        usage = self._usage.setdefault(key, [0.0, 0])
+        usage[0] = time.time()
+        usage[1] += added_bytes
+        self.stats.bytes += added_bytes
+        self._usage.move_to_end(key)
+
+    def _drop(self, key: SessionKey) -> None:
+        usage = self._usage.pop(key, None)
+        if usage is not None:
+            self.stats.bytes -= usage[1]
+        self.sessions.get(key[0], {}).get(key[1], {}).pop(key[2], None)
+
+    def _evict(self, keep: Optional[SessionKey] = None) -> None:
+        """Drop expired sessions, then LRU sessions until within budget."""
+        now = time.time()
+        expired = []
+        for key, (accessed, _) in self._usage.items():
+            if not self._expired(accessed, now):
+                break
+            if key != keep and key not in self._pinned:
+                expired.append(key)
+        for key in expired:
+            self._drop(key)
+        self.stats.expired += len(expired)
+
+        sessions, size = len(self._usage), self.stats.bytes
+        evicted = []
+        for key, (_, used) in self._usage.items():
+            if not self._over_budget(sessions, size):
+                break
+            if key != keep and key not in self._pinned:
+                evicted.append(key)
+                sessions -= 1
+                size -= used
+        for key in evicted:
+            self._drop(key)
+        self.stats.evicted += len(evicted)
+        self.stats.sessions = len(self._usage)
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session = await super().create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+        key = (app_name, user_id, session.id)
+        self._touch(key, len(json.dumps(state, default=str)) if state else 0)
+        self._evict(keep=key)
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        key = (app_name, user_id, session_id)
+        usage = self._usage.get(key)
+        if usage is not None and key not in self._pinned and self._expired(usage[0], time.time()):
+            self._drop(key)
+            self.stats.expired += 1
+            self.stats.sessions = len(self._usage)
+            return None
+        session = await super().get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+        if session is not None:
+            self._touch(key)
+        return session
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        self._drop((app_name, user_id, session_id))
+        self.stats.sessions = len(self._usage)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        key = (session.app_name, session.user_id, session.id)
+        stored = key in self._usage
+        event = await super().append_event(session, event)
+        if stored and not event.partial:
+            self._touch(key, _event_size(event))
+            self._evict(keep=key)
+        return event
+
+
+class SqliteSessionService(_SessionLimits, BaseSessionService):
+    """
+    Session service persisting sessions and events to a SQLite file.
+
+    Applies the same TTL, count and size limits as BoundedSessionService,
+    with size measured as the stored JSON. State is stored per session;
+    app- and user-scoped keys are not shared across sessions.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            app_name TEXT NOT NULL,
+            user_id TEXT NOT NULL,
+            id TEXT NOT NULL,
+            state TEXT NOT NULL,
+            last_update_time REAL NOT NULL,
+            accessed REAL NOT NULL,
+            bytes INTEGER NOT NULL,
+            PRIMARY KEY (app_name, user_id, id)
+        );
+        CREATE INDEX IF NOT EXISTS sessions_accessed ON sessions (accessed);
+        CREATE TABLE IF NOT EXISTS events (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            app_name TEXT NOT NULL,
+            user_id TEXT NOT NULL,
+            session_id TEXT NOT NULL,
+            timestamp REAL NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS events_session
+            ON events (app_name, user_id, session_id, seq);
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_sessions: Optional[int] = None,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            path: SQLite database file, created if missing
+            max_sessions: Maximum number of sessions kept (None: unlimited)
+            ttl: Seconds a session is kept after its last use (None: forever)
+            max_bytes: Size budget of stored sessions (None: unlimited)
+        """
+        _SessionLimits.__init__(self, max_sessions, ttl, max_bytes)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        # WAL with NORMAL sync stays consistent on a crash, without an fsync
+        # per event
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(self._SCHEMA)
+        self._lock = threading.Lock()
+        self.stats.sessions, self.stats.bytes = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM sessions"
+        ).fetchone()
+
+    @classmethod
+    def from_config(cls) -> "SqliteSessionService":
+        """Build the service from the SESSION_* settings."""
+        return cls(
+            config.session_db_path,
+            max_sessions=config.session_max_count,
+            ttl=config.session_ttl,
+            max_bytes=config.session_max_bytes,
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    async def _call(self, func, *args):
+        """Run a database operation in a worker thread, in one transaction."""
+
+        def locked():
+            with self._lock:
+                self._db.execute("BEGIN")
+                try:
+                    result = func(*args)
+                except BaseException:
+                    self._db.execute("ROLLBACK")
+                    raise
+                self._db.execute("COMMIT")
+                return result
+
+        return await asyncio.to_thread(locked)
+
+    def _delete(self, key: SessionKey) -> bool:
+        row = self._db.execute(
+            "DELETE FROM sessions WHERE app_name=? AND user_id=? AND id=? RETURNING bytes", key
+        ).fetchone()
+        if row is None:
+            return False
+        self._db.execute(
+            "DELETE FROM events WHERE app_name=? AND user_id=? AND session_id=?", key
+        )
+        self.stats.sessions -= 1
+        self.stats.bytes -= row[0]
+        return True
+
+    def _evict(self, keep: Optional[SessionKey] = None) -> None:
+        """Drop expired sessions, then LRU sessions until within budget."""
+        if self.ttl is not None:
+            rows = self._db.execute(
+                "SELECT app_name, user_id, id FROM sessions WHERE accessed < ?",
+                (time.time() - self.ttl,),
+            ).fetchall()
+            for key in rows:
+                if key != keep and key not in self._pinned and self._delete(key):
+                    self.stats.expired += 1
+
+        while self._over_budget(self.stats.sessions, self.stats.bytes):
+            # Oldest sessions first; pinned ones are skipped, so fetch extra
+            batch = len(self._pinned) + 16
+            rows = self._db.execute(
+                "SELECT app_name, user_id, id FROM sessions ORDER BY accessed LIMIT ?",
+                (batch,),
+            ).fetchall()
+            evictable = [key for key in rows if key != keep and key not in self._pinned]
+            if not evictable:
+                break
+            for key in evictable:
+                if not self._over_budget(self.stats.sessions, self.stats.bytes):
+                    break
+                self._delete(key)
+                self.stats.evicted += 1
+
+    def _create(self, app_name, user_id, state, session_id) -> Session:
+        now = time.time()
+        session = Session(
+            app_name=app_name, user_id=user_id, id=session_id,
+            state=state or {}, last_update_time=now,
+        )
+        state_json = json.dumps(session.state)
+        self._db.execute(
+            "INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (app_name, user_id, session_id, state_json, now, now, len(state_json)),
+        )
+        self.stats.sessions += 1
+        self.stats.bytes += len(state_json)
+        self._evict(keep=(app_name, user_id, session_id))
+        return session
+
+    def _get(self, key: SessionKey, get_config: Optional[GetSessionConfig]) -> Optional[Session]:
+        row = self._db.execute(
+            "SELECT state, last_update_time, accessed FROM sessions"
+            " WHERE app_name=? AND user_id=? AND id=?",
+            key,
+        ).fetchone()
+        if row is None:
+            return None
+        state, last_update_time, accessed = row
+        now = time.time()
+        if key not in self._pinned and self._expired(accessed, now):
+            self._delete(key)
+            self.stats.expired += 1
+            return None
+        self._db.execute(
+            "UPDATE sessions SET accessed=? WHERE app_name=? AND user_id=? AND id=?",
+            (now, *key),
+        )
+
+        query = "SELECT data FROM events WHERE app_name=? AND user_id=? AND session_id=?"
+        params: list = list(key)
+        if get_config and get_config.after_timestamp:
+            query += " AND timestamp >= ?"
+            params.append(get_config.after_timestamp)
+        query += " ORDER BY seq"
+        events = [Event.model_validate_json(data) for (data,) in self._db.execute(query, params)]
+        if get_config and get_config.num_recent_events:
+            events = events[-get_config.num_recent_events:]
+
+        return Session(
+            app_name=key[0], user_id=key[1], id=key[2], state=json.loads(state),
+            events=events, last_update_time=last_update_time,
+        )
+
+    def _list(self, app_name: str, user_id: Optional[str]) -> ListSessionsResponse:
+        query = "SELECT user_id, id, state, last_update_time FROM sessions WHERE app_name=?"
+        params: list = [app_name]
+        if user_id is not None:
+            query += " AND user_id=?"
+            params.append(user_id)
+        return ListSessionsResponse(sessions=[
+            Session(app_name=app_name, user_id=row[0], id=row[1], state=json.loads(row[2]),
+                    last_update_time=row[3])
+            for row in self._db.execute(query, params)
+        ])
+
+    def _append(self, session: Session, event: Event) -> None:
+        key = (session.app_name, session.user_id, session.id)
+        data = event.model_dump_json(exclude_none=True)
+        state_json = json.dumps(session.state)
+        row = self._db.execute(
+            "SELECT length(state) FROM sessions WHERE app_name=? AND user_id=? AND id=?", key
+        ).fetchone()
+        if row is not None:
+            added = len(state_json) - row[0] + len(data)
+            self._db.execute(
+                "UPDATE sessions SET state=?, last_update_time=?, accessed=?, bytes=bytes + ?"
+                " WHERE app_name=? AND user_id=? AND id=?",
+                (state_json, event.timestamp, time.time(), added, *key),
+            )
+            self.stats.bytes += added
+            self._db.execute(
+                "INSERT INTO events (app_name, user_id, session_id, timestamp, data)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (*key, event.timestamp, data),
+            )
+            self._evict(keep=key)
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = session_id.strip() if session_id and session_id.strip() else str(uuid.uuid4())
+        try:
+            return await self._call(self._create, app_name, user_id, state, session_id)
+        except sqlite3.IntegrityError as error:
+            raise AlreadyExistsError(f"Session with id {session_id} already exists.") from error
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        return await self._call(self._get, (app_name, user_id, session_id), config)
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: Optional[str] = None
+    ) -> ListSessionsResponse:
+        return await self._call(self._list, app_name, user_id)
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        await self._call(self._delete, (app_name, user_id, session_id))
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        event = await super().append_event(session, event)
+        if not event.partial:
+            session.last_update_time = event.timestamp
+            await self._call(self._append, session, event)
+        return event
+
+
+class BoundedMemoryService(InMemoryMemoryService):
+    """
+    In-memory memory service keeping a bounded number of recent sessions.
+
+    Sessions added longer than the TTL ago are dropped, and the oldest are
+    evicted when the session count or event size exceeds its budget.
+    """
+
+    def __init__(
+        self,
+        max_sessions: Optional[int] = None,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            max_sessions: Maximum number of sessions kept (None: unlimited)
+            ttl: Seconds a session is kept after being added (None: forever)
+            max_bytes: Approximate size budget of all events (None: unlimited)
+        """
+        super().__init__()
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = StoreStats()
+        # (user key, session id) -> (time added, size), oldest first
+        self._usage: OrderedDict[tuple[str, str], tuple[float, int]] = OrderedDict()
+
+    @classmethod
+    def from_config(cls) -> "BoundedMemoryService":
+        """Build the service from the MEMORY_* settings."""
+        return cls(
+            max_sessions=config.memory_max_sessions,
+            ttl=config.memory_ttl,
+            max_bytes=config.memory_max_bytes,
+        )
+
+    def _drop(self, key: tuple[str, str]) -> None:
+        _, size = self._usage.pop(key)
+        self.stats.bytes -= size
+        sessions = self._session_events.get(key[0], {})
+        sessions.pop(key[1], None)
+        if not sessions:
+            self._session_events.pop(key[0], None)
+
+    def _evict(self) -> None:
+        now = time.time()
+        for key, (added, _) in list(self._usage.items()):
+            if self.ttl is None or now - added <= self.ttl:
+                break
+            self._drop(key)
+            self.stats.expired += 1
+        while len(self._usage) > 1 and (
+            (self.max_sessions is not None and len(self._usage) > self.max_sessions)
+            or (self.max_bytes is not None and self.stats.bytes > self.max_bytes)
+        ):
+            self._drop(next(iter(self._usage)))
+            self.stats.evicted += 1
+        self.stats.sessions = len(self._usage)
+
+    async def add_session_to_memory(self, session: Session) -> None:
+        await super().add_session_to_memory(session)
+        key = (f"{session.app_name}/{session.user_id}", session.id)
+        with self._lock:
+            events = self._session_events.get(key[0], {}).get(key[1], [])
+            size = sum(len(event.model_dump_json(exclude_none=True)) for event in events)
+            if key in self._usage:
+                self.stats.bytes -= self._usage.pop(key)[1]
+            self._usage[key] = (time.time(), size)
+            self.stats.bytes += size
+            self._evict()
+
+    async def search_memory(self, *, app_name: str, user_id: str, query: str):
+        with self._lock:
+            self._evict()
+        return await super().search_memory(app_name=app_name, user_id=user_id, query=query)
+
+
+def session_service_from_config() -> BaseSessionService:
+    """Build the session service selected by SESSION_BACKEND."""
+    if config.session_backend == "sqlite":
+        return SqliteSessionService.from_config()
+    if config.session_backend != "memory":
+        raise ValueError(
+            f"Unknown SESSION_BACKEND {config.session_backend!r}; use 'memory' or 'sqlite'"
+        )
+    return BoundedSessionService.from_config()
@@ -0,0 +1,169 @@
+"""Section model of a reformatted CV, parsed once from the rewrite output."""
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from cv_formatter.prompt_budget import is_section_heading
+
+# Headings the model decorated despite the instructions ("## Skills:", "**SKILLS**")
+_DECORATION_RE = re.compile(r"^[#*_\s]+|[*_:\s]+$")
+_BULLET_RE = re.compile(r"^\s*[-•*·–]\s+")
+
+
+@dataclass(frozen=True)
+class Entry:
+    """One line of a CV section; bullets are kept without their marker."""
+
+    text: str
+    bullet: bool = False
+
+    def __post_init__(self):
+        if not self.text.strip() or "\n" in self.text:
+            raise ValueError(f"An entry is one non-empty line, got {self.text!r}")
+
+
+@dataclass(frozen=True)
+class Section:
+    """A CV section: its heading and its entries, in order."""
+
+    name: str
+    entries: tuple[Entry, ...] = ()
+
+    def __post_init__(self):
+        if not self.name.strip() or "\n" in self.name:
+            raise ValueError(f"A section name is one non-empty line, got {self.name!r}")
+
+    @property
+    def bullets(self) -> list[str]:
+        """Text of the section's bulleted entries."""
+        return [entry.text for entry in self.entries if entry.bullet]
+
+
+@dataclass(frozen=True)
+class StructuredCV:
+    """
+    A reformatted CV as its header lines and its sections.
+
+    The header holds the lines before the first section (name, contact
+    details). Formatters render it to plain text, Markdown, HTML or JSON
+    without parsing the CV text again, and sections can be compared or
+    indexed by name.
+    """
+
+    header: tuple[str, ...] = ()
+    sections: tuple[Section, ...] = ()
+
+    def __post_init__(self):
+        if any(not line.strip() or "\n" in line for line in self.header):
+            raise ValueError("Header lines must be non-empty single lines")
+        names = [section.name.upper() for section in self.sections]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Section names must be unique, got {names}")
+
+    @classmethod
+    def parse(cls, text: str) -> "StructuredCV":
+        """
+        Parse reformatted CV text into sections.
+
+        Headings are recognized as in the prompt budget (usual CV section
+        names) and, once the first one has been seen, as short all-caps
+        lines after a blank line, which is how the rewrite prompt asks for
+        them. Lines starting with a bullet marker become bulleted entries.
+        Sections repeating an earlier heading are merged into it.
+
+        Args:
+            text: The reformatted CV
+
+        Returns:
+            The validated section model
+        """
+        header: list[str] = []
+        sections: dict[str, tuple[str, list[Entry]]] = {}
+        current: Optional[list[Entry]] = None
+        after_blank = True
+        for line in text.splitlines():
+            if not line.strip():
+                after_blank = True
+                continue
+            bullet = _BULLET_RE.match(line)
+            name = "" if bullet else _DECORATION_RE.sub("", line)
+            if name and (is_section_heading(name) or (
+                current is not None and after_blank and _is_caps_heading(name)
+            )):
+                current = sections.setdefault(name.upper(), (name, []))[1]
+            elif current is None:
+                header.append(line.strip())
+            elif bullet and line[bullet.end():].strip():
+                current.append(Entry(line[bullet.end():].strip(), bullet=True))
+            else:
+                current.append(Entry(line.strip()))
+            after_blank = False
+        return cls(
+            tuple(header),
+            tuple(Section(name, tuple(entries)) for name, entries in sections.values()),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "StructuredCV":
+        """
+        Build the model from as_dict() output, such as loaded JSON.
+
+        Raises:
+            ValueError: If the data isn't a valid section model
+        """
+        try:
+            return cls(
+                tuple(data.get("header", ())),
+                tuple(
+                    Section(section["name"], tuple(
+                        Entry(entry["text"], bool(entry.get("bullet", False)))
+                        for entry in section.get("entries", ())
+                    ))
+                    for section in data.get("sections", ())
+                ),
+            )
+        except (AttributeError, KeyError, TypeError) as e:
+            raise ValueError(f"Invalid structured CV: {e}") from e
+
+    def as_dict(self) -> dict[str, Any]:
+        """The model as JSON-serializable data."""
+        return {
+            "header": list(self.header),
+            "sections": [
+                {
+                    "name": section.name,
+                    "entries": [
+                        {"text": entry.text, "bullet": entry.bullet}
+                        for entry in section.entries
+                    ],
+                }
+                for section in self.sections
+            ],
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """The model as a JSON document."""
+        return json.dumps(self.as_dict(), indent=indent, ensure_ascii=False)
+
+    def to_text(self) -> str:
+        """The CV as plain text, headings in CAPS and bullets as "- "."""
+        blocks = ["\n".join(self.header)] if self.header else []
+        for section in self.sections:
+            lines = [section.name.upper()]
+            lines += [f"- {entry.text}" if entry.bullet else entry.text for entry in section.entries]
+            blocks.append("\n".join(lines))
+        return "\n\n".join(blocks)
+
+    def section(self, name: str) -> Optional[Section]:
+        """Return the section of that name, ignoring case, if the CV has one."""
+        name = name.strip().upper()
+        return next((s for s in self.sections if s.name.upper() == name), None)
+
+
+def _is_caps_heading(text: str) -> bool:
+    """Tell whether a line is a short all-caps heading such as "OPEN SOURCE"."""
+    return (
+        text.isupper() and len(text) <= 60 and len(text.split()) <= 6
+        and text[-1] not in ".,;"
+    )
@@ -0,0 +1,389 @@
+"""Per-stage tracing of workflow runs: latency, tokens, tool calls and cache hits."""
+import contextvars
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+
+
+@dataclass
+class ToolCall:
+    """A tool call made by an agent."""
+
+    name: str
+    start: float
+    end: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        return self.end - self.start if self.end is not None else None
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "start": self.start,
+            "end": self.end,
+            "duration": self.duration,
+            "error": self.error,
+        }
+
+
+@dataclass
+class Span:
+    """
+    One stage of a run: an agent, a workflow agent or input extraction.
+
+    Timestamps are seconds since the epoch.
+    """
+
+    name: str
+    kind: str
+    start: float
+    end: Optional[float] = None
+    model: Optional[str] = None
+    model_calls: int = 0
+    model_seconds: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    tool_calls: list[ToolCall] = field(default_factory=list)
+    cache_hit: bool = False
+    skipped: bool = False
+    model_start: Optional[float] = field(default=None, repr=False)
+
+    @property
+    def duration(self) -> Optional[float]:
+        return self.end - self.start if self.end is not None else None
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "start": self.start,
+            "end": self.end,
+            "duration": self.duration,
+            "model": self.model,
+            "model_calls": self.model_calls,
+            "model_seconds": self.model_seconds,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "tool_calls": [call.as_dict() for call in self.tool_calls],
+            "cache_hit": self.cache_hit,
+            "skipped": self.skipped,
+        }
+
+
+@dataclass
+class Trace:
+    """Spans recorded during one run of the workflow."""
+
+    start: float = field(default_factory=time.time)
+    end: Optional[float] = None
+    spans: list[Span] = field(default_factory=list)
+
+    @property
+    def duration(self) -> Optional[float]:
+        return self.end - self.start if self.end is not None else None
+
+    @property
+    def input_tokens(self) -> int:
+        return sum(span.input_tokens for span in self.spans)
+
+    @property
+    def output_tokens(self) -> int:
+        return sum(span.output_tokens for span in self.spans)
+
+    @property
+    def skipped_stages(self) -> list[str]:
+        """Stages skipped because their inputs matched the previous run."""
+        return [span.name for span in self.spans if span.skipped]
+
+    def start_span(self, name: str, kind: str, model: Optional[str] = None) -> Span:
+        """Open a span starting now."""
+        span = Span(name=name, kind=kind, start=time.time(), model=model)
+        self.spans.append(span)
+        return span
+
+    def find(self, name: str) -> Optional[Span]:
+        """Return the latest span with the given name."""
+        for span in reversed(self.spans):
+            if span.name == name:
+                return span
+        return None
+
+    def finish(self) -> None:
+        """End the trace and any span left open."""
+        self.end = time.time()
+        for span in self.spans:
+            if span.end is None:
+                span.end = self.end
+
+    def as_dict(self) -> dict:
+        return {
+            "start": self.start,
+            "end": self.end,
+            "duration": self.duration,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "skipped_stages": self.skipped_stages,
+            "spans": [span.as_dict() for span in self.spans],
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.as_dict(), indent=indent)
+
+    def summary(self) -> str:
+        """Render the trace as a table, one line per span in start order."""
+        lines = [
+            f"{'Stage':<34}{'Start':>8}{'Time':>8}{'Model':>8}{'Tok in':>8}"
+            f"{'Tok out':>8}  Notes"
+        ]
+        for span in sorted(self.spans, key=lambda s: s.start):
+            notes = []
+            if span.skipped:
+                notes.append("unchanged, skipped")
+            elif span.cache_hit:
+                notes.append("cache hit")
+            for call in span.tool_calls:
+                duration = f"{call.duration:.2f}s" if call.duration is not None else "?"
+                notes.append(f"{call.name} {duration}" + (" (failed)" if call.error else ""))
+            indent = "" if span.kind in ("workflow", "ingestion") else "  "
+            lines.append(
+                f"{indent + span.name:<34}{span.start - self.start:>7.2f}s"
+                f"{span.duration or 0:>7.2f}s{span.model_seconds:>7.2f}s"
+                f"{span.input_tokens:>8}{span.output_tokens:>8}  {', '.join(notes)}"
+            )
+        lines.append(
+            f"{'Total':<34}{'':>8}{self.duration or 0:>7.2f}s{'':>8}"
+            f"{self.input_tokens:>8}{self.output_tokens:>8}"
+        )
+        return "\n".join(lines)
+
+
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar(
+    "cv_formatter_trace", default=None
+)
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "cv_formatter_span", default=None
+)
+
+
+def current_trace() -> Optional[Trace]:
+    """Return the trace of the run in progress, if any."""
+    return _current_trace.get()
+
+
+@contextmanager
+def tracing(trace: Trace):
+    """Record spans of the code run inside the block into `trace`."""
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        trace.finish()
+
+
+@contextmanager
+def span(name: str, kind: str):
+    """
+    Record the block as a span of the current trace.
+
+    Does nothing when no trace is being recorded.
+
+    Args:
+        name: Span name
+        kind: Span kind, e.g. "ingestion"
+    """
+    trace = current_trace()
+    if trace is None:
+        yield None
+        return
+    current = trace.start_span(name, kind)
+    token = _current_span.set(current)
+    try:
+        yield current
+    finally:
+        _current_span.reset(token)
+        current.end = time.time()
+
+
+def _mark_span(name: Optional[str], attribute: str) -> None:
+    """Set a flag on a span of the current trace, ending it if named."""
+    trace = current_trace()
+    if trace is None:
+        return
+    if name is None:
+        target = _current_span.get()
+    else:
+        target = trace.find(name)
+        if target is not None:
+            target.end = time.time()
+    if target is not None:
+        setattr(target, attribute, True)
+
+
+def record_cache_hit(name: Optional[str] = None) -> None:
+    """
+    Mark a span as served from a cache.
+
+    Args:
+        name: Span to mark, typically an agent skipped by its cache
+            callback, which also ends the span (default: the innermost
+            span opened with span())
+    """
+    _mark_span(name, "cache_hit")
+
+
+def record_stage_skipped(name: Optional[str] = None) -> None:
+    """
+    Mark a span as skipped because its inputs matched the previous run.
+
+    Args:
+        name: Span to mark, ending it (default: the innermost span opened
+            with span())
+    """
+    _mark_span(name, "skipped")
+
+
+def record_model_call(
+    name: str,
+    model: Optional[str],
+    start: float,
+    end: float,
+    usage: Optional[Any] = None,
+) -> None:
+    """
+    Add a model call made outside an LlmAgent's flow to an agent's span.
+
+    Args:
+        name: Span of the agent that made the call
+        model: Model name
+        start: Start of the call, in seconds since the epoch
+        end: End of the call
+        usage: The response's usage metadata, if any
+    """
+    trace = current_trace()
+    target = trace.find(name) if trace else None
+    if target is None:
+        return
+    target.model = model or target.model
+    target.model_calls += 1
+    target.model_seconds += end - start
+    if usage:
+        target.input_tokens += usage.prompt_token_count or 0
+        target.output_tokens += (usage.candidates_token_count or 0) + (
+            usage.thoughts_token_count or 0
+        )
+
+
+class TracingPlugin(BasePlugin):
+    """Records agent, model and tool timings into the current trace."""
+
+    def __init__(self):
+        super().__init__(name="cv_formatter_tracing")
+
+    @staticmethod
+    def _span(callback_context: CallbackContext) -> Optional[Span]:
+        trace = current_trace()
+        return trace.find(callback_context.agent_name) if trace else None
+
+    async def before_agent_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> None:
+        trace = current_trace()
+        if trace is None:
+            return None
+        if isinstance(agent, LlmAgent):
+            trace.start_span(agent.name, "agent", getattr(agent.model, "model", None))
+        else:
+            trace.start_span(agent.name, "workflow")
+        return None
+
+    async def after_agent_callback(
+        self, *, agent: BaseAgent, callback_context: CallbackContext
+    ) -> None:
+        if span := self._span(callback_context):
+            span.end = time.time()
+        return None
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> None:
+        if span := self._span(callback_context):
+            span.model = llm_request.model or span.model
+            span.model_start = time.time()
+        return None
+
+    async def after_model_callback(
+        self, *, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> None:
+        span = self._span(callback_context)
+        if span is None or llm_response.partial:
+            return None
+
+        now = time.time()
+        start = span.model_start or now
+        span.model_calls += 1
+        span.model_seconds += now - start
+
+        usage = llm_response.usage_metadata
+        if usage:
+            span.input_tokens += usage.prompt_token_count or 0
+            span.output_tokens += (usage.candidates_token_count or 0) + (
+                usage.thoughts_token_count or 0
+            )
+
+        # google_search runs inside the model call; attribute the call's time
+        grounding = llm_response.grounding_metadata
+        if grounding and grounding.web_search_queries:
+            span.tool_calls.append(ToolCall("google_search", start, now))
+        return None
+
+    async def before_tool_callback(
+        self, *, tool: BaseTool, tool_args: dict[str, Any], tool_context: ToolContext
+    ) -> None:
+        if span := self._span(tool_context):
+            span.tool_calls.append(ToolCall(tool.name, time.time()))
+        return None
+
+    def _end_tool(self, tool: BaseTool, tool_context: ToolContext, error=None) -> None:
+        span = self._span(tool_context)
+        if span is None:
+            return
+        for call in reversed(span.tool_calls):
+            if call.name == tool.name and call.end is None:
+                call.end = time.time()
+                call.error = error
+                return
+
+    async def after_tool_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: dict[str, Any],
+        tool_context: ToolContext,
+        result: dict,
+    ) -> None:
+        self._end_tool(tool, tool_context)
+        return None
+
+    async def on_tool_error_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: dict[str, Any],
+        tool_context: ToolContext,
+        error: Exception,
+    ) -> None:
+        self._end_tool(tool, tool_context, f"{type(error).__name__}: {error}")
+        return None
@@ -0,0 +1,76 @@
+"""Test the local ATS keyword scorer."""
+import asyncio
+import time
+from pathlib import Path
+
+# Imported first: sets a placeholder GOOGLE_API_KEY before config loads
+from benchmarks.stubs import SAMPLE_CV_TEXT, stub_tika
+from benchmarks.fake_model import fake_model_factory
+from cv_formatter.ats_score import ATSScorer, score_cv, tokenize
+from cv_formatter.config import config
+from cv_formatter.orchestrator import CVFormatterOrchestrator
+
+ROOT = Path(__file__).parent
+
+print("ATS Score Test")
+print("=" * 50)
+
+config.text_cache_enabled = False
+config.analysis_memo_enabled = False
+config.company_cache_enabled = False
+config.incremental_rerun = False
+
+assert tokenize("Strong C++ and C# — node.js, “ML” models; strategies") == [
+    "c++", "c#", "node", "js", "ml", "model", "strategy"
+]
+print("✓ Tokenizer keeps C++/C#, drops stopwords and folds plurals")
+
+jd_text = (ROOT / "sample_JD.txt").read_text(encoding="utf-8")
+scorer = ATSScorer(jd_text)
+assert "machine learning" in scorer.keywords and "data mining" in scorer.keywords
+assert "analysis data" not in scorer.keywords  # "statistical analysis and data-mining"
+assert list(scorer.keywords)[0] == "trading"
+print("✓ Keywords and repeated phrases extracted from the JD")
+
+tailored = SAMPLE_CV_TEXT + "\n- Machine learning and data mining for trading strategies in C++"
+before, after = scorer.score(SAMPLE_CV_TEXT), scorer.score(tailored)
+assert after.score > before.score and after.coverage > before.coverage
+assert "machine learning" in after.matched and "data mining" in before.missing
+assert "trading strategies" in after.matched  # reported as the JD writes it
+assert score_cv(tailored, jd_text) == after and 0 <= after.score <= 100
+assert ATSScorer("").score(SAMPLE_CV_TEXT).score == 0
+print(f"✓ Keyword coverage raises the score: {before.score} -> {after.score}")
+
+cvs = [f"{SAMPLE_CV_TEXT}\nREFERENCE {i}" for i in range(2000)]
+start = time.perf_counter()
+scores = scorer.score_many(cvs)
+elapsed = time.perf_counter() - start
+assert len(scores) == len(cvs) and elapsed < 2, elapsed
+print(f"✓ {len(cvs) / elapsed:.0f} CVs/s against one JD")
+
+
+async def main() -> None:
+    orchestrator = CVFormatterOrchestrator(model_factory=fake_model_factory())
+    result = await orchestrator.format_cv_detailed(ROOT / "some_CV.pdf", ROOT / "sample_JD.txt")
+    assert result.ats is not None
+    assert result.ats.before == score_cv(SAMPLE_CV_TEXT, jd_text)
+    assert result.ats.after == score_cv(result.cv, jd_text)
+    assert result.trace.find("ATS_Score").kind == "scoring"
+    print(f"✓ Results carry the before/after score ({result.ats.delta:+.1f})")
+
+    config.ats_score = False
+    result = await orchestrator.format_cv_detailed(ROOT / "some_CV.pdf", ROOT / "sample_JD.txt")
+    assert result.ats is None and result.trace.find("ATS_Score") is None
+    config.ats_score = True
+    orchestrator.close()
+    print("✓ Scoring can be turned off")
+
+
+server = stub_tika()
+try:
+    asyncio.run(main())
+finally:
+    server.stop()
+
+print("=" * 50)
+print("\n✓ All ATS score tests passed!")
@@ -0,0 +1,58 @@
+"""Test batch output naming: every pair gets its own output file."""
+import asyncio
+import shutil
+import tempfile
+from pathlib import Path
+
+# Imported first: sets a placeholder GOOGLE_API_KEY before config loads
+from benchmarks.stubs import stub_tika
+from benchmarks.fake_model import fake_model_factory
+from cv_formatter.batch import BatchJob, BatchRunner
+from cv_formatter.config import config
+from cv_formatter.orchestrator import CVFormatterOrchestrator
+
+ROOT = Path(__file__).parent
+
+print("Batch Test")
+print("=" * 50)
+
+config.incremental_rerun = False
+
+
+async def main(tmp: Path) -> None:
+    for folder in ("a", "b"):
+        (tmp / folder).mkdir()
+        shutil.copy(ROOT / "some_CV.pdf", tmp / folder / "cv.pdf")
+    jd = ROOT / "sample_JD.txt"
+    orchestrator = CVFormatterOrchestrator(model_factory=fake_model_factory())
+    try:
+        runner = BatchRunner(orchestrator, output_dir=tmp / "out")
+        jobs = [BatchJob(tmp / "a" / "cv.pdf", jd), BatchJob(tmp / "b" / "cv.pdf", jd)]
+        report = await runner.run(jobs)
+        paths = [result.output_path for result in report.results]
+        assert report.succeeded == 2 and len(set(paths)) == 2, paths
+        assert all(path.exists() and path.name.startswith("cv__sample_JD__") for path in paths)
+        assert runner.output_paths(jobs[:1]) == [tmp / "out" / "cv__sample_JD.txt"]
+        print("✓ Pairs with the same file names write distinct outputs")
+
+        explicit = [BatchJob(job.cv_path, jd, tmp / "out.txt") for job in jobs]
+        try:
+            await runner.run(explicit)
+        except ValueError as e:
+            assert "Several pairs write to" in str(e)
+        else:
+            raise AssertionError("pairs sharing an output path were run")
+        print("✓ Pairs given the same output path are rejected")
+    finally:
+        orchestrator.close()
+
+
+server = stub_tika()
+try:
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(main(Path(tmp)))
+finally:
+    server.stop()
+
+print("=" * 50)
+print("\n✓ All batch tests passed!")
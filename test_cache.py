@@ -0,0 +1,70 @@
+"""Test the extracted-text cache."""
+import os
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("GOOGLE_API_KEY", "test-placeholder")
+
+from cv_formatter.cache import DiskCache, LRUCache, TieredCache, content_key
+from cv_formatter.parsers import TextParser
+
+print("Cache Test")
+print("=" * 50)
+
+# Memory tier evicts the least recently used entry
+lru = LRUCache(max_entries=2)
+lru.set("a", "1")
+lru.set("b", "2")
+lru.get("a")
+lru.set("c", "3")
+assert lru.get("b") is None and lru.get("a") == "1" and lru.get("c") == "3"
+print("✓ LRU eviction")
+
+# Entries expire after the TTL
+lru = LRUCache(ttl=0.05)
+lru.set("a", "1")
+time.sleep(0.1)
+assert lru.get("a") is None
+print("✓ TTL expiry")
+
+with tempfile.TemporaryDirectory() as tmp:
+    # Disk tier stays within its size budget
+    disk = DiskCache(Path(tmp) / "disk", max_bytes=2000)
+    for i in range(10):
+        disk.set(f"k{i}", "x" * 500)
+    total = sum(p.stat().st_size for p in (Path(tmp) / "disk").glob("*.json"))
+    assert total <= 2000 and disk.get("k9") is not None
+    print("✓ Disk size-based eviction")
+
+    # Entries that parse but aren't entries are dropped, not raised
+    bad_entries = ['{"value": "x"}', '{"created": 1}', '[1, 2]', '{"created": "x", "value": "y"}']
+    for i, entry in enumerate(bad_entries):
+        (Path(tmp) / "disk" / f"bad{i}.json").write_text(entry, encoding="utf-8")
+        assert disk.get(f"bad{i}") is None
+        assert not (Path(tmp) / "disk" / f"bad{i}.json").exists()
+    print("✓ Corrupt disk entries are dropped")
+
+    # Parser results are keyed by content, not path
+    cache = TieredCache(LRUCache(), DiskCache(Path(tmp) / "text"))
+    parser = TextParser(cache=cache)
+    first = Path(tmp) / "jd1.txt"
+    second = Path(tmp) / "jd2.txt"
+    first.write_text("\ufeffSenior Engineer  \r\nPython\r\n\r\n", encoding="utf-8")
+    second.write_bytes(first.read_bytes())
+    assert parser.read_file(first) == "Senior Engineer\nPython"
+    assert parser.read_file(second) == "Senior Engineer\nPython"
+    assert cache.stats.misses == 1 and cache.stats.memory_hits == 1
+    print("✓ Content-addressed parser cache")
+
+    # A fresh memory tier is refilled from disk
+    cache.memory.clear()
+    parser.read_file(first)
+    assert cache.stats.disk_hits == 1
+    print("✓ Disk tier hit")
+
+assert content_key("ab", "c") != content_key("a", "bc")
+print("✓ Unambiguous keys")
+
+print("=" * 50)
+print("\n✓ All cache tests passed!")
@@ -0,0 +1,33 @@
+"""Test company name extraction and normalization."""
+from pathlib import Path
+
+from cv_formatter.company import extract_company_name, normalize_company_name
+
+print("Company Extraction Test")
+print("=" * 50)
+
+sample_jd = (Path(__file__).parent / "sample_JD.txt").read_text(encoding="utf-8")
+assert normalize_company_name(extract_company_name(sample_jd)) == "minix meril"
+print("✓ Sample JD")
+
+assert extract_company_name("We are hiring!\nCompany: Acme Corp.\n") == "Acme Corp"
+assert extract_company_name("Senior role", "**Company:** Globex Corporation") == "Globex Corporation"
+print("✓ Explicit labels")
+
+assert extract_company_name("About Initech\nWe build software.") == "Initech"
+assert extract_company_name("About the job\nNothing here.") is None
+print("✓ About headings")
+
+# Repeated phrases such as job titles are not taken for the employer
+assert extract_company_name(
+    "Machine Learning Engineer\nJoin our Machine Learning team.\n"
+    "Required Skills: Python\nMachine Learning experience. Required Skills above."
+) is None
+print("✓ No guess without a label, org line or About heading")
+
+assert normalize_company_name("Minix Meril Group, Inc.") == "minix meril"
+assert normalize_company_name("ACME  corp") == normalize_company_name("Acme")
+print("✓ Normalization")
+
+print("=" * 50)
+print("\n✓ All company tests passed!")
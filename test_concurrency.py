@@ -0,0 +1,103 @@
+"""Stress test: concurrent runs on one orchestrator never mix their outputs."""
+import asyncio
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+# Imported first: sets a placeholder GOOGLE_API_KEY before config loads
+from benchmarks.stubs import stub_tika
+from benchmarks.fake_model import FakeGemini, parser_tool_args
+from cv_formatter.config import config
+from cv_formatter.orchestrator import CVFormatterOrchestrator
+
+REQUESTS = 40
+MARKER_RE = re.compile(r"REQ-\d+")
+
+print("Concurrency Test")
+print("=" * 50)
+
+# Every run must compute its own analyses and company research
+config.text_cache_enabled = False
+config.analysis_memo_enabled = False
+config.company_cache_enabled = False
+config.incremental_rerun = False
+
+
+def echo_markers(agent_name: str):
+    """Answer with the request markers the agent can see in its prompt."""
+
+    def respond(llm_request) -> str:
+        prompt = str(llm_request.config.system_instruction or "")
+        for content in llm_request.contents:
+            prompt += "".join(part.text or "" for part in content.parts or [])
+        return f"{agent_name}: " + " ".join(sorted(set(MARKER_RE.findall(prompt))))
+
+    return respond
+
+
+def model_factory(agent_name: str) -> FakeGemini:
+    # Different latencies per agent interleave the runs' events
+    latency = {"CV_Agent": 0.03, "JD_Agent": 0.01, "Company_Agent": 0.02}.get(agent_name, 0.015)
+    return FakeGemini(
+        agent_name=agent_name,
+        latency=latency,
+        tool_args=parser_tool_args,
+        respond=echo_markers(agent_name),
+    )
+
+
+async def main(tmp: Path) -> None:
+    original_stderr = sys.stderr
+    orchestrator = CVFormatterOrchestrator(model_factory=model_factory)
+    cv_path = Path(__file__).parent / "some_CV.pdf"
+
+    jd_paths = []
+    for i in range(REQUESTS):
+        jd_path = tmp / f"jd_{i}.txt"
+        jd_path.write_text(f"Company: Org {i}\nRole REQ-{i}\nPython", encoding="utf-8")
+        jd_paths.append(jd_path)
+
+    async def run(i: int) -> str:
+        if i % 2:
+            return "".join([chunk async for chunk in orchestrator.format_cv_stream(cv_path, jd_paths[i])])
+        return await orchestrator.format_cv(cv_path, jd_paths[i])
+
+    outputs = await asyncio.gather(*(run(i) for i in range(REQUESTS)))
+    for i, output in enumerate(outputs):
+        assert output.startswith("Rewrite_Agent:"), output
+        assert set(MARKER_RE.findall(output)) == {f"REQ-{i}"}, f"request {i} got {output!r}"
+    print(f"✓ {REQUESTS} concurrent runs kept their own outputs")
+
+    sessions = await orchestrator.session_service.list_sessions(
+        app_name=config.app_name, user_id=config.user_id
+    )
+    assert not sessions.sessions, f"{len(sessions.sessions)} sessions left behind"
+    print("✓ Ephemeral sessions deleted")
+
+    assert sys.stderr is original_stderr
+    print("✓ stderr restored after overlapping runs")
+
+    # A named session is kept for the caller
+    await orchestrator.format_cv(cv_path, jd_paths[0], session_id="kept")
+    assert await orchestrator.session_service.get_session(
+        app_name=config.app_name, user_id=config.user_id, session_id="kept"
+    ) is not None
+    print("✓ Named sessions kept")
+
+    # Company research needs only the JD text, so it overlaps CV_Agent
+    result = await orchestrator.format_cv_detailed(cv_path, jd_paths[1])
+    company, cv = result.trace.find("Company_Agent"), result.trace.find("CV_Agent")
+    assert company.start < cv.end, (company.start, cv.end)
+    print("✓ Company research runs alongside the CV analysis")
+
+
+server = stub_tika()
+try:
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(main(Path(tmp)))
+finally:
+    server.stop()
+
+print("=" * 50)
+print("\n✓ All concurrency tests passed!")
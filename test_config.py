@@ -1,8 +1,26 @@
 """Test configuration loading."""
+import subprocess
+import sys
+
 from cv_formatter.config import config
 
 print("Configuration Test")
 print("=" * 50)
+
+# --help is answered without loading the configuration (in a fresh process,
+# as the configuration may already be loaded in this one)
+for name in ("main", "batch", "server", "cv_index"):
+    check = (
+        f"import contextlib, io, sys; sys.argv = ['{name}', '--help']\n"
+        f"from cv_formatter import {name}\n"
+        "from cv_formatter.config import config\n"
+        "with contextlib.redirect_stdout(io.StringIO()), contextlib.suppress(SystemExit):\n"
+        f"    {name}.parse_arguments()\n"
+        "sys.exit(config.is_loaded or 'google.adk' in sys.modules)\n"
+    )
+    assert subprocess.run([sys.executable, "-c", check]).returncode == 0, name
+print("✓ --help leaves the configuration and the agent stack unloaded")
+
 print(f"API Key Configured: {'✓' if config.is_configured else '✗'}")
 print(f"Model Name: {config.model_name}")
 print(f"App Name: {config.app_name}")
@@ -0,0 +1,121 @@
+"""Test the on-disk CV index: ingestion, incremental updates and search."""
+import asyncio
+import random
+import shutil
+import tempfile
+from pathlib import Path
+
+# Imported first: sets a placeholder GOOGLE_API_KEY before config loads
+from benchmarks.stubs import stub_tika
+from cv_formatter.config import config
+from cv_formatter.cv_index import MERGE_FACTOR, CVIndex
+
+ROOT = Path(__file__).parent
+
+print("CV Index Test")
+print("=" * 50)
+
+config.text_cache_enabled = False
+
+WEB_CV = """JANE ROE
+Frontend Developer
+
+SKILLS
+- JavaScript, TypeScript, React, CSS
+
+EXPERIENCE
+- Built responsive web applications and design systems
+"""
+TRADING_CV = """RICHARD ROE
+Quantitative Developer
+
+SKILLS
+- C++, Python, Linux, low-latency systems
+
+EXPERIENCE
+- Electronic trading infrastructure and execution strategies
+"""
+JD_TEXT = (ROOT / "sample_JD.txt").read_text(encoding="utf-8")
+
+
+async def main(tmp: Path) -> None:
+    cvs = tmp / "cvs"
+    cvs.mkdir()
+    shutil.copy(ROOT / "some_CV.pdf", cvs / "quant.pdf")
+    (cvs / "web.txt").write_text(WEB_CV, encoding="utf-8")
+    (cvs / "nested").mkdir()
+    (cvs / "nested" / "trading.md").write_text(TRADING_CV, encoding="utf-8")
+    (cvs / "notes.csv").write_text("not a CV", encoding="utf-8")
+
+    index = CVIndex(tmp / "index.db")
+    report = await index.ingest(cvs)
+    assert (report.added, report.unchanged, report.failed) == (3, 0, 0), report
+    assert len(index) == 3 and cvs / "web.txt" in index
+    print("✓ PDFs and text files under a directory are ingested")
+
+    candidates = index.search(JD_TEXT, k=3)
+    # The web developer's CV shares no keyword with the JD
+    assert [Path(c.path).name for c in candidates] == ["quant.pdf", "trading.md"]
+    assert "trading" in candidates[0].matched and "python" in candidates[1].matched
+    assert candidates[0].score > candidates[1].score > 0
+    assert index.search(JD_TEXT, k=1) == candidates[:1]
+    assert await index.search_file(ROOT / "sample_JD.txt", k=3) == candidates
+    print(f"✓ The matching CVs rank first: {', '.join(Path(c.path).name for c in candidates)}")
+
+    report = await index.ingest(cvs)
+    assert (report.added, report.updated, report.unchanged) == (0, 0, 3), report
+    (cvs / "web.txt").write_text(WEB_CV + "- Python trading dashboards\n", encoding="utf-8")
+    (cvs / "nested" / "trading.md").unlink()
+    report = await index.ingest(cvs)
+    assert (report.updated, report.unchanged, report.removed) == (1, 1, 1), report
+    found = index.search(JD_TEXT, k=3)
+    assert [Path(c.path).name for c in found] == ["quant.pdf", "web.txt"]
+    assert "trading" in found[1].matched
+    print("✓ Re-ingesting reads only changed files and drops deleted ones")
+
+    index.close()
+    reopened = CVIndex(tmp / "index.db")
+    assert len(reopened) == 2 and reopened.search(JD_TEXT, k=3) == found
+    assert reopened.remove(cvs / "quant.pdf") and not reopened.remove(cvs / "quant.pdf")
+    assert [Path(c.path).name for c in reopened.search(JD_TEXT, k=3)] == ["web.txt"]
+    reopened.close()
+    print("✓ The index persists on disk")
+
+
+def check_pruning(tmp: Path) -> None:
+    """Pruned search ranks as an exhaustive one, across merges and removals."""
+    rng = random.Random(7)
+    words = ["python", "c++", "linux", "trading", "regression", "forecasting", "matlab",
+             "statistics", "market", "data", "model", "research", "java", "react", "sql"]
+    words += [f"filler{i}" for i in range(200)]
+    index = CVIndex(tmp / "pruning.db")
+    for batch in range(3 * MERGE_FACTOR):
+        index.add_many([
+            (f"/cvs/{batch}-{i}.txt", " ".join(rng.choices(words, k=rng.randint(30, 300))))
+            for i in range(25)
+        ])
+    assert index.segments < MERGE_FACTOR, index.segments
+    removed = [f"/cvs/{batch}-0.txt" for batch in range(0, 3 * MERGE_FACTOR, 2)]
+    assert index.remove_many(removed) == len(removed)
+
+    for k in (1, 10, 50):
+        fast = index.search(JD_TEXT, k)
+        exact = index.search(JD_TEXT, k, exhaustive=True)
+        assert [c.path for c in fast] == [c.path for c in exact]
+        assert all(abs(a.score - b.score) < 1e-6 for a, b in zip(fast, exact))
+        assert not {c.path for c in fast} & set(removed)
+
+    index.close()
+    print(f"✓ Pruned search matches an exhaustive one ({len(index)} CVs)")
+
+
+server = stub_tika()
+try:
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(main(Path(tmp)))
+        check_pruning(Path(tmp))
+finally:
+    server.stop()
+
+print("=" * 50)
+print("\n✓ All CV index tests passed!")
@@ -1,5 +1,21 @@
 """Test the formatter module."""
-from cv_formatter.formatter import format_output
+import asyncio
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from cv_formatter.formatter import (
+    Renderer,
+    Template,
+    format_as_html,
+    format_as_markdown,
+    format_output,
+    format_stream,
+    format_stream_async,
+    write_formatted,
+)
+from cv_formatter.structured import StructuredCV
 
 # Sample CV text
 sample_cv = """JOHN DOE
@@ -40,4 +56,93 @@ print("TESTING HTML FORMAT")
 print("=" * 80)
 html = format_output(sample_cv, "html")
 print(html[:500] + "...")
+
+print("\n" + "=" * 80)
+print("TESTING STREAMING FORMATTER")
+print("=" * 80)
+timestamp = "2024-01-02 03:04:05"
+texts = [sample_cv, "", "A\n\n\nB", "SKILLS\n\n\n\n  \n\nPython " * 30 + "\n\n", "x" * 150]
+for text in texts:
+    expected = {
+        "plain": text,
+        "markdown": format_as_markdown(text, timestamp),
+        "html": format_as_html(text, timestamp),
+    }
+    for format_type, document in expected.items():
+        for size in (1, 2, 7, 64, len(text) + 1):
+            chunks = [text[i:i + size] for i in range(0, len(text), size)]
+            assert "".join(format_stream(chunks, format_type, timestamp)) == document
+        out = io.StringIO()
+        write_formatted(iter([text]), out, format_type, timestamp)
+        assert out.getvalue() == document
+
+
+async def from_chunks(text):
+    for i in range(0, len(text), 5):
+        yield text[i:i + 5]
+
+
+async def collect(text, format_type):
+    return "".join([part async for part in format_stream_async(from_chunks(text), format_type, timestamp)])
+
+assert asyncio.run(collect(sample_cv, "html")) == format_as_html(sample_cv, timestamp)
+print("✓ Streamed output matches the whole-text formatters byte for byte")
+
+print("\n" + "=" * 80)
+print("TESTING RENDERER")
+print("=" * 80)
+renderer = Renderer("html")
+documents = renderer.render_many([sample_cv, "x" * 150], timestamp)
+assert documents[0].decode("utf-8") == format_as_html(sample_cv, timestamp)
+assert documents[1].decode("utf-8") == format_as_html("x" * 150, timestamp)
+print("✓ Bulk rendering matches format_as_html")
+
+custom = Renderer(Template("<main data-css='{ color: red }'>{content}</main>\n<!-- {timestamp} -->\n", True))
+assert custom.render("SKILLS\n\n- Python\n- C++", timestamp) == (
+    "<main data-css='{ color: red }'><h2>SKILLS</h2>\n<p>- Python<br>\n- C++</p></main>\n"
+    f"<!-- {timestamp} -->\n"
+)
+try:
+    Renderer(Template("no slot"))
+except ValueError:
+    pass
+else:
+    raise AssertionError("a template without {content} must be rejected")
+with tempfile.TemporaryDirectory() as tmp:
+    paths = [Path(tmp) / f"{i}.md" for i in range(3)]
+    assert Renderer("markdown").write_many([(path, sample_cv) for path in paths], timestamp) == 3
+    assert all(path.read_text(encoding="utf-8") == format_as_markdown(sample_cv, timestamp) for path in paths)
+print("✓ Custom templates and bulk writes")
+
+print("\n" + "=" * 80)
+print("TESTING STRUCTURED CV")
+print("=" * 80)
+structured = StructuredCV.parse(sample_cv)
+assert structured.header == ("JOHN DOE", "Senior Software Engineer")
+assert [section.name for section in structured.sections] == [
+    "PROFESSIONAL SUMMARY", "SKILLS", "EXPERIENCE", "EDUCATION"
+]
+experience = structured.section("Experience")
+assert not experience.entries[0].bullet and len(experience.bullets) == 3
+assert structured.to_text() == sample_cv
+assert StructuredCV.parse(structured.to_text()) == structured
+assert StructuredCV.parse("## Skills:\n* Python\n\nOPEN SOURCE\n- numpy").section("open source").bullets == ["numpy"]
+print("✓ Sections parsed, plain text round-trips")
+
+document = format_output(sample_cv, "json")
+assert StructuredCV.from_dict(json.loads(document)) == structured
+assert format_output(structured, "json") == document
+for format_type in ("plain", "markdown", "html"):
+    assert format_output(structured, format_type)
+html_sections = format_as_html(StructuredCV.parse("SKILLS\n- C++ <templates>"), timestamp)
+assert "<h2>SKILLS</h2>\n<ul>\n<li>C++ &lt;templates&gt;</li>\n</ul>" in html_sections
+assert "## EXPERIENCE\n\nSenior Software Engineer | Tech Corp | 2020-Present\n- Led" in format_as_markdown(structured)
+assert "".join(format_stream(["SKILLS\n", "- Python"], "json")) == StructuredCV.parse("SKILLS\n- Python").to_json()
+try:
+    StructuredCV.from_dict({"sections": [{"name": " ", "entries": []}]})
+except ValueError:
+    pass
+else:
+    raise AssertionError("a section without a name must be rejected")
+print("✓ JSON, plain, Markdown and HTML rendered from one section model")
 print("\n✓ All formatters working!")
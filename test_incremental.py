@@ -0,0 +1,130 @@
+"""Test incremental reruns: only stages whose inputs changed run again."""
+import asyncio
+import tempfile
+from pathlib import Path
+
+# Imported first: sets a placeholder GOOGLE_API_KEY before config loads
+from benchmarks.stubs import stub_tika
+from benchmarks.fake_model import FakeGemini, ModelCallStats, fake_model_factory
+from cv_formatter.agents import StageReuse
+from cv_formatter.cache import content_key
+from cv_formatter.config import config
+from cv_formatter.orchestrator import CVFormatterOrchestrator
+
+ROOT = Path(__file__).parent
+
+print("Incremental Rerun Test")
+print("=" * 50)
+
+# Only the previous run's outputs may be reused, not the caches
+config.text_cache_enabled = False
+config.analysis_memo_enabled = False
+config.company_cache_enabled = False
+
+
+def model_factory():
+    """Fake models whose JD analysis depends on the JD text."""
+    stats = ModelCallStats()
+    default = fake_model_factory(stats=stats)
+
+    def factory(agent_name: str) -> FakeGemini:
+        if agent_name != "JD_Agent":
+            return default(agent_name)
+        return FakeGemini(
+            agent_name=agent_name,
+            stats=stats,
+            respond=lambda request: "JD analysis " + content_key(
+                str(request.config.system_instruction)
+            ),
+        )
+
+    factory.stats = stats
+    return factory
+
+
+async def main(tmp: Path) -> None:
+    cv_path = ROOT / "some_CV.pdf"
+    jd_path = tmp / "jd.txt"
+    factory = model_factory()
+    reuse = StageReuse(tmp / "last_run.json")
+    orchestrator = CVFormatterOrchestrator(model_factory=factory, reuse=reuse)
+
+    async def run(jd_text: str):
+        jd_path.write_text(jd_text, encoding="utf-8")
+        factory.stats.reset()
+        result = await orchestrator.format_cv_detailed(cv_path, jd_path)
+        return set(factory.stats.calls), result
+
+    called, result = await run("Company: Minix Meril Group\nQuant Researcher\nPython")
+    assert called == {"CV_Agent", "JD_Agent", "Company_Agent", "Rewrite_Agent"}
+    assert result.skipped_stages == []
+    print("✓ First run computes every stage")
+
+    called, result = await run("Company: Minix Meril Group\nQuant Researcher\nPython, C++")
+    assert called == {"JD_Agent", "Rewrite_Agent"}, called
+    assert result.skipped_stages == ["CV_Extraction", "CV_Agent", "Company_Agent"]
+    assert "unchanged, skipped" in result.trace.summary()
+    print("✓ Edited JD reruns only JD_Agent and Rewrite_Agent")
+
+    called, result = await run("Company: Alpha Capital\nQuant Researcher\nPython, C++")
+    assert called == {"JD_Agent", "Company_Agent", "Rewrite_Agent"}, called
+    print("✓ Company_Agent reruns when the company changes")
+
+    called, result = await run("Company: Alpha Capital\nQuant Researcher\nPython, C++")
+    assert called == set(), called
+    assert "Rewrite_Agent" in result.skipped_stages and result.cv
+    print("✓ Identical rerun skips every stage")
+
+    # Settings that shape the prompt are part of the rewrite's key
+    budget, config.rewrite_prompt_budget = config.rewrite_prompt_budget, 5000
+    orchestrator = CVFormatterOrchestrator(model_factory=factory, reuse=reuse)
+    called, result = await run("Company: Alpha Capital\nQuant Researcher\nPython, C++")
+    assert called == {"Rewrite_Agent"}, called
+    config.rewrite_prompt_budget = budget
+    print("✓ A changed prompt budget reruns Rewrite_Agent")
+
+    # The extraction's key covers the PDF engine, like the text cache's
+    engine, config.pdf_engine = config.pdf_engine, "pdfminer"
+    orchestrator = CVFormatterOrchestrator(model_factory=factory, reuse=reuse)
+    called, result = await run("Company: Alpha Capital\nQuant Researcher\nPython, C++")
+    assert "CV_Extraction" not in result.skipped_stages, result.skipped_stages
+    config.pdf_engine = engine
+    orchestrator = CVFormatterOrchestrator(model_factory=factory, reuse=reuse)
+    called, result = await run("Company: Alpha Capital\nQuant Researcher\nPython, C++")
+    assert "CV_Extraction" not in result.skipped_stages, result.skipped_stages
+    print("✓ A changed PDF engine extracts the CV again")
+
+    # A new process picks up the saved outputs
+    orchestrator = CVFormatterOrchestrator(
+        model_factory=factory, reuse=StageReuse(tmp / "last_run.json")
+    )
+    called, result = await run("Company: Alpha Capital\nQuant Researcher\nPython, Rust")
+    assert called == {"JD_Agent", "Rewrite_Agent"}, called
+    print("✓ Outputs saved for the next process")
+
+    # Without a company name the research is only reused for the same JD
+    called, _ = await run("Machine Learning Engineer\nMachine Learning team\nPython")
+    assert "Company_Agent" in called, called
+    called, _ = await run("Machine Learning Engineer\nMachine Learning team\nPython")
+    assert "Company_Agent" not in called, called
+    called, _ = await run("Machine Learning Researcher\nMachine Learning lab\nPython")
+    assert "Company_Agent" in called, called
+    print("✓ Research for a JD without a company name is keyed on its text")
+
+    reuse.clear()
+    orchestrator = CVFormatterOrchestrator(model_factory=factory, reuse=reuse)
+    called, _ = await run("Company: Alpha Capital\nQuant Researcher\nPython, Rust")
+    assert called == {"CV_Agent", "JD_Agent", "Company_Agent", "Rewrite_Agent"}, called
+    print("✓ clear() forces a full run")
+    orchestrator.close()
+
+
+server = stub_tika()
+try:
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(main(Path(tmp)))
+finally:
+    server.stop()
+
+print("=" * 50)
+print("\n✓ All incremental rerun tests passed!")
@@ -0,0 +1,53 @@
+"""Test CPU-bound stages run in the process pool."""
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("GOOGLE_API_KEY", "test-placeholder")
+
+from cv_formatter.config import config
+from cv_formatter.formatter import format_output, format_output_async
+from cv_formatter.parsers import PDFParser, TextParser
+from cv_formatter.process_pool import get_process_pool, run_cpu_bound, shutdown_process_pool
+
+ROOT = Path(__file__).parent
+
+
+async def main(tmp: Path) -> None:
+    config.cpu_workers = 2
+    assert await run_cpu_bound(os.getpid) != os.getpid()
+    print("✓ Work runs in worker processes")
+
+    parser = PDFParser(engine="pdfminer", cache=None)
+    pdf_path = ROOT / "some_CV.pdf"
+    assert await parser.extract_text_async(pdf_path) == parser.extract_text(pdf_path)
+    print("✓ Async PDF extraction matches extract_text")
+
+    jd_path = tmp / "jd.txt"
+    jd_path.write_bytes(b"\xef\xbb\xbfSenior Engineer  \r\nPython\r\n\r\n")
+    text_parser = TextParser(cache=None)
+    assert await text_parser.read_file_async(jd_path) == text_parser.read_file(jd_path)
+    print("✓ Async text cleaning matches read_file")
+
+    html = await format_output_async("SUMMARY\n\nLine one\nLine two", "html")
+    assert "<h2>SUMMARY</h2>" in html and "<p>Line one<br>\nLine two</p>" in html
+    assert await format_output_async("text", "plain") == format_output("text", "plain")
+    print("✓ Async formatting")
+
+    # With no workers configured, the same calls run in threads
+    shutdown_process_pool()
+    config.cpu_workers = 0
+    assert get_process_pool() is None
+    assert await run_cpu_bound(os.getpid) == os.getpid()
+    print("✓ CPU_WORKERS=0 falls back to threads")
+
+
+# Worker processes are spawned and re-import this script, so guard the test
+if __name__ == "__main__":
+    print("Process Pool Test")
+    print("=" * 50)
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(main(Path(tmp)))
+    print("=" * 50)
+    print("\n✓ All process pool tests passed!")
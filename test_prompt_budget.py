@@ -0,0 +1,86 @@
+"""Test token-budgeted assembly of the Rewrite_Agent prompt."""
+import os
+
+os.environ.setdefault("GOOGLE_API_KEY", "test-placeholder")
+
+from cv_formatter.agents import RewriteAgent
+from cv_formatter.prompt_budget import (
+    TRIMMED_MARKER,
+    assemble_slots,
+    count_tokens,
+    fill_template,
+    is_section_heading,
+    split_sections,
+)
+
+print("Prompt Budget Test")
+print("=" * 50)
+
+papers = "\n".join(
+    f"- Paper {i} on stochastic control and option pricing in regime-switching markets"
+    for i in range(400)
+)
+cv_text = (
+    "JANE DOE\njane@example.com\n\n"
+    "PROFESSIONAL SUMMARY\nQuantitative researcher with ten years of experience.\n\n"
+    "SKILLS\n- Python, C++\n\n"
+    "Academic Qualifications\nPh.D. Mathematics, 2013\n\n"
+    f"PUBLICATIONS\n{papers}\n\n"
+    "AWARDS\n- Best Thesis Award, 2013"
+)
+slots = {
+    "CV_context": "Candidate profile:\n" + papers + "\nStrong fit for quant roles.",
+    "JD_context": "Requirements: Python, forecasting. " * 200,
+    "Company_context": "Research-driven trading firm. " * 400,
+    "CV_text": cv_text,
+}
+
+headings = [section[0] for section in split_sections(cv_text)][1:]
+assert headings == [
+    "PROFESSIONAL SUMMARY", "SKILLS", "Academic Qualifications", "PUBLICATIONS", "AWARDS"
+], headings
+for title in ("Research Scientist", "Research Engineer, Meta", "Teaching Assistant (2015)"):
+    assert not is_section_heading(title), title
+assert is_section_heading("Research Experience") and is_section_heading("RESEARCH AND TEACHING")
+print("✓ Section headings detected")
+
+assembly = assemble_slots(slots, budget=None)
+reports = {report.name: report for report in assembly.reports}
+assert reports["CV_context"].deduped_lines == 400
+assert "Strong fit" in assembly.slots["CV_context"] and "Paper 7 " not in assembly.slots["CV_context"]
+assert assembly.slots["CV_text"] == cv_text
+print("✓ CV_context lines repeated in CV_text are dropped")
+
+small = {"CV_context": "Profile", "JD_context": "Python", "Company_context": "Acme", "CV_text": "SKILLS\n- Python"}
+assert assemble_slots(small, budget=4000).slots == small
+print("✓ Prompts under budget are unchanged")
+
+budget = 3000
+assembly = assemble_slots(slots, budget=budget, fixed_tokens=500)
+reports = {report.name: report for report in assembly.reports}
+assert assembly.tokens_after <= budget * 1.02, assembly.as_dict()
+assert reports["Company_context"].trimmed and reports["Company_context"].tokens_after <= 200
+assert assembly.slots["Company_context"].endswith(TRIMMED_MARKER)
+fitted_cv = assembly.slots["CV_text"]
+assert reports["CV_text"].trimmed and count_tokens(fitted_cv) < count_tokens(cv_text)
+assert all(heading in fitted_cv for heading in headings) and "JANE DOE" in fitted_cv
+assert "Best Thesis Award" in fitted_cv and "more lines]" in fitted_cv
+print("✓ Lower-priority slots trimmed first, every CV section kept")
+
+assert fill_template("{a} and {b}", {"a": "{b}", "b": "x"}) == "{b} and x"
+print("✓ Slot values are substituted once")
+
+agent = RewriteAgent(model="fake-model", prompt_budget=budget)
+instruction = agent.build_instruction(type("Context", (), {"state": slots})())
+assert "{CV_text}" not in instruction and "Best Thesis Award" in instruction
+assert count_tokens(instruction) <= budget * 1.05
+try:
+    agent.assemble({"CV_text": cv_text})
+except KeyError as e:
+    assert "CV_context" in str(e)
+else:
+    raise AssertionError("missing slots must raise KeyError")
+print("✓ Rewrite_Agent builds its instruction within the budget")
+
+print("=" * 50)
+print("\n✓ All prompt budget tests passed!")
@@ -0,0 +1,79 @@
+"""Test the model call scheduler against a throttling fake model."""
+import asyncio
+import os
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "test-placeholder")
+
+from google.adk.models.llm_request import LlmRequest
+from google.genai import errors, types
+
+from benchmarks.fake_model import FakeGemini, ModelCallStats
+from cv_formatter.scheduler import ModelScheduler, ScheduledModel, TokenBucket
+
+print("Scheduler Test")
+print("=" * 50)
+
+
+def request() -> LlmRequest:
+    return LlmRequest(contents=[types.Content(role="user", parts=[types.Part(text="hi")])])
+
+
+async def call(model: ScheduledModel) -> str:
+    responses = [r async for r in model.generate_content_async(request())]
+    return responses[-1].content.parts[0].text
+
+
+async def main():
+    # In-flight requests never exceed the global cap
+    stats = ModelCallStats()
+    scheduler = ModelScheduler(max_concurrency=3)
+    model = ScheduledModel(FakeGemini(latency=0.02, stats=stats), scheduler)
+    await asyncio.gather(*(call(model) for _ in range(12)))
+    assert stats.max_in_flight == 3 and scheduler.stats.requests == 12
+    assert scheduler.stats.max_wait_seconds > 0 and scheduler.stats.queued == 0
+    print("✓ Global concurrency cap")
+
+    # The per-model cap applies to each model name separately
+    stats = ModelCallStats()
+    scheduler = ModelScheduler(max_concurrency=8, per_model_concurrency=1)
+    flash = ScheduledModel(FakeGemini(latency=0.02, stats=stats), scheduler)
+    pro = ScheduledModel(FakeGemini(model="gemini-2.5-pro", latency=0.02, stats=stats), scheduler)
+    await asyncio.gather(*(call(m) for m in (flash, flash, pro, pro)))
+    assert stats.max_in_flight == 2
+    print("✓ Per-model concurrency cap")
+
+    # Throttled calls are retried with backoff until they succeed
+    stats = ModelCallStats()
+    scheduler = ModelScheduler(backoff_base=0.01)
+    model = ScheduledModel(FakeGemini(fail_first=3, stats=stats), scheduler)
+    assert await call(model) == "OK"
+    assert stats.throttled == 3 and scheduler.stats.retries == 3
+    assert scheduler.stats.throttled == 3
+    print("✓ 429 retries with backoff")
+
+    # Server errors are retried; retries are bounded
+    scheduler = ModelScheduler(max_retries=2, backoff_base=0.01)
+    model = ScheduledModel(FakeGemini(fail_first=5, error_code=503), scheduler)
+    try:
+        await call(model)
+        raise AssertionError("expected the error to propagate")
+    except errors.ServerError:
+        pass
+    assert scheduler.stats.retries == 2
+    print("✓ Bounded retries")
+
+    # Requests/min limit spaces out calls once the bucket is drained
+    bucket = TokenBucket(per_minute=600)  # 10 per second
+    bucket.tokens = 0
+    start = time.monotonic()
+    await bucket.acquire()
+    await bucket.acquire()
+    assert 0.15 <= time.monotonic() - start < 0.5
+    print("✓ Token bucket rate limit")
+
+
+asyncio.run(main())
+
+print("=" * 50)
+print("\n✓ All scheduler tests passed!")
@@ -0,0 +1,151 @@
+"""Test the section-parallel rewrite of long CVs."""
+import asyncio
+from pathlib import Path
+
+# Imported first: sets a placeholder GOOGLE_API_KEY before config loads
+from benchmarks.stubs import stub_tika
+from benchmarks.bench_prompt_budget import academic_cv
+from benchmarks.fake_model import DEFAULT_RESPONSES, FakeGemini, ModelCallStats, fake_model_factory
+from cv_formatter.agents.section_rewrite import format_section, group_sections
+from cv_formatter.config import config
+from cv_formatter.orchestrator import CVFormatterOrchestrator
+from cv_formatter.prompt_budget import is_section_heading
+
+ROOT = Path(__file__).parent
+
+print("Section Rewrite Test")
+print("=" * 50)
+
+config.text_cache_enabled = False
+config.analysis_memo_enabled = False
+config.company_cache_enabled = False
+config.incremental_rerun = False
+config.rewrite_sections = True
+
+groups = group_sections("NAME\n\nSKILLS\n- Python\n\nLANGUAGES\n- English", 200)
+assert groups == ["NAME\n\nSKILLS\n- Python\n\nLANGUAGES\n- English"], groups
+cv_text = academic_cv(120)
+groups = group_sections(cv_text, 200, 1000)
+assert len(groups) >= 4 and "\n\n".join(groups).split() == cv_text.split()
+print("✓ Short sections grouped, every line kept in order")
+
+formatted = format_section("SKILLS\n- Python", "## Skills:\n• Python\n\n\n\n* C++")
+assert formatted == "SKILLS\n- Python\n\n- C++", formatted
+assert format_section("AWARDS\n- Prize", "- Prize, 2013").startswith("AWARDS\n")
+print("✓ Headers in CAPS, bullets normalized, dropped headers restored")
+
+experience = "EXPERIENCE\nResearch Engineer, Meta\n- Ranking models\nResearch Scientist\n- Vision"
+assert group_sections(experience, 1) == [experience]
+formatted = format_section(experience, (
+    "**Experience**\n**Senior Research Scientist, Google** (2019-2022)\n"
+    "Research Engineer, Meta\nResearch Scientist\n- Vision"
+))
+assert formatted == (
+    "EXPERIENCE\n**Senior Research Scientist, Google** (2019-2022)\n"
+    "Research Engineer, Meta\nResearch Scientist\n- Vision"
+), formatted
+print("✓ Job titles are neither split at nor promoted to headers")
+
+
+def section_echo(request) -> str:
+    """Rewrite a CV part by decorating its headers, or answer single shots as usual."""
+    if "ONE part of a CV" not in str(request.config.system_instruction):
+        return DEFAULT_RESPONSES["Rewrite_Agent"]
+    part = request.contents[-1].parts[0].text.split("\n\n", 1)[1]
+    return "\n".join(
+        f"**{line.title()}**" if is_section_heading(line) else line.replace("- ", "• ", 1)
+        for line in part.splitlines()
+    )
+
+
+def make_orchestrator(stats: ModelCallStats) -> CVFormatterOrchestrator:
+    default = fake_model_factory(stats=stats, latency=0.05)
+
+    def factory(agent_name: str) -> FakeGemini:
+        if agent_name != "Rewrite_Agent":
+            return default(agent_name)
+        return FakeGemini(agent_name=agent_name, stats=stats, latency=0.2, respond=section_echo)
+
+    return CVFormatterOrchestrator(model_factory=factory)
+
+
+async def main() -> None:
+    stats = ModelCallStats()
+    orchestrator = make_orchestrator(stats)
+    result = await orchestrator.format_cv_detailed(ROOT / "some_CV.pdf", ROOT / "sample_JD.txt")
+    headings = [line for line in cv_text.splitlines() if is_section_heading(line)]
+    found = [line for line in result.cv.splitlines() if is_section_heading(line)]
+    assert found == [heading.upper() for heading in headings], found
+    assert "•" not in result.cv and result.cv.count("\n- ") >= cv_text.count("\n- ")
+    parts = len(group_sections(cv_text, 200, 1000))
+    assert stats.calls["Rewrite_Agent"] == parts and stats.max_in_flight > 1, stats.calls
+    span = result.trace.find("Rewrite_Agent")
+    assert span.model_calls == parts and span.input_tokens > 0
+    assert span.duration < 0.2 * parts
+    print(f"✓ {parts} parts rewritten concurrently and stitched in order")
+
+    chunks = [chunk async for chunk in orchestrator.format_cv_stream(
+        ROOT / "some_CV.pdf", ROOT / "sample_JD.txt"
+    )]
+    assert len(chunks) == parts and "".join(chunks) == result.cv
+    print("✓ Streaming yields each part in order, matching the full output")
+    orchestrator.close()
+
+
+async def failed_section() -> None:
+    """One section's model call fails: the CV is rewritten in one call."""
+    stats = ModelCallStats()
+    default = fake_model_factory(stats=stats, latency=0.05)
+    failing = group_sections(cv_text, 200, 1000)[0].splitlines()[0]
+
+    def respond(request) -> str:
+        if failing in request.contents[-1].parts[0].text:
+            raise RuntimeError("model unavailable")
+        return section_echo(request)
+
+    def factory(agent_name: str) -> FakeGemini:
+        if agent_name != "Rewrite_Agent":
+            return default(agent_name)
+        return FakeGemini(agent_name=agent_name, stats=stats, latency=0.2, respond=respond)
+
+    orchestrator = CVFormatterOrchestrator(model_factory=factory)
+    result = await orchestrator.format_cv_detailed(ROOT / "some_CV.pdf", ROOT / "sample_JD.txt")
+    assert result.cv == DEFAULT_RESPONSES["Rewrite_Agent"]
+    # The first part fails before anything is streamed
+    chunks = [chunk async for chunk in orchestrator.format_cv_stream(
+        ROOT / "some_CV.pdf", ROOT / "sample_JD.txt"
+    )]
+    assert "".join(chunks) == result.cv
+    orchestrator.close()
+    print("✓ A failed section call falls back to a single-shot rewrite")
+
+
+async def short_cv() -> None:
+    stats = ModelCallStats()
+    orchestrator = make_orchestrator(stats)
+    result = await orchestrator.format_cv_detailed(ROOT / "some_CV.pdf", ROOT / "sample_JD.txt")
+    assert result.cv == DEFAULT_RESPONSES["Rewrite_Agent"]
+    assert stats.calls["Rewrite_Agent"] == 1
+    chunks = [chunk async for chunk in orchestrator.format_cv_stream(
+        ROOT / "some_CV.pdf", ROOT / "sample_JD.txt"
+    )]
+    assert "".join(chunks) == result.cv
+    orchestrator.close()
+    print("✓ Short CVs fall back to a single-shot rewrite")
+
+
+server = stub_tika(text=cv_text)
+try:
+    asyncio.run(main())
+    asyncio.run(failed_section())
+finally:
+    server.stop()
+
+server = stub_tika()
+try:
+    asyncio.run(short_cv())
+finally:
+    server.stop()
+
+print("=" * 50)
+print("\n✓ All section rewrite tests passed!")
@@ -0,0 +1,79 @@
+"""Test the HTTP service mode with fake models and a stand-in Tika server."""
+import time
+from pathlib import Path
+
+# Imported first: sets a placeholder GOOGLE_API_KEY before config loads
+from benchmarks.stubs import stub_tika
+from benchmarks.fake_model import fake_model_factory
+from fastapi.testclient import TestClient
+
+from cv_formatter.config import config
+from cv_formatter.orchestrator import CVFormatterOrchestrator
+from cv_formatter.server import create_app
+
+ROOT = Path(__file__).parent
+
+print("Server Test")
+print("=" * 50)
+
+config.text_cache_enabled = False
+config.analysis_memo_enabled = False
+config.company_cache_enabled = False
+config.incremental_rerun = False
+
+
+def wait_done(client: TestClient, job_id: str) -> dict:
+    for _ in range(200):
+        body = client.get(f"/jobs/{job_id}").json()
+        if body["status"] in ("done", "failed"):
+            return body
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+server = stub_tika()
+try:
+    orchestrator = CVFormatterOrchestrator(model_factory=fake_model_factory(latency=0.01))
+    with TestClient(create_app(orchestrator, workers=2)) as client:
+        cv_pdf = (ROOT / "some_CV.pdf").read_bytes()
+        jd = (ROOT / "sample_JD.txt").read_bytes()
+
+        response = client.post("/jobs", files={"cv": ("cv.pdf", cv_pdf), "jd": ("jd.txt", jd)})
+        assert response.status_code == 202, response.text
+        job_id = response.json()["job_id"]
+        print("✓ Upload accepted with a job ID")
+
+        body = wait_done(client, job_id)
+        assert body["status"] == "done" and "PROFESSIONAL SUMMARY" in body["result"]
+        print("✓ Poll returns the finished CV")
+
+        html = client.get(f"/jobs/{job_id}/result", params={"format": "html"})
+        assert html.headers["content-type"].startswith("text/html") and "<html" in html.text
+        streamed = client.get(f"/jobs/{job_id}/stream").text
+        assert streamed == body["result"]
+        sections = client.get(f"/jobs/{job_id}/result", params={"format": "json"}).json()["sections"]
+        assert sections[0]["name"] == "PROFESSIONAL SUMMARY"
+        assert client.get(f"/jobs/{job_id}", params={"format": "json"}).json()["result"]["sections"] == sections
+        print("✓ Result in any format, and as a stream")
+
+        # JD as a form field, streamed while the job runs
+        response = client.post("/jobs", files={"cv": ("cv.pdf", cv_pdf)},
+                               data={"jd_text": jd.decode("utf-8")})
+        with client.stream("GET", f"/jobs/{response.json()['job_id']}/stream") as stream:
+            assert "PROFESSIONAL SUMMARY" in "".join(stream.iter_text())
+        print("✓ Streaming while the job runs")
+
+        assert client.post("/jobs", files={"cv": ("cv.pdf", b"not a pdf"),
+                                           "jd": ("jd.txt", jd)}).status_code == 400
+        assert client.get("/jobs/unknown").status_code == 404
+        print("✓ Bad uploads and unknown jobs rejected")
+
+        metrics = client.get("/metrics").json()
+        assert metrics["jobs_completed"] == 2 and metrics["queue_length"] == 0
+        assert {"queue_wait", "total", "Rewrite_Agent"} <= set(metrics["stages"])
+        print("✓ Metrics report jobs and per-stage latency")
+finally:
+    server.stop()
+
+print("=" * 50)
+print("\n✓ All server tests passed!")
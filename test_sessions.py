@@ -0,0 +1,111 @@
+"""Test the bounded session and memory services."""
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("GOOGLE_API_KEY", "test-placeholder")
+
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from cv_formatter.sessions import BoundedMemoryService, BoundedSessionService, SqliteSessionService
+
+APP, USER = "agents", "user"
+
+print("Sessions Test")
+print("=" * 50)
+
+
+def text_event(text: str) -> Event:
+    return Event(
+        author="Rewrite_Agent",
+        invocation_id=Event.new_id(),
+        content=types.Content(role="model", parts=[types.Part(text=text)]),
+        actions=EventActions(state_delta={"Rewritten_CV": text}),
+    )
+
+
+async def fill(service, prefix: str, count: int, size: int = 100) -> None:
+    for i in range(count):
+        session = await service.create_session(
+            app_name=APP, user_id=USER, session_id=f"{prefix}{i}"
+        )
+        await service.append_event(session, text_event("x" * size))
+
+
+async def exists(service, session_id: str) -> bool:
+    return await service.get_session(app_name=APP, user_id=USER, session_id=session_id) is not None
+
+
+async def check(service, name: str) -> None:
+    # Least recently used sessions are evicted beyond the count limit
+    service.max_sessions = 3
+    await fill(service, "s", 3)
+    assert await exists(service, "s0")
+    session = await service.create_session(app_name=APP, user_id=USER, session_id="s3")
+    assert not await exists(service, "s1") and await exists(service, "s0")
+    print(f"✓ {name}: LRU eviction by count")
+
+    # A pinned session survives eviction and keeps its events
+    service.pin(session)
+    await fill(service, "t", 3, size=10)
+    await service.append_event(session, text_event("kept"))
+    kept = await service.get_session(app_name=APP, user_id=USER, session_id="s3")
+    assert kept.state["Rewritten_CV"] == "kept" and len(kept.events) == 1
+    service.unpin(session)
+    print(f"✓ {name}: pinned sessions kept")
+
+    # The byte budget bounds the total size
+    service.max_sessions = None
+    service.max_bytes = 5000
+    await fill(service, "b", 20, size=1000)
+    assert service.stats.bytes <= 5000 and service.stats.evicted > 0
+    assert await exists(service, "b19") and not await exists(service, "b0")
+    print(f"✓ {name}: byte budget")
+
+    # Idle sessions expire
+    service.ttl = 0.05
+    time.sleep(0.1)
+    assert not await exists(service, "b19")
+    print(f"✓ {name}: TTL expiry")
+
+
+async def main(tmp: Path) -> None:
+    await check(BoundedSessionService(), "memory")
+
+    sqlite = SqliteSessionService(tmp / "sessions.db")
+    await check(sqlite, "sqlite")
+    sqlite.close()
+
+    # Sessions persist across service instances
+    sqlite = SqliteSessionService(tmp / "sessions.db")
+    session = await sqlite.create_session(app_name=APP, user_id=USER, session_id="p")
+    await sqlite.append_event(session, text_event("persisted"))
+    sqlite.close()
+    sqlite = SqliteSessionService(tmp / "sessions.db")
+    session = await sqlite.get_session(app_name=APP, user_id=USER, session_id="p")
+    assert session.state["Rewritten_CV"] == "persisted"
+    assert session.events[0].content.parts[0].text == "persisted"
+    sqlite.close()
+    print("✓ sqlite: persisted across restarts")
+
+    memory = BoundedMemoryService(max_sessions=2)
+    for i, word in enumerate(["alpha", "beta", "gamma"]):
+        session = await BoundedSessionService().create_session(
+            app_name=APP, user_id=USER, session_id=f"m{i}"
+        )
+        session.events.append(text_event(word))
+        await memory.add_session_to_memory(session)
+    found = await memory.search_memory(app_name=APP, user_id=USER, query="alpha gamma")
+    texts = {entry.content.parts[0].text for entry in found.memories}
+    assert texts == {"gamma"} and memory.stats.sessions == 2
+    print("✓ Memory service keeps the newest sessions")
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    asyncio.run(main(Path(tmp)))
+
+print("=" * 50)
+print("\n✓ All session tests passed!")
@@ -0,0 +1,75 @@
+"""Test the Tika server pool's connection reuse and recovery."""
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Imported first: sets a placeholder GOOGLE_API_KEY before config loads
+from benchmarks.stubs import SAMPLE_CV_TEXT, StandInTikaServer
+from cv_formatter.parsers import TikaServerPool
+
+ROOT = Path(__file__).parent
+
+print("Tika Pool Test")
+print("=" * 50)
+
+server = StandInTikaServer(keep_alive=0.5).start()
+pool = TikaServerPool(endpoints=[server.endpoint])
+try:
+    assert SAMPLE_CV_TEXT in pool.extract_text(ROOT / "some_CV.pdf")
+    assert SAMPLE_CV_TEXT in pool.extract_text(ROOT / "some_CV.pdf")
+    assert len(pool.servers[0]._idle) == 1
+    print("✓ Connections are kept alive between extractions")
+
+    # The server closes the pooled connection while it is idle
+    time.sleep(1.5)
+    assert SAMPLE_CV_TEXT in pool.extract_text(ROOT / "some_CV.pdf")
+    assert server.requests == 3
+    print("✓ A connection closed by the server's keep-alive timeout is replaced")
+
+    server.stop()
+    time.sleep(1.0)  # Until the pooled connection's handler times out too
+    try:
+        pool.extract_text(ROOT / "some_CV.pdf")
+    except RuntimeError as e:
+        assert "All Tika servers failed" in str(e)
+    else:
+        raise AssertionError("extraction from a stopped server succeeded")
+    print("✓ A server that is down still fails the extraction")
+finally:
+    pool.close()
+    server.stop()
+
+# A managed server whose process is a placeholder; the stand-in answers
+server = StandInTikaServer().start()
+pool = TikaServerPool(endpoints=[server.endpoint])
+managed = pool.servers[0]
+managed.command = [sys.executable, "-c", "import time; time.sleep(60)"]
+starts = []
+start = managed.start
+
+
+def slow_start():
+    starts.append(time.monotonic())
+    time.sleep(0.2)
+    start()
+
+
+managed.start = slow_start
+try:
+    # Several requests failed on the same run of the server at once
+    restarts = managed.restarts
+    threads = [threading.Thread(target=pool._recover, args=(managed, restarts)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(starts) == 1 and managed.restarts == restarts + 1, starts
+    assert managed.is_healthy()
+    print("✓ Concurrent failures restart a managed server once")
+finally:
+    pool.close()
+    server.stop()
+
+print("=" * 50)
+print("\n✓ All Tika pool tests passed!")
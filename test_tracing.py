@@ -0,0 +1,65 @@
+"""Test per-stage tracing."""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("GOOGLE_API_KEY", "test-placeholder")
+
+from cv_formatter.main import report_trace
+from cv_formatter.tracing import Trace, current_trace, record_cache_hit, span, tracing
+
+print("Tracing Test")
+print("=" * 50)
+
+# Spans outside a traced run are no-ops
+with span("Untraced", "ingestion") as untraced:
+    record_cache_hit()
+assert untraced is None and current_trace() is None
+print("✓ No trace outside tracing()")
+
+
+async def read(name: str, hit: bool) -> None:
+    def work():
+        with span(name, "ingestion"):
+            time.sleep(0.02)
+            if hit:
+                record_cache_hit()
+
+    await asyncio.to_thread(work)
+
+
+async def run() -> Trace:
+    with tracing(Trace()) as trace:
+        # Spans opened in worker threads land in the same trace
+        await asyncio.gather(read("CV_Extraction", False), read("JD_Read", True))
+        trace.start_span("CV_Agent", "agent", "gemini-2.5-flash")
+        record_cache_hit("CV_Agent")
+    return trace
+
+
+trace = asyncio.run(run())
+assert current_trace() is None
+assert sorted(s.name for s in trace.spans) == ["CV_Agent", "CV_Extraction", "JD_Read"]
+assert trace.find("CV_Extraction").duration >= 0.02
+assert trace.find("JD_Read").cache_hit and not trace.find("CV_Extraction").cache_hit
+assert trace.find("CV_Agent").cache_hit and trace.find("CV_Agent").end is not None
+print("✓ Spans, durations and cache hits")
+
+data = json.loads(trace.to_json())
+assert data["spans"][0]["duration"] is not None and "tool_calls" in data["spans"][0]
+assert "CV_Agent" in trace.summary()
+print("✓ JSON and summary output")
+
+# The CLI reports the trace the same way in streamed and buffered runs
+with tempfile.TemporaryDirectory() as tmp:
+    out = Path(tmp) / "trace.json"
+    report_trace(trace, argparse.Namespace(trace=False, trace_json=out, quiet=True))
+    assert json.loads(out.read_text(encoding="utf-8")) == data
+print("✓ --trace-json written by the CLI")
+
+print("=" * 50)
+print("\n✓ All tracing tests passed!")